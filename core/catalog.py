@@ -0,0 +1,172 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Persistent index of the session files (sessions/catalog.json).
+
+The session files are named {id}_{YYMMDD}_{HHMMSS}.csv and written in date directories (see
+Logger). Rather than globbing the whole sessions tree each time a session id is needed, the
+catalog keeps the session files of each date directory along with the directory modification
+time. When loaded, only the directories modified since the last save (e.g. sessions copied or
+removed by hand) are scanned again, the whole tree being scanned only if the index is missing
+or unreadable. Other files (seed tables, segments...) are not indexed.
+
+The index is written atomically (a temporary file renamed over it) when a session is added, or
+when a directory had to be scanned again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+
+from core.constants import PATHS
+
+CATALOG_NAME: str = "catalog.json"
+SESSION_NAME: re.Pattern = re.compile(r"^(\d+)_(\d{6})_(\d{6})\.csv$")
+
+_catalog: SessionCatalog | None = None
+
+
+def get_catalog() -> SessionCatalog:
+    global _catalog
+    if _catalog is None:
+        _catalog = SessionCatalog(PATHS["SESSIONS"])
+    return _catalog
+
+
+def set_catalog(catalog: SessionCatalog | None) -> None:
+    global _catalog
+    _catalog = catalog
+
+
+def scan_directory(directory: Path) -> list[str]:
+    """Return the session files of a date directory (paths relative to it, in posix form)"""
+    return sorted(p.relative_to(directory).as_posix() for p in directory.rglob("*.csv") if SESSION_NAME.match(p.name))
+
+
+class SessionCatalog:
+    def __init__(self, root: Path) -> None:
+        self.root: Path = root
+        self.path: Path = root.joinpath(CATALOG_NAME)
+        # Indexed: {directory: modification time (ns)} and {directory: session files}, the sessions
+        # directory itself being "" (its files are listed at each load, as the index is saved in it)
+        self.directories: dict[str, int] = dict()
+        self.files: dict[str, list[str]] = dict()
+
+        # Lookup tables, built from the index (session files relative to the sessions directory)
+        self.paths: dict[int, list[str]] = dict()
+        self.dates: dict[str, list[str]] = dict()
+        self.next_id: int = 1
+        self.last_id: int = 0
+
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(str(self.path)) as catalog_file:
+                index: dict = json.load(catalog_file)
+            self.directories = {d: int(mtime) for d, mtime in index["directories"].items()}
+            self.files = {d: list(names) for d, names in index["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.directories, self.files = dict(), dict()
+        changed: bool = self.refresh()
+        self.build()
+        if changed:
+            self.save()
+
+    def refresh(self) -> bool:
+        """Scan again the directories modified since the index was saved, and return True if any was"""
+        changed: bool = False
+        root_files: list[str] = list()
+        directories: set[str] = set()
+        if self.root.exists():
+            for entry in os.scandir(str(self.root)):
+                if entry.is_dir():
+                    directories.add(entry.name)
+                    mtime: int = entry.stat().st_mtime_ns
+                    if self.directories.get(entry.name) != mtime:
+                        self.files[entry.name] = scan_directory(self.root.joinpath(entry.name))
+                        self.directories[entry.name] = mtime
+                        changed = True
+                elif SESSION_NAME.match(entry.name):
+                    root_files.append(entry.name)
+
+        root_files.sort()
+        if self.files.get("", []) != root_files:
+            self.files[""] = root_files
+            changed = True
+        for removed in set(self.directories) - directories:
+            del self.directories[removed]
+            self.files.pop(removed, None)
+            changed = True
+        return changed
+
+    def build(self) -> None:
+        self.paths, self.dates = dict(), dict()
+        for directory, names in self.files.items():
+            for name in names:
+                self.index_file(f"{directory}/{name}" if directory else name)
+        self.last_id = max(self.paths, default=0)
+        self.next_id = 1
+        self.advance_next_id()
+
+    def index_file(self, relative: str) -> int:
+        match: re.Match | None = SESSION_NAME.match(relative.rsplit("/", 1)[-1])
+        session_id: int = int(match.group(1))
+        self.paths.setdefault(session_id, list()).append(relative)
+        yymmdd: str = match.group(2)
+        self.dates.setdefault(f"20{yymmdd[:2]}-{yymmdd[2:4]}-{yymmdd[4:]}", list()).append(relative)
+        return session_id
+
+    def advance_next_id(self) -> None:
+        # The first available id (a removed session id is reused)
+        while self.next_id in self.paths:
+            self.next_id += 1
+
+    def save(self) -> None:
+        temporary: Path = self.path.with_name(f"{CATALOG_NAME}.tmp")
+        try:
+            with open(str(temporary), "w") as catalog_file:
+                json.dump({"directories": self.directories, "files": self.files}, catalog_file)
+            os.replace(str(temporary), str(self.path))
+        except OSError as error:  # The catalog is rebuilt at the next start
+            print(_("Warning, the sessions catalog could not be saved (%s)") % error)
+
+    def add_session(self, path: Path) -> None:
+        """Index a new session file (once created)"""
+        relative: Path = path.relative_to(self.root)
+        if len(relative.parts) == 1:
+            self.files.setdefault("", list()).append(relative.name)
+        else:
+            directory: str = relative.parts[0]
+            self.files.setdefault(directory, list()).append(Path(*relative.parts[1:]).as_posix())
+            self.directories[directory] = self.root.joinpath(directory).stat().st_mtime_ns
+        self.last_id = max(self.last_id, self.index_file(relative.as_posix()))
+        self.advance_next_id()
+        self.save()
+
+    def get_next_id(self) -> int:
+        return self.next_id
+
+    def get_last_id(self) -> int:
+        return self.last_id
+
+    def get_ids(self) -> list[int]:
+        return sorted(self.paths)
+
+    def get_session_paths(self, session_id: int) -> list[Path]:
+        """Return the session files of an id (several if sessions were copied from elsewhere)"""
+        return [self.root.joinpath(relative) for relative in self.paths.get(session_id, [])]
+
+    def get_sessions_on(self, date: str) -> list[Path]:
+        """Return the session files of a date (YYYY-MM-DD), by id"""
+        paths: list[Path] = [self.root.joinpath(relative) for relative in self.dates.get(date, [])]
+        return sorted(paths, key=lambda p: int(p.name.split("_")[0]))
+
+    def get_sessions(self) -> list[Path]:
+        """Return all the session files, by id"""
+        return [self.root.joinpath(rel) for session_id in sorted(self.paths) for rel in self.paths[session_id]]
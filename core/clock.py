@@ -2,8 +2,61 @@
 # Institut National Universitaire Champollion (Albi, France).
 # License : CeCILL, version 2.1 (see the LICENSE file)
 
+from collections.abc import Iterator
+from time import perf_counter, sleep
+
 import pyglet.clock
 
+# Maximal number of fixed steps a plugin can run during one frame to catch up a late frame
+MAX_STEPS_PER_FRAME: int = 10
+
+# Available (replay) speed factors
+SPEED_LEVELS: tuple[int, ...] = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 20, 50, 100, 200)
+
+# Time covered by each tick when fast forwarding (the replay scheduler sub-steps it)
+FASTFORWARD_STEP: float = 1.0
+
+# Last part of a precise wait that is busy-waited, as sleep() may overshoot by about 1 ms
+SPIN_DURATION: float = 0.002
+
+
+def due_steps(time: float, next_time: float, period: float) -> int:
+    """Return the number of fixed steps that are due at `time` (one per call for a null or negative period)"""
+    if time < next_time:
+        return 0
+    if period <= 0:
+        return 1
+    return int((time - next_time) / period) + 1
+
+
+def fixed_steps(time: float, next_time: float, period: float, max_steps: int = MAX_STEPS_PER_FRAME) -> Iterator[float]:
+    """
+    Yield the times of the fixed steps that are due at `time`: next_time, next_time + period...
+    If more than max_steps are due, the oldest ones are dropped (the backlog is not caught up).
+    A null or negative period means one step per call.
+    """
+    due: int = due_steps(time, next_time, period)
+    if period <= 0:
+        yield from [time] * due
+        return
+
+    for k in range(max(0, due - max_steps), due):
+        yield next_time + k * period
+
+
+def wait_until(deadline: float, spin: float = SPIN_DURATION) -> float:
+    """
+    Wait until the perf_counter() deadline with a sub-millisecond accuracy: sleep until
+    spin seconds before it, then busy-wait. Return the actual end time.
+    """
+    remaining: float = deadline - perf_counter()
+    if remaining > spin:
+        sleep(remaining - spin)
+    now: float = perf_counter()
+    while now < deadline:
+        now = perf_counter()
+    return now
+
 
 class Clock(pyglet.clock.Clock):
     """
@@ -26,23 +79,26 @@ class Clock(pyglet.clock.Clock):
         if self.isFastForward:
             return
 
-        for _i in range(0, self._speed):
-            self.set_time(self._time + dt)
-
-            self.tick()
+        # A single tick covers the whole speeded up frame time: the scheduler sub-steps it
+        # (so its widgets are refreshed only once per frame, whatever the speed)
+        self.set_time(self._time + dt * self._speed)
+        self.tick()
 
     def get_time(self) -> float:
         return self._time
 
+    def get_speed(self) -> int:
+        return self._speed
+
     def increase_speed(self) -> None:
-        self._speed += 1
-        if self._speed > 10:
-            self._speed = 10
+        faster: list[int] = [s for s in SPEED_LEVELS if s > self._speed]
+        if len(faster) > 0:
+            self._speed = faster[0]
 
     def decrease_speed(self) -> None:
-        self._speed -= 1
-        if self._speed < 1:
-            self._speed = 1
+        slower: list[int] = [s for s in SPEED_LEVELS if s < self._speed]
+        if len(slower) > 0:
+            self._speed = slower[-1]
 
     def reset_speed(self) -> None:
         self._speed = 1
@@ -56,7 +112,7 @@ class Clock(pyglet.clock.Clock):
         self.isFastForward = True
 
         while target_time > 0:
-            dt: float = min(target_time, 0.1)
+            dt: float = min(target_time, FASTFORWARD_STEP)
 
             self.set_time(self.get_time() + dt)
             self.tick()
@@ -19,6 +19,9 @@ class Container:
         self.cx: float = self.x1 + (self.x2 - self.x1) / 2
         self.cy: float = self.y1 + (self.y2 - self.y1) / 2
 
+        # Containers are never modified, so their derived containers can be memoised
+        self._derived: dict[tuple[float, float, float, float], Container] = dict()
+
     def __repr__(self) -> str:
         return f"Container(name={self.name}, l={self.l}, b={self.b}, w={self.w}, h={self.h})"
 
@@ -45,10 +48,13 @@ class Container:
         return Container(f"{self.name}_translated", l, b, self.w, self.h)
 
     def reduce_and_translate(self, width: float = 1, height: float = 1, x: float = 0, y: float = 0) -> Container:
-        _, _, w, h = self.get_reduced(width, height).get_lbwh()
-        l: float = self.l + x * (self.w - w)
-        b: float = self.b + y * (self.h - h)
-        return Container(f"{self.name}_reduced_translated", l, b, w, h)
+        key: tuple[float, float, float, float] = (width, height, x, y)
+        if key not in self._derived:
+            _, _, w, h = self.get_reduced(width, height).get_lbwh()
+            l: float = self.l + x * (self.w - w)
+            b: float = self.b + y * (self.h - h)
+            self._derived[key] = Container(f"{self.name}_reduced_translated", l, b, w, h)
+        return self._derived[key]
 
     def contains_xy(self, x: float, y: float) -> bool:
         return all([self.x1 <= x <= self.x2, self.y1 >= y >= self.y2])
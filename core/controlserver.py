@@ -0,0 +1,134 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Local control server, to inject scenario events from another process (e.g. a BCI loop).
+
+The protocol is line based (utf-8, one request per line) over a localhost TCP socket.
+A request is a scenario line, with or without its time:
+    track;targetproportion;0.2       executed at the next frame
+    0:05:00;sysmon;lights-1-failure;True    scheduled at 5 minutes (executed now if past)
+    ping                             answered directly by the server thread
+Each request gets a reply line: "OK", "QUEUED" (scheduled), "PONG", "ERROR <message>", or
+"BUSY" when the session is paused by a modal dialog (the request is not executed).
+
+The asyncio server runs in its own thread. Requests are handed to the main thread through a
+thread-safe queue, drained by the scheduler at each frame. The reply is sent once the main
+thread has validated (and executed) the event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from queue import Empty, Queue
+from time import perf_counter
+from typing import Any
+
+HOST: str = "127.0.0.1"
+
+
+class ControlRequest:
+    def __init__(self, line: str, loop: asyncio.AbstractEventLoop, future: asyncio.Future) -> None:
+        self.line: str = line
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.future: asyncio.Future = future
+
+    def reply(self, message: str) -> None:
+        """Send the reply line (callable from any thread)"""
+        self.loop.call_soon_threadsafe(self._set_reply, message)
+
+    def _set_reply(self, message: str) -> None:
+        if not self.future.done():
+            self.future.set_result(message)
+
+
+class ControlServer:
+    def __init__(self, port: int, host: str = HOST) -> None:
+        # A null port lets the system choose a free one (self.port is updated once started)
+        self.host: str = host
+        self.port: int = port
+        self.requests: Queue[ControlRequest] = Queue()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.server: Any = None
+        self.thread: threading.Thread | None = None
+        self.started: threading.Event = threading.Event()
+        self.error: OSError | None = None
+
+    def start(self) -> None:
+        """Start the server thread, and wait until it listens (raise an OSError if it cannot)"""
+        self.thread = threading.Thread(target=self.run, name="control-server", daemon=True)
+        self.thread.start()
+        self.started.wait()
+        if self.error is not None:
+            raise self.error
+
+    def run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle_client, self.host, self.port))
+        except OSError as error:
+            self.error = error
+            self.started.set()
+            self.loop.close()
+            return
+
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started.set()
+        self.loop.run_forever()
+
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    def stop(self) -> None:
+        if self.loop is not None and self.thread is not None and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                data: bytes = await reader.readline()
+                if len(data) == 0:
+                    break
+                line: str = data.decode("utf-8", errors="replace").strip()
+                if len(line) == 0:
+                    continue
+
+                if line == "ping":
+                    reply: str = "PONG"
+                else:
+                    future: asyncio.Future = self.loop.create_future()
+                    self.requests.put(ControlRequest(line, self.loop, future))
+                    reply = await future
+                writer.write(f"{reply}\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def pop_requests(self) -> list[ControlRequest]:
+        """Return the requests received since the last call (main thread)"""
+        requests: list[ControlRequest] = list()
+        while True:
+            try:
+                requests.append(self.requests.get_nowait())
+            except Empty:
+                return requests
+
+
+async def measure_round_trips(port: int, lines: list[str], host: str = HOST) -> list[float]:
+    """Send the lines one at a time, and return their round-trip times (s)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    round_trips: list[float] = list()
+    for line in lines:
+        start: float = perf_counter()
+        writer.write(f"{line}\n".encode())
+        await writer.drain()
+        await reader.readline()
+        round_trips.append(perf_counter() - start)
+    writer.close()
+    return round_trips
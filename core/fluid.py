@@ -0,0 +1,111 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Resources management fluid model.
+
+Tanks and pumps are held in flat lists, indexed by their number in the network. The connectivity
+is given by the source and destination tank index of each pump (and, per tank, by the indices of
+its incoming and outgoing pumps).
+
+As flows and losses are constant, every tank level is a linear function of time between two
+events. An event is a tank becoming full or empty: as the task requires, its incoming (full) or
+outgoing (empty) running pumps are then switched off, which changes the rates. advance() thus
+integrates exactly, from event to event, over any duration (there is no integration step): the
+levels can be brought up to each displayed frame at a negligible cost.
+
+Rates are in units per second.
+"""
+
+from __future__ import annotations
+
+
+class FluidNetwork:
+    def __init__(self, tank_count: int, pump_sources: list[int], pump_destinations: list[int]) -> None:
+        self.tank_count: int = tank_count
+        self.pump_count: int = len(pump_sources)
+        self.pump_sources: list[int] = pump_sources
+        self.pump_destinations: list[int] = pump_destinations
+        self.incoming: list[tuple[int, ...]] = [
+            tuple(p for p, d in enumerate(pump_destinations) if d == t) for t in range(tank_count)
+        ]
+        self.outgoing: list[tuple[int, ...]] = [
+            tuple(p for p, s in enumerate(pump_sources) if s == t) for t in range(tank_count)
+        ]
+
+        # Tanks
+        self.levels: list[float] = [0.0] * tank_count
+        self.capacities: list[float] = [0.0] * tank_count
+        self.depletable: list[bool] = [True] * tank_count
+        self.losses: list[float] = [0.0] * tank_count
+
+        # Pumps
+        self.flows: list[float] = [0.0] * self.pump_count
+        self.running: list[bool] = [False] * self.pump_count
+
+    def get_rates(self) -> list[float]:
+        rates: list[float] = [-loss for loss in self.losses]
+        for p in range(self.pump_count):
+            if self.running[p]:
+                rates[self.pump_destinations[p]] += self.flows[p]
+                source: int = self.pump_sources[p]
+                if self.depletable[source]:  # A non depletable tank has an unlimited capacity
+                    rates[source] -= self.flows[p]
+
+        # An empty tank stops leaking
+        for t in range(self.tank_count):
+            if rates[t] < 0 and self.levels[t] <= 0:
+                rates[t] = 0.0
+        return rates
+
+    def stop_bounded_pumps(self) -> list[int]:
+        """Switch off the running pumps that fill a full tank or drain an empty one, and return them"""
+        stopped: list[int] = list()
+        for t in range(self.tank_count):
+            if self.levels[t] >= self.capacities[t]:
+                bounded: tuple[int, ...] = self.incoming[t]
+            elif self.levels[t] <= 0:
+                bounded = self.outgoing[t]
+            else:
+                continue
+            for p in bounded:
+                if self.running[p]:
+                    self.running[p] = False
+                    stopped.append(p)
+        return stopped
+
+    def get_next_event_delay(self, rates: list[float]) -> float:
+        delay: float = float("inf")
+        for t in range(self.tank_count):
+            if rates[t] < 0:
+                delay = min(delay, self.levels[t] / -rates[t])
+            elif rates[t] > 0:
+                delay = min(delay, (self.capacities[t] - self.levels[t]) / rates[t])
+        return max(delay, 0.0)
+
+    def advance(self, duration: float) -> list[int]:
+        """Integrate the levels over duration (s), and return the pumps switched off meanwhile"""
+        stopped: list[int] = self.stop_bounded_pumps()
+        remaining: float = duration
+        while remaining > 0:
+            rates: list[float] = self.get_rates()
+            delay: float = self.get_next_event_delay(rates)
+            if delay >= remaining:
+                for t in range(self.tank_count):
+                    self.levels[t] += rates[t] * remaining
+                return stopped
+
+            for t in range(self.tank_count):
+                # The tanks reaching a bound (at this event) are set exactly on it
+                if rates[t] < 0:
+                    self.levels[t] = max(self.levels[t] + rates[t] * delay, 0.0)
+                    if self.levels[t] / -rates[t] <= 1e-12:
+                        self.levels[t] = 0.0
+                elif rates[t] > 0:
+                    self.levels[t] = min(self.levels[t] + rates[t] * delay, self.capacities[t])
+                    if (self.capacities[t] - self.levels[t]) / rates[t] <= 1e-12:
+                        self.levels[t] = self.capacities[t]
+            remaining -= delay
+            stopped.extend(self.stop_bounded_pumps())
+        return stopped
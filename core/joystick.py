@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+from time import perf_counter
 from typing import Any
 
 import pyglet.input
 
 from core.constants import REPLAY_MODE
 from core.error import get_errors
-from core.logger import get_logger
+from core.logger import LogChannel, get_logger
 
 hat_sides: list[str] = ["LEFT", "UP", "RIGHT", "DOWN"]
 
+# An axes sample is logged only when an axis moved by more than this (axes range from -1 to 1)
+AXES_DEADBAND: float = 0.005
+
 
 class Joystick:
     def __init__(self, device: Any) -> None:
@@ -17,6 +21,9 @@ class Joystick:
         self.keys: dict[str, bool] = dict()
         self.x: float = 0
         self.y: float = 0
+        self.poll_time: float = 0  # perf_counter() time of the last device poll
+        self.key_times: dict[str, float] = dict()  # Poll time of the last press of each key
+        self.axes_channel: LogChannel | None = None  # Registered at the first axes change
         try:  # Just in case Joystick is opened twice (?)
             self.open()
         except OSError:
@@ -45,13 +52,15 @@ class Joystick:
         self.key_change[keystr] = None
 
     def update(self) -> None:
-        # Update x & y joystick values
-        if self.device.x != self.x:
-            self.x = self.device.x
-            get_logger().record_input("joystick", "x", self.x)
-        if self.device.y != self.y:
-            self.y = self.device.y
-            get_logger().record_input("joystick", "y", self.y)
+        # The device state is polled once per frame: its inputs are stamped with the poll time
+        self.poll_time = perf_counter()
+
+        # Update x & y joystick values, logged together as a deadband channel (not a row per axis change)
+        if self.device.x != self.x or self.device.y != self.y:
+            self.x, self.y = self.device.x, self.device.y
+            if self.axes_channel is None:
+                self.axes_channel = get_logger().register_channel("device_joystick", "axes", AXES_DEADBAND)
+            get_logger().record_channel(self.axes_channel, (self.x, self.y), logtime=self.poll_time)
 
         # Update button values
         # (Keep a copy of previous state to check for state changes)
@@ -81,10 +90,11 @@ class Joystick:
         for key in self.keys:
             if previous_state[key] is False and self.keys[key] is True:  # Press
                 self.key_change[key] = "press"
-                get_logger().record_input("Joystick", key, "press")
+                self.key_times[key] = self.poll_time
+                get_logger().record_input("Joystick", key, "press", logtime=self.poll_time)
             elif previous_state[key] is True and self.keys[key] is False:  # Released
                 self.key_change[key] = "released"
-                get_logger().record_input("Joystick", key, "release")
+                get_logger().record_input("Joystick", key, "release", logtime=self.poll_time)
 
 
 joykey: dict[str, bool] | None = None
@@ -4,18 +4,31 @@
 
 from __future__ import annotations
 
-from collections import namedtuple
-from csv import DictWriter
+import atexit
+import os
+import sys
+from collections import Counter
+from csv import writer as csv_writer
 from datetime import datetime
 from pathlib import Path
 from time import perf_counter
 from typing import IO, Any
 
+from core.catalog import get_catalog
 from core.constants import PATHS, REPLAY_MODE
-from core.utils import find_the_first_available_session_number
+from core.sessionfile import SESSION_FIELDS, SegmentCompressor, get_segment_path, write_metadata
+from core.utils import find_the_first_available_session_number, get_conf_value
 
 _logger: Logger | None = None
 
+# Minimum delay (s) between two checks of the segment rotation and of the disk sync
+CHECKPOINT_PERIOD: float = 1.0
+
+# The row queue is written once per frame, or earlier when it holds this many rows or rows older
+# than this age (s), so that a long frame, or a crash, loses few rows
+MAX_QUEUE_ROWS: int = 5000
+MAX_QUEUE_AGE: float = 1.0
+
 
 def get_logger() -> Logger:
     global _logger
@@ -29,11 +42,68 @@ def set_logger(lg: Logger | None) -> None:
     _logger = lg
 
 
+class LogChannel:
+    """A numeric state logged at a high rate, registered once (see Logger.register_channel)"""
+
+    def __init__(self, number: int, module: str, address: str, deadband: float = 0.0) -> None:
+        self.number: int = number
+        self.module: str = module
+        self.address: str = address
+        # A sample is not logged if no value moved by more than the deadband since the last logged sample
+        self.deadband: float = deadband
+        self.last_values: tuple[float, ...] | None = None
+
+    def expand(self, row_dict: dict[str, Any]) -> dict[str, Any]:
+        """Return the state row (legacy layout) of a sample row of this channel"""
+        values: tuple[float, ...] = tuple(float(v) for v in str(row_dict["value"]).split())
+        value: Any = values[0] if len(values) == 1 else values
+        return dict(row_dict, type="state", module=self.module, address=self.address, value=value)
+
+
+class StateRecorder:
+    """A widget state address, bound once (see Logger.get_state_recorder)"""
+
+    __slots__ = ("address", "logger", "module")
+
+    def __init__(self, logger: Logger, module: str, address: str) -> None:
+        self.logger: Logger = logger
+        self.module: str = module
+        self.address: str = address
+
+    def record(self, value: Any, logtime: float | None = None) -> None:
+        # logtime can be given when the state changed earlier, outside the main thread (e.g. port edges)
+        logger: Logger = self.logger
+        if logtime is None:
+            logtime = perf_counter()
+        logger.queue_row((logtime, logger.scenario_time, "state", self.module, self.address, value))
+        if logger.frame_onsets:
+            logger.pending_onsets.append((self.module, self.address, logtime))
+
+
 class Logger:
+    # When enabled, each state row is followed by an "onset" row stamped with the
+    # time of the buffer flip that made the change visible
+    frame_onsets: bool = False
+
+    # When enabled, the channels samples are logged as compact "sample" rows, instead of "state" rows:
+    #   channel rows, once per channel:   type=channel, module, address, value=channel number
+    #   sample rows:                      type=sample,  module="", address=channel number, value="x y ..."
+    # (see LogChannel.expand and core.logreader.expand_channel_rows for the legacy layout)
+    compact_states: bool = False
+
+    # Session segments (see core.sessionfile): a new segment is opened when the current one
+    # exceeds segment_size (bytes) or segment_duration (s), 0 disabling each limit
+    segment_size: int = 0
+    segment_duration: float = 0
+    compress_segments: bool = False
+    # The written rows are synced to the disk at this period (s), 0 leaving it to the system
+    fsync_period: float = 0
+    last_checkpoint: float = 0
+    last_sync: float = 0
+
     def __init__(self) -> None:
         self.datetime: datetime = datetime.now()
-        self.fields_list: list[str] = ["logtime", "scenario_time", "type", "module", "address", "value"]
-        self.slot: type = namedtuple("Row", self.fields_list)
+        self.fields_list: list[str] = list(SESSION_FIELDS)
         self.maxfloats: int = 6  # Time logged at microsecond precision
         self.session_id: int | None = None
         self.lsl: Any = None
@@ -44,8 +114,51 @@ class Logger:
         self.scenario_time: float = 0  # Updated by the scheduler class
 
         self.file: IO[str] | None = None
-        self.writer: DictWriter | None = None
-        self.queue: list[Any] = list()
+        self.writer: Any = None
+        # Rows (tuples) recorded since the last flush, written by write_row_queue (once per frame)
+        self.queue: list[tuple[Any, ...]] = list()
+        self.state_recorders: dict[tuple[str, str], StateRecorder] = dict()
+
+        try:
+            self.frame_onsets = get_conf_value("Openmatb", "frame_onsets") and not REPLAY_MODE
+        except (KeyError, TypeError):
+            self.frame_onsets = False
+        self.pending_onsets: list[tuple[str, str, float]] = list()
+
+        try:
+            self.compact_states = get_conf_value("Openmatb", "compact_states")
+        except (KeyError, TypeError):
+            self.compact_states = False
+        self.channels: list[LogChannel] = list()
+
+        try:
+            self.segment_size = get_conf_value("Openmatb", "segment_size") * 1000000
+        except (KeyError, TypeError):
+            self.segment_size = 0
+        try:
+            self.segment_duration = get_conf_value("Openmatb", "segment_duration") * 60
+        except (KeyError, TypeError):
+            self.segment_duration = 0
+        try:
+            self.compress_segments = get_conf_value("Openmatb", "compress_segments")
+        except (KeyError, TypeError):
+            self.compress_segments = False
+        try:
+            self.fsync_period = get_conf_value("Openmatb", "fsync_period")
+        except (KeyError, TypeError):
+            self.fsync_period = 0
+        self.segment_number: int = 0
+        self.segment_start: float = perf_counter()
+        self.compressor: SegmentCompressor | None = None
+
+        # Number of written rows, by type (see the session metadata)
+        self.row_counts: Counter[str] = Counter()
+        self.start_time: float = perf_counter()
+        self.metadata: dict[str, Any] = {
+            "session_id": self.session_id,
+            "start": self.datetime.isoformat(timespec="seconds"),
+            "status": "running",
+        }
 
         if not REPLAY_MODE:
             self.path: Path = PATHS["SESSIONS"].joinpath(
@@ -53,6 +166,10 @@ class Logger:
             )
             self.path.parent.mkdir(parents=True, exist_ok=True)
             self.open()
+            get_catalog().add_session(self.path)
+            write_metadata(self.path, self.metadata)
+            # Write the queued rows if the session ends without being closed (e.g. an uncaught exception)
+            atexit.register(self.close, status="interrupted")
 
     # TODO: see if we can/should merge record_* methods into one
     def record_event(self, event: Any) -> None:
@@ -65,8 +182,11 @@ class Logger:
         slot: list[Any] = [perf_counter(), self.scenario_time, "event", event.plugin, adress, value]
         self.write_single_slot(slot)
 
-    def record_input(self, module: str, key: str, state: str) -> None:
-        slot: list[Any] = [perf_counter(), self.scenario_time, "input", module, key, state]
+    def record_input(self, module: str, key: str, state: str, logtime: float | None = None) -> None:
+        # logtime can be given when the input was stamped at its dispatch (see Window.on_key_press)
+        if logtime is None:
+            logtime = perf_counter()
+        slot: list[Any] = [logtime, self.scenario_time, "input", module, key, state]
         self.write_single_slot(slot)
 
     def record_aoi(self, container: Any, name: str) -> None:
@@ -75,12 +195,59 @@ class Logger:
         slot: list[Any] = [perf_counter(), self.scenario_time, "aoi", plugin, widget, container.get_x1y1x2y2()]
         self.write_single_slot(slot)
 
-    def record_state(self, graph_name: str, attribute: str, value: Any) -> None:
-        module: str = graph_name.split("_")[0]
-        graph_name = "_".join(graph_name.split("_")[1:])
-        address: str = f"{graph_name}, {attribute}"
-        slot: list[Any] = [perf_counter(), self.scenario_time, "state", module, address, value]
-        self.write_single_slot(slot)
+    def get_state_recorder(self, graph_name: str, attribute: str) -> StateRecorder:
+        """Return the recorder of a widget state, its module and address being computed (and interned) once"""
+        try:
+            return self.state_recorders[(graph_name, attribute)]
+        except KeyError:
+            module: str = sys.intern(graph_name.split("_")[0])
+            address: str = sys.intern(f"{'_'.join(graph_name.split('_')[1:])}, {attribute}")
+            recorder: StateRecorder = StateRecorder(self, module, address)
+            self.state_recorders[(graph_name, attribute)] = recorder
+            return recorder
+
+    def record_state(self, graph_name: str, attribute: str, value: Any, logtime: float | None = None) -> None:
+        self.get_state_recorder(graph_name, attribute).record(value, logtime)
+
+    def register_channel(self, graph_name: str, attribute: str, deadband: float = 0.0) -> LogChannel:
+        """Register a numeric state (a number or a tuple of numbers) of a widget, to be logged with record_channel"""
+        module: str = sys.intern(graph_name.split("_")[0])
+        address: str = sys.intern(f"{'_'.join(graph_name.split('_')[1:])}, {attribute}")
+        channel: LogChannel = LogChannel(len(self.channels), module, address, deadband)
+        self.channels.append(channel)
+        if self.compact_states:
+            self.write_single_slot([perf_counter(), self.scenario_time, "channel", module, address, channel.number])
+        return channel
+
+    def record_channel(self, channel: LogChannel, value: Any, logtime: float | None = None) -> None:
+        values: tuple[float, ...] = tuple(value) if isinstance(value, (tuple, list)) else (value,)
+        last_values: tuple[float, ...] | None = channel.last_values
+        if channel.deadband > 0 and last_values is not None:
+            if all(abs(v - lv) <= channel.deadband for v, lv in zip(values, last_values)):
+                return
+        channel.last_values = values
+
+        if logtime is None:
+            logtime = perf_counter()
+        if self.compact_states:
+            sample: str = " ".join(str(round(v, self.maxfloats)) for v in values)
+            self.queue_row((logtime, self.scenario_time, "sample", "", channel.number, sample))
+        else:
+            self.queue_row((logtime, self.scenario_time, "state", channel.module, channel.address, value))
+        if self.frame_onsets:
+            self.pending_onsets.append((channel.module, channel.address, logtime))
+
+    def record_onsets(self, flip_time: float) -> None:
+        # The states changed since the last flip became visible with this one.
+        # The onset row value is the logtime of the matching state row (join key)
+        if not self.frame_onsets or len(self.pending_onsets) == 0:
+            return
+        scenario_time: float = self.scenario_time
+        self.queue.extend(
+            (flip_time, scenario_time, "onset", module, address, logtime)
+            for module, address, logtime in self.pending_onsets
+        )
+        self.pending_onsets = list()
 
     def record_parameter(self, plugin: str, address: str, value: Any) -> None:
         slot: list[Any] = [perf_counter(), self.scenario_time, "parameter", plugin, address, value]
@@ -96,6 +263,11 @@ class Logger:
         slot = [perf_counter(), self.scenario_time, "seed_output", module, "", output]
         self.write_single_slot(slot)
 
+    def record_seed_entry(self, entry_type: str, module: str, address: Any, value: Any) -> None:
+        # Compact seeds logging rows (seed_stream, seed_spec and seed_draws, see core.pseudorandom)
+        slot: list[Any] = [perf_counter(), self.scenario_time, entry_type, module, address, value]
+        self.write_single_slot(slot)
+
     def log_manual_entry(self, entry: str, key: str = "manual") -> None:
         slot: list[Any] = [perf_counter(), self.scenario_time, key, "", "", entry]
         self.write_single_slot(slot)
@@ -105,50 +277,133 @@ class Logger:
         return self
 
     def __exit__(self, type: Any, value: Any, traceback: Any) -> None:
-        self.file.close()
+        self.close()
 
     def open(self) -> None:
-        create_header: bool = not (self.path.exists() and self.mode == "a")
-        self.file = open(str(self.path), self.mode, newline="")
-        self.writer = DictWriter(self.file, fieldnames=self.fields_list)
+        # Each segment starts with the header
+        path: Path = get_segment_path(self.path, self.segment_number)
+        create_header: bool = not (path.exists() and self.mode == "a")
+        self.file = open(str(path), self.mode, newline="")
+        self.writer = csv_writer(self.file)
         if create_header:
-            self.writer.writeheader()
+            self.writer.writerow(self.fields_list)
 
-    def close(self) -> None:
+    def close(self, status: str = "complete") -> None:
+        if self.file is None:
+            return
+        self.write_row_queue()
+        self.sync()
+        segments: int = self.segment_number + 1
+        self.close_segment()
+        if self.compressor is not None:
+            self.compressor.close()
+            self.compressor = None
+        self.finalize_metadata(segments, status)
+
+    def update_metadata(self, **entries: Any) -> None:
+        """Add entries to the session metadata sidecar (e.g. the scenario, once loaded)"""
+        self.metadata.update(entries)
+        if self.file is not None:
+            write_metadata(self.path, self.metadata)
+
+    def finalize_metadata(self, segments: int, status: str = "complete") -> None:
+        self.metadata.update(
+            status=status,
+            end=datetime.now().isoformat(timespec="seconds"),
+            duration=round(perf_counter() - self.start_time, 3),
+            scenario_duration=round(self.scenario_time, 3),
+            segments=segments,
+            rows=dict(self.row_counts),
+        )
+        write_metadata(self.path, self.metadata)
+
+    def close_segment(self) -> None:
         self.file.close()
+        self.file = None
+        # The first segment (the session file) is never compressed
+        if self.compress_segments and self.segment_number > 0:
+            if self.compressor is None:
+                self.compressor = SegmentCompressor()
+            self.compressor.compress(get_segment_path(self.path, self.segment_number))
+
+    def rotate(self) -> None:
+        self.sync()
+        self.close_segment()
+        self.segment_number += 1
+        self.segment_start = perf_counter()
+        self.open()
+
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = perf_counter()
+
+    def checkpoint(self) -> None:
+        """Sync the written rows to the disk, and open a new segment, when due"""
+        now: float = perf_counter()
+        if now - self.last_checkpoint < CHECKPOINT_PERIOD:
+            return
+        self.last_checkpoint = now
+        if (self.segment_size > 0 and self.file.tell() >= self.segment_size) or (
+            self.segment_duration > 0 and now - self.segment_start >= self.segment_duration
+        ):
+            self.rotate()
+        elif self.fsync_period > 0 and now - self.last_sync >= self.fsync_period:
+            self.sync()
 
     def add_row_to_queue(self, row: Any) -> None:
         self.queue.append(row)
 
+    def queue_row(self, row: tuple[Any, ...]) -> None:
+        queue: list[tuple[Any, ...]] = self.queue
+        queue.append(row)
+        if self.file is not None and (len(queue) >= MAX_QUEUE_ROWS or row[0] - queue[0][0] >= MAX_QUEUE_AGE):
+            self.write_row_queue()
+
     def empty_queue(self) -> None:
         self.queue = list()
 
-    def round_row(self, row: Any) -> Any:
-        new_list: list[Any] = list()
-        for col in row:
-            new_value: Any = round(col, self.maxfloats) if isinstance(col, (float, int)) else col
-            new_list.append(new_value)
-        return self.slot(*new_list)
+    def format_rows(self, rows: list[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+        """Round the numbers of the rows (times, and numeric addresses or values) in a single pass"""
+        n: int = self.maxfloats
+        number: tuple[type, ...] = (float, int)
+        return [
+            (
+                round(logtime, n),
+                round(scenario_time, n),
+                type_,
+                module,
+                round(address, n) if isinstance(address, number) else address,
+                round(value, n) if isinstance(value, number) else value,
+            )
+            for logtime, scenario_time, type_, module, address, value in rows
+        ]
 
     def write_row_queue(self, change_dict: dict[str, Any] | None = None) -> None:
-        if not REPLAY_MODE:
-            if len(self.queue) == 0:
-                print(_("Warning, queue is empty"))
-            else:
-                for this_row in self.queue:
-                    row_dict: dict[str, Any] = self.round_row(this_row)._asdict()
-                    if change_dict is not None:
-                        for k, v in change_dict.items():
-                            row_dict[k] = v
-                    self.writer.writerow(row_dict)
-                    if self.lsl is not None:
-                        self.lsl.push(";".join([str(r) for r in row_dict.values()]))
-                self.empty_queue()
+        """Write the queued rows (the scheduler flushes the queue once per frame, see also queue_row)"""
+        if len(self.queue) == 0:
+            return
+        if REPLAY_MODE:
+            self.empty_queue()
+            return
+
+        rows: list[tuple[Any, ...]] = self.format_rows(self.queue)
+        self.empty_queue()
+        if change_dict is not None:
+            indices: dict[int, Any] = {self.fields_list.index(k): v for k, v in change_dict.items()}
+            rows = [tuple(indices.get(i, col) for i, col in enumerate(row)) for row in rows]
+        self.writer.writerows(rows)
+        self.row_counts.update(row[2] for row in rows)
+        self.checkpoint()
+        if self.lsl is not None:
+            for row in rows:
+                row_dict: dict[str, Any] = dict(zip(self.fields_list, row))
+                if row_dict["type"] == "sample":  # The streams get the state rows
+                    row_dict = self.channels[row_dict["address"]].expand(row_dict)
+                self.lsl.push_row(row_dict)
 
     def write_single_slot(self, values: list[Any]) -> None:
-        row: Any = self.slot(*values)
-        self.add_row_to_queue(row)
-        self.write_row_queue()
+        self.queue_row(tuple(values))
 
     def set_totaltime(self, totaltime: float) -> None:
         self.totaltime: float = totaltime
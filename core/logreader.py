@@ -9,9 +9,10 @@ from bisect import bisect_right
 from pathlib import Path
 from typing import Any
 
-from core.constants import PATHS as P
+from core.catalog import get_catalog
 from core.error import get_errors
 from core.event import Event
+from core.sessionfile import SESSION_FIELDS, read_session_rows
 
 # Some plugins must not be replayed for now
 IGNORE_PLUGINS: list[str] = ["labstreaminglayer", "parallelport"]
@@ -21,6 +22,36 @@ IGNORE_PLUGINS: list[str] = ["labstreaminglayer", "parallelport"]
 BLOCKING_THRESHOLD: float = 0.5
 
 
+def expand_channel_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Replace the channel and sample rows of a session logged with compact_states by the matching state rows"""
+    channels: dict[str, tuple[str, str]] = dict()  # Channel number: (module, address)
+    expanded: list[dict[str, Any]] = list()
+    for row in rows:
+        if row["type"] == "channel":
+            channels[row["value"]] = (row["module"], row["address"])
+        elif row["type"] == "sample":
+            module, address = channels[row["address"]]
+            values: tuple[float, ...] = tuple(float(v) for v in row["value"].split())
+            value: str = str(values[0]) if len(values) == 1 else str(values)
+            expanded.append(dict(row, type="state", module=module, address=address, value=value))
+        else:
+            expanded.append(row)
+    return expanded
+
+
+def write_expanded_session(session_path: Path, output_path: Path | None = None) -> Path:
+    """Write a session logged with compact_states in the legacy layout (<session>_expanded.csv)"""
+    session_path = Path(session_path)
+    if output_path is None:
+        output_path = session_path.with_name(f"{session_path.stem}_expanded.csv")
+    rows: list[dict[str, Any]] = expand_channel_rows(list(read_session_rows(session_path)))
+    with open(str(output_path), "w", newline="") as output_file:
+        writer: csv.DictWriter = csv.DictWriter(output_file, fieldnames=SESSION_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return output_path
+
+
 class LogReader:
     """
     The log reader takes a session file as input and is able to return its entries depending on
@@ -41,7 +72,7 @@ class LogReader:
                 pass
         else:
             # Look up by session ID
-            session_file_list: list[Path] = [f for f in P["SESSIONS"].glob(f"**/{replay_session_id}_*.csv")]
+            session_file_list: list[Path] = get_catalog().get_session_paths(replay_session_id)
 
             if len(session_file_list) == 0:
                 msg = _("The desired session file (ID=%s) does not exist") % replay_session_id
@@ -66,6 +97,7 @@ class LogReader:
         self.blocking_segments: list[tuple[float, float, float]] = []
         self._bp_replay_times: list[float] = [0.0]
         self._bp_scenario_times: list[float] = [0.0]
+        self.random_mode: str = "legacy"  # Sessions without random_mode entry were recorded in legacy mode
 
         self.reload_session()
 
@@ -82,18 +114,18 @@ class LogReader:
         self.blocking_segments = []
         self._bp_replay_times = [0.0]
         self._bp_scenario_times = [0.0]
+        self.random_mode = "legacy"
 
         # First pass: read all rows
         all_rows: list[dict[str, Any]] = []
-        with open(self.session_file_path, newline="") as csvfile:
-            reader: csv.DictReader = csv.DictReader(csvfile)
-            for row in reader:
-                row["logtime"] = float(row["logtime"])
-                row["scenario_time"] = float(row["scenario_time"])
-                all_rows.append(row)
+        for row in read_session_rows(self.session_file_path):
+            row["logtime"] = float(row["logtime"])
+            row["scenario_time"] = float(row["scenario_time"])
+            all_rows.append(row)
 
         if not all_rows:
             return
+        all_rows = expand_channel_rows(all_rows)
 
         # Capture first logtime for normalization
         first_logtime: float = all_rows[0]["logtime"]
@@ -112,8 +144,12 @@ class LogReader:
             if row["module"] in IGNORE_PLUGINS:
                 continue
 
+            # Pseudorandom mode the session was recorded with
+            if row["type"] == "random_mode":
+                self.random_mode = row["value"]
+
             # Event case
-            if row["type"] == "event":
+            elif row["type"] == "event":
                 self.contents.append(self.session_event_to_str(row))
 
             # Input case
@@ -126,9 +162,13 @@ class LogReader:
 
             # State case
             elif row["type"] == "state":
+                # Joystick axes, logged as a (x, y) channel
+                if "joystick" in row["address"]:
+                    row["value"] = eval(row["value"])
+                    self.joystick_inputs.append(row)
                 # Record communications radio frequencies
                 # AND track cursor positions
-                if (
+                elif (
                     "radio_frequency" in row["address"]
                     or "cursor_proportional" in row["address"]
                     or "slider_" in row["address"]
@@ -0,0 +1,182 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Lab streaming layer session streaming.
+
+The logger hands its rows to an LslStreamer, whose worker thread formats them and pushes
+them by chunks (one outlet flush per chunk), out of the frame thread. Each sample is timestamped with the logtime of
+its row, mapped to the LSL clock. Two outlets are created:
+  - a marker stream (one string channel), receiving every row (and the plugin markers);
+  - a continuous stream (one float channel per tracked state), receiving a sample each
+    time one of the tracked states changes (sample and hold of the other channels).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from queue import Empty, Queue
+from time import perf_counter
+from typing import Any
+
+SOURCE_ID: str = "myuidw435368"
+
+# Maximal number of queued rows pushed in a single chunk
+MAX_CHUNK_SIZE: int = 256
+
+# The logtime to LSL clock offset is measured again after this delay (s), to follow a clock drift
+CLOCK_OFFSET_REFRESH: float = 10.0
+
+# Tanks of the default resman network (streamed when the scenario network is not known)
+DEFAULT_TANK_LETTERS: str = "abcdef"
+
+
+def get_continuous_states(tank_letters: Iterable[str] = DEFAULT_TANK_LETTERS) -> dict[tuple[str, str], tuple[str, ...]]:
+    """Return the continuous stream channels, fed by the matching state rows: {(module, address): channel names}"""
+    states: dict[tuple[str, str], tuple[str, ...]] = {
+        ("track", "reticle, cursor_proportional"): ("track_cursor_x", "track_cursor_y"),
+    }
+    states.update({("resman", f"tank_{letter}, fluid_level"): (f"resman_tank_{letter}",) for letter in tank_letters})
+    return states
+
+
+def measure_clock_offset(local_clock: Any, repeat: int = 10) -> float:
+    """
+    Return the offset to add to a perf_counter() time to get the LSL local_clock() time.
+    The local clock is read between two perf_counter() calls, and the tightest bracket is kept.
+    """
+    best_bracket: float = float("inf")
+    offset: float = 0.0
+    for _i in range(repeat):
+        before: float = perf_counter()
+        lsl_time: float = local_clock()
+        after: float = perf_counter()
+        if after - before < best_bracket:
+            best_bracket = after - before
+            offset = lsl_time - (before + after) / 2
+    return offset
+
+
+def push_samples(outlet: Any, samples: list[list[Any]], timestamps: list[float]) -> None:
+    """
+    Push samples with their own timestamp. pylsl only takes a single timestamp per chunk
+    (the one of its last sample), so the samples are pushed one at a time, the outlet being
+    flushed once, with the last one.
+    """
+    for n, (sample, timestamp) in enumerate(zip(samples, timestamps), 1):
+        outlet.push_sample(sample, timestamp, pushthrough=n == len(samples))
+
+
+class LslStreamer(threading.Thread):
+    def __init__(
+        self,
+        lsl: Any,
+        name: str = "OpenMATB",
+        source_id: str = SOURCE_ID,
+        states: dict[tuple[str, str], tuple[str, ...]] | None = None,
+    ) -> None:
+        """
+        lsl is the pylsl module (or any object exposing StreamInfo, StreamOutlet and local_clock).
+        states are the continuous channels (see get_continuous_states), those of the default network by default.
+        """
+        super().__init__(name="lsl-streamer", daemon=True)
+        self.lsl: Any = lsl
+        self.items: Queue[Any] = Queue()
+
+        marker_info: Any = lsl.StreamInfo(
+            name, type="Markers", channel_count=1, nominal_srate=0, channel_format="string", source_id=source_id
+        )
+        self.marker_outlet: Any = lsl.StreamOutlet(marker_info)
+
+        if states is None:
+            states = get_continuous_states()
+        self.channels: list[str] = [c for names in states.values() for c in names]
+        self.channel_index: dict[tuple[str, str], int] = dict()
+        for key, names in states.items():
+            self.channel_index[key] = self.channels.index(names[0])
+        continuous_info: Any = lsl.StreamInfo(
+            f"{name}-states",
+            type="States",
+            channel_count=len(self.channels),
+            nominal_srate=0,
+            channel_format="float32",
+            source_id=f"{source_id}-states",
+        )
+        self.continuous_outlet: Any = lsl.StreamOutlet(continuous_info)
+        self.values: list[float] = [float("nan")] * len(self.channels)
+
+        self.clock_offset: float = measure_clock_offset(lsl.local_clock)
+        self.clock_offset_time: float = perf_counter()
+        self.errors: int = 0  # Chunks that could not be pushed
+
+    # Called from the main thread
+    def push_row(self, row_dict: dict[str, Any]) -> None:
+        self.items.put(row_dict)
+
+    def push_marker(self, message: str, logtime: float) -> None:
+        self.items.put((logtime, message))
+
+    def stop(self) -> None:
+        """Push the queued rows, then end the thread"""
+        self.items.put(None)
+        if self.is_alive():
+            self.join()
+
+    # Called from the worker thread
+    def run(self) -> None:
+        while True:
+            items: list[Any] = [self.items.get()]
+            while len(items) < MAX_CHUNK_SIZE:
+                try:
+                    items.append(self.items.get_nowait())
+                except Empty:
+                    break
+
+            try:
+                self.push_chunks([i for i in items if i is not None])
+            except Exception as error:  # The chunk is lost, but the thread must go on (and not die silently)
+                self.errors += 1
+                if self.errors == 1:
+                    print(_("Warning, rows could not be streamed to LSL (%s)") % error)
+            if None in items:
+                if self.errors > 1:
+                    print(_("Warning, %s chunks could not be streamed to LSL") % self.errors)
+                return
+
+    def update_channels(self, row_dict: dict[str, Any]) -> bool:
+        """Update the continuous channels from a state row. Return if a channel was updated"""
+        if row_dict["type"] != "state":
+            return False
+        index: int | None = self.channel_index.get((row_dict["module"], row_dict["address"]))
+        if index is None:
+            return False
+        value: Any = row_dict["value"]
+        for i, v in enumerate(value if isinstance(value, (list, tuple)) else [value]):
+            self.values[index + i] = float(v)
+        return True
+
+    def push_chunks(self, items: list[Any]) -> None:
+        if perf_counter() - self.clock_offset_time > CLOCK_OFFSET_REFRESH:
+            self.clock_offset = measure_clock_offset(self.lsl.local_clock)
+            self.clock_offset_time = perf_counter()
+
+        markers: list[list[str]] = list()
+        marker_times: list[float] = list()
+        samples: list[list[float]] = list()
+        sample_times: list[float] = list()
+        for item in items:
+            if isinstance(item, tuple):
+                logtime, message = item
+            else:
+                logtime = item["logtime"]
+                message = ";".join([str(v) for v in item.values()])
+                if self.update_channels(item):
+                    samples.append(list(self.values))
+                    sample_times.append(logtime + self.clock_offset)
+            markers.append([message])
+            marker_times.append(logtime + self.clock_offset)
+
+        push_samples(self.marker_outlet, markers, marker_times)
+        push_samples(self.continuous_outlet, samples, sample_times)
@@ -138,6 +138,7 @@ class ModalDialog:
                 v.delete()
         get_logger().log_manual_entry(f"{self.name} end", key="dialog")
         self.win.modal_dialog = None
+        self.win.mark_dirty()
 
     def on_exit(self) -> None:
         """The user requested to exit OpenMATB"""
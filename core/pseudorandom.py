@@ -2,21 +2,84 @@
 # Institut National Universitaire Champollion (Albi, France).
 # License : CeCILL, version 2.1 (see the LICENSE file)
 
+from __future__ import annotations
+
 import random
+from array import array
 from collections.abc import Sequence
-from typing import TypeVar
+from typing import Any, TypeVar
 
+from rstr import Rstr
 from rstr import xeger as rstrxeger
 
 from core.constants import REPLAY_MODE
 from core.logger import get_logger
-from core.utils import find_the_last_session_number
+from core.utils import find_the_last_session_number, get_conf_value
 
 T = TypeVar("T")
 
 plugins_using_seed: list[str] = ["communications", "sysmon"]  # Used to convert a plugin alias into
 # a unique integer
 
+# "counter": each draw uses a stream keyed by a hash of (session, plugin, time, add), without any global state.
+# "legacy": the global random module is reseeded before each draw (sessions recorded before the counter mode)
+RANDOM_MODES: tuple[str, ...] = ("counter", "legacy")
+
+MASK64: int = (1 << 64) - 1
+GOLDEN_GAMMA: int = 0x9E3779B97F4A7C15
+
+# Literal values a logged draw specification can hold (other sequences are logged by their length)
+SPEC_LITERALS: tuple[type, ...] = (int, float, str)
+
+_mode: str | None = None
+_streams: dict[str, tuple[CounterRandom, Rstr]] = dict()  # One stream per plugin
+_compact: bool | None = None
+_recorders: dict[str, DrawRecorder] = dict()  # One compact draws recorder per plugin
+
+
+def splitmix64(x: int) -> int:
+    z: int = (x + GOLDEN_GAMMA) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+class CounterRandom(random.Random):
+    """
+    A counter-based generator: the n-th output of a stream is splitmix64(key + n * gamma).
+    (Re)seeding only sets the key and resets the counter, which is cheap.
+    """
+
+    def __init__(self, key: int = 0) -> None:
+        self.key: int = 0
+        self.counter: int = 0
+        super().__init__(key)
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        self.key = int(a or 0) & MASK64
+        self.counter = 0
+
+    def next64(self) -> int:
+        self.counter += 1
+        return splitmix64((self.key + self.counter * GOLDEN_GAMMA) & MASK64)
+
+    def random(self) -> float:
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:  # Most draws (randbelow of small ranges)
+            return self.next64() >> (64 - k)
+        bits: int = 0
+        for i in range((k + 63) // 64):
+            bits |= self.next64() << (64 * i)
+        return bits & ((1 << k) - 1)
+
+    def getstate(self) -> tuple[int, int]:
+        return self.key, self.counter
+
+    def setstate(self, state: tuple[int, int]) -> None:
+        self.key, self.counter = state
+
 
 def _get_session_id() -> int:
     if not REPLAY_MODE:
@@ -28,44 +91,226 @@ def plugin_alias_to_int(plugin_alias: str) -> int:
     return plugins_using_seed.index(plugin_alias)
 
 
+def get_mode() -> str:
+    global _mode
+    if _mode is None:
+        try:
+            _mode = get_conf_value("Openmatb", "random_mode")
+        except KeyError:
+            _mode = "counter"
+        if _mode not in RANDOM_MODES:
+            _mode = "counter"
+    return _mode
+
+
+def set_mode(mode: str | None) -> None:
+    # A replayed session must be replayed with the mode it was recorded with (None: read config.ini again)
+    global _mode
+    _mode = mode
+
+
+def counter_prefix(session_id: int, plugin_int: int, scenario_time_sec: float) -> int:
+    # Key state before folding `add` (shared by the draws of a plugin second)
+    key: int = splitmix64(int(session_id) & MASK64)
+    for value in (plugin_int, int(scenario_time_sec)):
+        key = splitmix64(key ^ (int(value) & MASK64))
+    return key
+
+
+def counter_key(session_id: int, plugin_int: int, scenario_time_sec: float, add: int = 0) -> int:
+    # Same inputs as the legacy seed, hashed into a 64-bit stream key
+    return splitmix64(counter_prefix(session_id, plugin_int, scenario_time_sec) ^ (int(add) & MASK64))
+
+
+def legacy_seed(session_id: int, plugin_int: int, scenario_time_sec: float, add: int = 0) -> int:
+    return int(session_id) + plugin_int + int(scenario_time_sec) + add
+
+
+def stream_key(plugin_alias: str, scenario_time_sec: float, add: int = 0) -> int:
+    return counter_key(_get_session_id(), plugin_alias_to_int(plugin_alias), scenario_time_sec, add)
+
+
+def get_stream(plugin_alias: str, scenario_time_sec: float, add: int = 0) -> tuple[int, Any, Any]:
+    """Return the (seed, generator, regex generator) to use for a draw"""
+    if get_mode() == "legacy":
+        return set_seed(plugin_alias, scenario_time_sec, add), random, rstrxeger
+
+    if plugin_alias not in _streams:
+        rng: CounterRandom = CounterRandom()
+        _streams[plugin_alias] = (rng, Rstr(rng))
+    rng, rstr = _streams[plugin_alias]
+    key: int = stream_key(plugin_alias, scenario_time_sec, add)
+    rng.seed(key)
+    return key, rng, rstr.xeger
+
+
 def set_seed(plugin_alias: str, scenario_time_sec: float, add: int = 0) -> int:
     # `add` is used in case multiple seeds must be generated at the same time (second precision)
-    unique_plugin_int: int = plugin_alias_to_int(plugin_alias)
-    seed: int = int(_get_session_id()) + unique_plugin_int + int(scenario_time_sec) + add
+    seed: int = legacy_seed(_get_session_id(), plugin_alias_to_int(plugin_alias), scenario_time_sec, add)
     random.seed(seed)
     return seed
 
 
+def is_compact() -> bool:
+    global _compact
+    if _compact is None:
+        try:
+            _compact = get_conf_value("Openmatb", "compact_seeds")
+        except (KeyError, TypeError):
+            _compact = False
+    return _compact
+
+
+def set_compact(compact: bool | None) -> None:
+    # None: read config.ini again
+    global _compact
+    flush_draws()
+    _recorders.clear()
+    _compact = compact
+
+
+class DrawRecorder:
+    """
+    Compact seeds logging of a plugin. Instead of a seed_value and a seed_output row per draw:
+      - a seed_stream row describes the plugin stream once (address: random mode, value: session and
+        plugin numbers), from which the seed of any (second, add) draw can be computed;
+      - a seed_spec row is written the first time a draw specification (function and arguments) is used
+        (address: the specification number, value: its literal repr);
+      - draws are counted in a single seed_draws row per plugin and second
+        (address: the scenario second, value: "spec:add" tokens, in draw order).
+    core.seedlog regenerates the full seed/output table from these rows.
+    """
+
+    def __init__(self, plugin_alias: str) -> None:
+        self.plugin_alias: str = plugin_alias
+        self.specs: dict[tuple[Any, ...], int] = dict()
+        self.time_sec: int | None = None
+        self.draws: list[str] = list()
+
+    def record(self, spec: tuple[Any, ...], time_sec: int, add: int) -> None:
+        logger: Any = get_logger()
+        if self.time_sec is None:
+            logger.record_seed_entry(
+                "seed_stream",
+                self.plugin_alias,
+                get_mode(),
+                f"session={_get_session_id()};plugin={plugin_alias_to_int(self.plugin_alias)}",
+            )
+        elif time_sec != self.time_sec:
+            self.flush()
+        self.time_sec = time_sec
+
+        spec_n: int | None = self.specs.get(spec)
+        if spec_n is None:
+            spec_n = self.specs[spec] = len(self.specs)
+            logged_spec: tuple[Any, ...] = tuple(list(a) if isinstance(a, tuple) else a for a in spec)
+            logger.record_seed_entry("seed_spec", self.plugin_alias, spec_n, repr(logged_spec))
+        self.draws.append(f"{spec_n}:{add}")
+
+    def flush(self) -> None:
+        if len(self.draws) > 0:
+            get_logger().record_seed_entry("seed_draws", self.plugin_alias, self.time_sec, " ".join(self.draws))
+            self.draws = list()
+
+
+def sequence_spec(arg: Sequence[Any]) -> tuple[Any, ...] | int:
+    # The output index only depends on the sequence length: items that cannot be logged as literals are omitted
+    items: tuple[Any, ...] = tuple(arg)
+    if all(isinstance(i, SPEC_LITERALS) for i in items):
+        return items
+    return len(items)
+
+
+def record_draw(
+    plugin_name: str, seed: int, output: Any, spec: tuple[Any, ...], scenario_time: float, add: int
+) -> None:
+    if not is_compact():
+        get_logger().record_a_pseudorandom_value(plugin_name, seed, output)
+        return
+    if plugin_name not in _recorders:
+        _recorders[plugin_name] = DrawRecorder(plugin_name)
+    _recorders[plugin_name].record(spec, int(scenario_time), add)
+
+
+def flush_draws() -> None:
+    """Write the pending compact draws rows (the last second of each plugin)"""
+    for recorder in _recorders.values():
+        recorder.flush()
+
+
+def counter_index(key: int, size: int) -> int:
+    """
+    Return the index CounterRandom(key).choice draws over `size` items, without a generator: the
+    getrandbits rejection loop of random.Random._randbelow, over the counter outputs of the key.
+    """
+    bits: int = size.bit_length()
+    counter: int = 1
+    index: int = splitmix64((key + GOLDEN_GAMMA) & MASK64) >> (64 - bits)
+    while index >= size:
+        counter += 1
+        index = splitmix64((key + counter * GOLDEN_GAMMA) & MASK64) >> (64 - bits)
+    return index
+
+
+def sample_indices(
+    plugin_alias: str, scenario_time_sec: float, first_add: int, count: int, size: int
+) -> tuple[array, array]:
+    """
+    Precompute the draws of sample(population, ...) over a population of `size` items, for count consecutive
+    adds from first_add, in a scenario second. Return their seeds and drawn indices (the ones sample would
+    draw), as arrays. The counter mode computes them from the keys alone; the legacy mode must reseed the
+    Mersenne Twister for each draw. The draws are not logged: the caller records those it uses.
+    """
+    session_id: int = _get_session_id()
+    plugin_int: int = plugin_alias_to_int(plugin_alias)
+
+    if get_mode() == "legacy":
+        seeds: array = array("Q", bytes(8 * count))
+        indices: array = array("B", bytes(count))
+        # A single item draw only depends on the population size: choice draws the same index as sample
+        population: range = range(size)
+        rng: random.Random = random.Random()
+        for i in range(count):
+            seeds[i] = legacy_seed(session_id, plugin_int, scenario_time_sec, first_add + i)
+            rng.seed(seeds[i])
+            indices[i] = rng.choice(population)
+        return seeds, indices
+
+    prefix: int = counter_prefix(session_id, plugin_int, scenario_time_sec)
+    seeds = array("Q", [splitmix64(prefix ^ ((first_add + i) & MASK64)) for i in range(count)])
+    return seeds, array("B", [counter_index(seed, size) for seed in seeds])
+
+
 def choice(arg: Sequence[T], plugin_name: str, scenario_time: float, add: int = 1) -> T:
-    seed: int = set_seed(plugin_name, scenario_time, add)
-    output: T = random.choice(arg)
-    get_logger().record_a_pseudorandom_value(plugin_name, seed, output)
+    seed, rng, _xeger = get_stream(plugin_name, scenario_time, add)
+    output: T = rng.choice(arg)
+    record_draw(plugin_name, seed, output, ("choice", sequence_spec(arg)), scenario_time, add)
     return output
 
 
 def sample(arg: Sequence[T], plugin_name: str, scenario_time: float, add: int) -> T:
-    seed: int = set_seed(plugin_name, scenario_time, add)
-    output: T = random.sample(arg, 1)[0]
-    get_logger().record_a_pseudorandom_value(plugin_name, seed, output)
+    seed, rng, _xeger = get_stream(plugin_name, scenario_time, add)
+    output: T = rng.sample(arg, 1)[0]
+    record_draw(plugin_name, seed, output, ("sample", sequence_spec(arg)), scenario_time, add)
     return output
 
 
 def randint(arg1: int, arg2: int, plugin_name: str, scenario_time: float) -> int:
-    seed: int = set_seed(plugin_name, scenario_time)
-    output: int = random.randint(arg1, arg2)
-    get_logger().record_a_pseudorandom_value(plugin_name, seed, output)
+    seed, rng, _xeger = get_stream(plugin_name, scenario_time)
+    output: int = rng.randint(arg1, arg2)
+    record_draw(plugin_name, seed, output, ("randint", arg1, arg2), scenario_time, 0)
     return output
 
 
 def uniform(arg1: float, arg2: float, plugin_name: str, scenario_time: float, add: int) -> float:
-    seed: int = set_seed(plugin_name, scenario_time, add)
-    output: float = random.uniform(arg1, arg2)
-    get_logger().record_a_pseudorandom_value(plugin_name, seed, output)
+    seed, rng, _xeger = get_stream(plugin_name, scenario_time, add)
+    output: float = rng.uniform(arg1, arg2)
+    record_draw(plugin_name, seed, output, ("uniform", arg1, arg2), scenario_time, add)
     return output
 
 
 def xeger(call_rgx: str, plugin_name: str, scenario_time: float, add: int) -> str:
-    seed: int = set_seed(plugin_name, scenario_time, add)
-    output: str = rstrxeger(call_rgx)
-    get_logger().record_a_pseudorandom_value(plugin_name, seed, output)
+    seed, _rng, rng_xeger = get_stream(plugin_name, scenario_time, add)
+    output: str = rng_xeger(call_rgx)
+    record_draw(plugin_name, seed, output, ("xeger", call_rgx), scenario_time, add)
     return output
@@ -0,0 +1,117 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Incremental relayout helpers.
+
+The window layout is proportional to the window size, so a resize is an affine
+(sx, sy) scaling of every pixel geometry. Only geometries are rescaled: colours,
+texts and states are left untouched.
+
+The scales are absolute: the window size over the reference size (the size the layout
+was first computed for). Each object keeps the reference of its geometry values, from
+which they are computed again at each resize, so that float errors do not build up
+over repeated resizes. A value changed since the last resize (e.g. a moving cursor, or
+a widget created after it) is brought back to the reference scale, and becomes its
+new reference.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+from typing import Any
+
+from core.container import Container
+
+
+def scale_pairs(values: Any, sx: float, sy: float) -> list[float]:
+    """Scale a flat (x, y, x, y...) coordinates sequence"""
+    return [v * (sx if i % 2 == 0 else sy) for i, v in enumerate(values)]
+
+
+def scale_value(value: Any, axis: str, sx: float, sy: float) -> Any:
+    """Scale a value along an axis ("x", "y" or "xy" for a flat coordinates sequence)"""
+    if axis == "xy":
+        return type(value)(scale_pairs(value, sx, sy)) if isinstance(value, tuple) else scale_pairs(value, sx, sy)
+    factor: float = sx if axis == "x" else sy
+    if isinstance(value, (list, tuple)):
+        return type(value)(v * factor for v in value)
+    return value * factor
+
+
+class Relayout:
+    """A relayout pass, from the previous absolute scale to the new one"""
+
+    def __init__(self, previous: tuple[float, float], scale: tuple[float, float]) -> None:
+        self.previous: tuple[float, float] = previous
+        self.sx, self.sy = scale
+        # Containers rescaled during the pass, by reference (shared containers stay shared), and the
+        # references of the containers that had none, by id
+        self.containers: dict[int, Container] = dict()
+        self.container_references: dict[int, Container] = dict()
+
+
+def get_references(obj: Any) -> dict[Hashable, tuple[Any, Any]]:
+    """Return the {key: (reference value, last rescaled value)} of an object geometry"""
+    return vars(obj).setdefault("layout_references", dict())
+
+
+def rescale(obj: Any, key: Hashable, value: Any, axis: str, relayout: Relayout) -> Any:
+    """Return a geometry value at the new scale, computed from its reference"""
+    references: dict[Hashable, tuple[Any, Any]] = get_references(obj)
+    entry: tuple[Any, Any] | None = references.get(key)
+    if entry is not None and entry[1] == value:
+        reference: Any = entry[0]
+    else:
+        reference = scale_value(value, axis, 1 / relayout.previous[0], 1 / relayout.previous[1])
+    scaled: Any = scale_value(reference, axis, relayout.sx, relayout.sy)
+    references[key] = (reference, scaled)
+    return scaled
+
+
+def set_rescaled(obj: Any, key: Hashable, value: Any) -> None:
+    """Record the value actually stored once rescaled (e.g. rounded by a vertex buffer)"""
+    references: dict[Hashable, tuple[Any, Any]] = get_references(obj)
+    references[key] = (references[key][0], value)
+
+
+def rescale_container(obj: Any, key: Hashable, container: Container, relayout: Relayout) -> Container:
+    references: dict[Hashable, tuple[Any, Any]] = get_references(obj)
+    entry: tuple[Any, Any] | None = references.get(key)
+    if entry is not None and entry[1] is container:
+        reference: Container = entry[0]
+    else:
+        if id(container) not in relayout.container_references:
+            px, py = relayout.previous
+            relayout.container_references[id(container)] = Container(
+                container.name, container.l / px, container.b / py, container.w / px, container.h / py
+            )
+        reference = relayout.container_references[id(container)]
+
+    if id(reference) not in relayout.containers:
+        relayout.containers[id(reference)] = Container(
+            reference.name,
+            reference.l * relayout.sx,
+            reference.b * relayout.sy,
+            reference.w * relayout.sx,
+            reference.h * relayout.sy,
+        )
+    scaled: Container = relayout.containers[id(reference)]
+    references[key] = (reference, scaled)
+    return scaled
+
+
+def scale_geometry(obj: Any, geometry: dict[str, str], relayout: Relayout) -> None:
+    """Rescale the containers (or dicts of containers) attributes of an object, and its declared
+    pixel attributes ({attribute_name: axis})"""
+    for name, value in list(vars(obj).items()):
+        if isinstance(value, Container):
+            setattr(obj, name, rescale_container(obj, name, value, relayout))
+        elif isinstance(value, dict) and len(value) > 0 and all(isinstance(v, Container) for v in value.values()):
+            setattr(obj, name, {k: rescale_container(obj, (name, k), v, relayout) for k, v in value.items()})
+
+    for name, axis in geometry.items():
+        value = getattr(obj, name, None)
+        if value is not None:
+            setattr(obj, name, rescale(obj, name, value, axis, relayout))
@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 from bisect import bisect_right
+from math import ceil
 from time import gmtime, strftime
 from typing import Any
 
@@ -15,11 +16,14 @@ from core.constants import FONT_SIZES as F
 from core.container import Container
 from core.logger import get_logger
 from core.logreader import LogReader
+from core.pseudorandom import set_mode as set_random_mode
+from core.relayout import Relayout
 from core.scheduler import Scheduler
 from core.utils import clamp, get_replay_session_id
-from core.widgets import Frame, MuteButton, PlayPause, Reticle, SimpleHTML, Simpletext, Slider
+from core.widgets import Chronometer, Frame, MuteButton, PlayPause, Reticle, SimpleHTML, Slider
 from core.window import Window
 
+# Maximal replay time covered by one scheduler update. Longer (speeded up) frames are sub-stepped
 CLOCK_STEP: float = 0.1
 
 
@@ -33,8 +37,12 @@ class ReplayScheduler(Scheduler):
         self._session_path: str | None = session_path
         self.target_time: float = 0
         self.replay_time: float = 0
-        self._executed_key_indices: set[int] = set()
+        # Index of the next keyboard input, joystick input and state to replay
+        self._key_cursor: int = 0
+        self._joy_cursor: int = 0
+        self._state_cursor: int = 0
         self.keys_history: list[str] = []
+        self._keys_history_changed: bool = True
         self._muted: bool = True
 
         self.set_media_buttons()
@@ -72,6 +80,7 @@ class ReplayScheduler(Scheduler):
             self._key_logtimes: list[float] = [i["normalized_logtime"] for i in self.logreader.keyboard_inputs]
             self._joy_logtimes: list[float] = [i["normalized_logtime"] for i in self.logreader.joystick_inputs]
             self._state_logtimes: list[float] = [i["normalized_logtime"] for i in self.logreader.states]
+            set_random_mode(self.logreader.random_mode)
 
         super().set_scenario(self.logreader.contents)
 
@@ -81,6 +90,20 @@ class ReplayScheduler(Scheduler):
 
         self.pause_playback()
 
+    def relayout(self, relayout: Relayout) -> None:
+        super().relayout(relayout)
+        for widget in (
+            self.key_widget,
+            self.media_back,
+            self.playpause,
+            self.time,
+            self.mute_button,
+            self.slider,
+            self.inputs_back,
+            self.replay_reticle,
+        ):
+            widget.relayout(relayout)
+
     def set_inputs_buttons(self) -> None:
         # Plot the keyboard keys that are available in the present plugins
         input_container: Container = Window.MainWindow.get_container("inputstrip")
@@ -97,8 +120,8 @@ class ReplayScheduler(Scheduler):
         time_container: Container = media_container.reduce_and_translate(width=0.03, height=1, x=0.78)
 
         self.playpause: PlayPause = PlayPause("Play_pause_button", pp_container, self.toggle_playpause)
-        self.time: Simpletext = Simpletext(
-            "elapsed_time", time_container, text="", font_size=F["LARGE"], color=C["WHITE"]
+        self.time: Chronometer = Chronometer(
+            "elapsed_time", time_container, text="", font_size=F["LARGE"], color=C["WHITE"], cells=12
         )
 
         margin: int = 10
@@ -159,20 +182,28 @@ class ReplayScheduler(Scheduler):
         get_logger().set_scenario_time(self.scenario_time)
 
     def update(self, dt: float) -> None:
+        get_logger().write_row_queue()  # Nothing is written in replay mode: the queue is only emptied
         self.pause_if_end_reached()
-        self.update_time_string()
         self.slider_control_update()
 
-        if not self.is_paused:
-            dt = min(dt, self.target_time - self.replay_time)
-
-            if dt > 0:
-                self.replay_time += dt
-                super().update(dt)  # update_timers (mapping) + execute_events
+        dt = min(dt, self.target_time - self.replay_time) if not self.is_paused else 0
+        if dt > 0:
+            # At high speed, the frame time is processed in sub-steps of at most CLOCK_STEP, so that
+            # events and inputs are replayed in order. Only the last one refreshes the widgets.
+            n_steps: int = ceil(dt / CLOCK_STEP)
+            for i in range(n_steps):
+                self.replay_time += dt / n_steps
+                super().update(dt / n_steps, refresh=i == n_steps - 1)  # update_timers (mapping) + execute_events
+                self.replay_inputs()
         else:
-            # Required: check exit while paused (super().update is not called)
-            self.check_if_must_exit()
+            if self.is_paused:
+                # Required: check exit while paused (super().update is not called)
+                self.check_if_must_exit()
+            self.replay_inputs()
+
+        self.update_time_string()
 
+    def replay_inputs(self) -> None:
         # Defer input emulation while queued events can still be processed.
         # When scenario_time is paused (blocking plugin active), events in the
         # queue cannot fire, so we must allow keyboard emulation to proceed
@@ -195,7 +226,8 @@ class ReplayScheduler(Scheduler):
 
     def update_time_string(self) -> None:
         time_str: str = self.get_time_hms_str()
-        self.time.set_text(time_str)
+        speed: int = self.clock.get_speed()
+        self.time.set_text(time_str if speed == 1 else f"x{speed} {time_str}")
 
     def get_time_hms_str(self) -> str:
         # round to prevent displaying time as 0.099 instead of 0.1
@@ -327,8 +359,9 @@ class ReplayScheduler(Scheduler):
         # we need to suspend the clock as it schedules old events
         self.clock.unschedule(self.update)
 
-        self._executed_key_indices = set()
+        self._key_cursor = self._joy_cursor = self._state_cursor = 0
         self.keys_history = []
+        self._keys_history_changed = True
         self.clock.set_time(0)
         self.clock.tick()
         self.scenario_time = 0
@@ -341,24 +374,27 @@ class ReplayScheduler(Scheduler):
         self.clock.schedule(self.update)
 
     def emulate_keyboard_inputs(self) -> None:
-        lo: int = bisect_right(self._key_logtimes, self.replay_time - CLOCK_STEP)
+        # Every input logged up to replay_time and not replayed yet, in the logged order
         hi: int = bisect_right(self._key_logtimes, self.replay_time)
 
-        for idx in range(lo, hi):
-            if idx not in self._executed_key_indices:
-                self._executed_key_indices.add(idx)
-                input: dict[str, Any] = self.logreader.keyboard_inputs[idx]
-                for _plugin_name, plugin in self.plugins.items():
-                    plugin.do_on_key(input["address"], input["value"], True)
-
-                cmd: str = f"{input['address']} ({input['value']})"
-                if len(self.keys_history) == 0 or cmd != self.keys_history[-1]:
-                    self.keys_history.append(cmd)
-                if len(self.keys_history) > 30:
-                    del self.keys_history[0]
-
-        history_str: str = "<strong>Keyboard history:\n</strong>" + "<br>".join(self.keys_history)
-        self.key_widget.set_text(history_str)
+        for idx in range(self._key_cursor, hi):
+            input: dict[str, Any] = self.logreader.keyboard_inputs[idx]
+            for _plugin_name, plugin in self.plugins.items():
+                plugin.do_on_key(input["address"], input["value"], True)
+
+            cmd: str = f"{input['address']} ({input['value']})"
+            if len(self.keys_history) == 0 or cmd != self.keys_history[-1]:
+                self.keys_history.append(cmd)
+                self._keys_history_changed = True
+            if len(self.keys_history) > 30:
+                del self.keys_history[0]
+        self._key_cursor = max(self._key_cursor, hi)
+
+        # Only rebuild the history string when a new key has been appended
+        if self._keys_history_changed:
+            self._keys_history_changed = False
+            history_str: str = "<strong>Keyboard history:\n</strong>" + "<br>".join(self.keys_history)
+            self.key_widget.set_text(history_str)
 
     def process_states(self) -> None:
         # States are displayed as a function of replay time (logtime-based).
@@ -368,8 +404,9 @@ class ReplayScheduler(Scheduler):
         #   - 2. The frequency of each communications radio
         #   - 3. The value of each slider, in genericscales
 
-        lo: int = bisect_right(self._state_logtimes, self.replay_time - CLOCK_STEP)
         hi: int = bisect_right(self._state_logtimes, self.replay_time)
+        lo: int = self._state_cursor
+        self._state_cursor = max(lo, hi)
 
         for idx in range(lo, hi):
             state: dict[str, Any] = self.logreader.states[idx]
@@ -398,14 +435,18 @@ class ReplayScheduler(Scheduler):
     def display_joystick_inputs(self) -> None:
         x: float | None = None
         y: float | None = None
-        lo: int = bisect_right(self._joy_logtimes, self.replay_time - CLOCK_STEP)
         hi: int = bisect_right(self._joy_logtimes, self.replay_time)
+        lo: int = self._joy_cursor
+        self._joy_cursor = max(lo, hi)
 
         for idx in range(lo, hi):
             joy_input: dict[str, Any] = self.logreader.joystick_inputs[idx]
 
+            # Both axes case (axes channel)
+            if isinstance(joy_input["value"], tuple):
+                x, y = joy_input["value"]
             # X case
-            if "_x" in joy_input["address"]:
+            elif "_x" in joy_input["address"]:
                 x = float(joy_input["value"])
             elif "_y" in joy_input["address"]:
                 y = float(joy_input["value"])
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
 from typing import Any
 
@@ -26,6 +27,7 @@ class Scenario:
     def __init__(self, contents: list[str] | None = None, scenario_path: Path | None = None) -> None:
         self.events: list[Event] = list()
         self.plugins: dict[str, Any] = dict()
+        self.path: Path | None = None
 
         if contents is None:
             if scenario_path is not None:
@@ -37,9 +39,13 @@ class Scenario:
                 with open(sp, "r") as f:
                     contents = f.readlines()
                 get_logger().log_manual_entry(sp, key="scenario_path")
+                self.path = sp
             else:
                 get_errors().add_error(_("%s was not found") % str(sp), fatal=True)
 
+        # Identifies the scenario contents in the session metadata (see Logger.update_metadata)
+        self.sha256: str = hashlib.sha256("".join(contents or []).encode("utf-8")).hexdigest()
+
         # Convert the scenario content into a list of events #
         # (Squeeze empty and commented [#] lines)
         self.events = [
@@ -63,7 +69,12 @@ class Scenario:
         }
 
         self.events = self.events_retrocompatibility()  # Apply retrocompatiblity to events
-        event_errors: list[str] = self.check_events()  # Check that events are properly expressed
+
+        # Let the plugins create the parameters declared by their events (e.g. resman tanks and pumps)
+        event_errors: list[str] = list()
+        for name, plugin in self.plugins.items():
+            event_errors.extend(plugin.declare_parameters(self.get_plugin_events(name)))
+        event_errors.extend(self.check_events())  # Check that events are properly expressed
 
         with open(P["SCENARIO_ERRORS"], "w") as errorf:
             if len(event_errors) > 0:
@@ -173,75 +184,86 @@ class Scenario:
         ## TODO
 
         for e in self.events:
-            # System pseudo-plugin: validate command and skip plugin checks
-            if e.plugin == SYSTEM_PSEUDO_PLUGIN:
-                if len(e.command) != 1 or e.command[0] not in SYSTEM_COMMANDS:
-                    errors.append(_("Error on line %s. Invalid system command: %s") % (e.line, e.get_command_str()))
-                continue
+            errors.extend(self.check_event(e))
+        return errors
+
+    def check_event(self, e: Event) -> list[str]:
+        """Check a single event (rules 2 and 3). If valid, its value is replaced by its evaluated version"""
+        errors: list[str] = list()
+        # System pseudo-plugin: validate command and skip plugin checks
+        if e.plugin == SYSTEM_PSEUDO_PLUGIN:
+            if len(e.command) != 1 or e.command[0] not in SYSTEM_COMMANDS:
+                errors.append(_("Error on line %s. Invalid system command: %s") % (e.line, e.get_command_str()))
+            return errors
+
+        # The plugin must be loaded (an event can be checked after the scenario loading)
+        if e.plugin not in self.plugins:
+            errors.append(_("Error on line %s. The %s plugin is not used by the scenario") % (e.line, e.plugin))
+            return errors
+
+        # Rule 2 - all events should trigger a command to a plugin
+        if len(e) == 0:
+            errors.append(_("Error on line %s. This event does not trigger any command.") % e.line)
+
+        # Rule 2 bis - maximum length of a command is 2 (parameter;value)
+        elif len(e) > 2:
+            errors.append(_("Error on line %s. Maximum length of an event is 2 (parameter;value).") % e.line)
+
+        # Rule 3 - when present, a command should match either a plugin method or
+        # a parameter, the value of the latter being acceptable
+        elif len(e) == 1:  # Method expected
+            if e.command[0] not in self.get_plugin_methods(e.plugin):
+                errors.append(
+                    _("Error on line %s. Method (%s) is not available for the plugin (%s)")
+                    % (e.line, e.command[0], e.plugin)
+                )
 
-            # Rule 2 - all events should trigger a command to a plugin
-            if len(e) == 0:
-                errors.append(_("Error on line %s. This event does not trigger any command.") % e.line)
+        elif len(e) == 2:  # Parameter expected
+            _current_value, exists = self.get_parameters_value(e.plugin, e.command)
 
-            # Rule 2 bis - maximum length of a command is 2 (parameter;value)
-            elif len(e) > 2:
-                errors.append(_("Error on line %s. Maximum length of an event is 2 (parameter;value).") % e.line)
+            # If the current parameter exists in the plugin
+            if exists:
+                method_args: list[Any] | None = None
 
-            # Rule 3 - when present, a command should match either a plugin method or
-            # a parameter, the value of the latter being acceptable
-            elif len(e) == 1:  # Method expected
-                if e.command[0] not in self.get_plugin_methods(e.plugin):
+                # Check that the parameter has a verification method
+                # either globally or in the plugins itself
+                # Else trigger a warning (should not happen)
+                validation_dict: dict[str, Any] = self.get_validation_dict(e.plugin)
+
+                if e.command[0] in validation_dict:
+                    eval_method: Any = validation_dict[e.command[0]]
+                else:
+                    eval_method = None
                     errors.append(
-                        _("Error on line %s. Method (%s) is not available for the plugin (%s)")
-                        % (e.line, e.command[0], e.plugin)
+                        _("Warning on line %s. Parameter (%s) has no verification method") % (e.line, e.command[0])
                     )
 
-            elif len(e) == 2:  # Parameter expected
-                _current_value, exists = self.get_parameters_value(e.plugin, e.command)
+                if eval_method is not None:
+                    if isinstance(eval_method, tuple):
+                        # Method-args will receive extra arguments
+                        eval_method, *method_args = eval_method
 
-                # If the current parameter exists in the plugin
-                if exists:
-                    method_args: list[Any] | None = None
+                    # Remove potential blank spaces in the command argument
+                    # (except is the eval_method is waiting for a string, like title)
+                    if eval_method.__name__ != "is_string":
+                        e.command[1] = e.command[1].replace(" ", "")
 
-                    # Check that the parameter has a verification method
-                    # either globally or in the plugins itself
-                    # Else trigger a warning (should not happen)
-                    validation_dict: dict[str, Any] = self.get_validation_dict(e.plugin)
+                    # ...extra arguments are unpacked here if present
+                    method_args = (e.command[1], *method_args) if method_args is not None else (e.command[1],)
+                    eval_value, error = eval_method(*method_args)
 
-                    if e.command[0] in validation_dict:
-                        eval_method: Any = validation_dict[e.command[0]]
+                    if error is not None:
+                        preamble: str = _("Error on line %s. %s ") % (e.line, e.command[0])
+                        error_msg: str = preamble + error
+                        errors.append(error_msg)
                     else:
-                        eval_method = None
-                        errors.append(
-                            _("Warning on line %s. Parameter (%s) has no verification method") % (e.line, e.command[0])
-                        )
-
-                    if eval_method is not None:
-                        if isinstance(eval_method, tuple):
-                            # Method-args will receive extra arguments
-                            eval_method, *method_args = eval_method
-
-                        # Remove potential blank spaces in the command argument
-                        # (except is the eval_method is waiting for a string, like title)
-                        if eval_method.__name__ != "is_string":
-                            e.command[1] = e.command[1].replace(" ", "")
-
-                        # ...extra arguments are unpacked here if present
-                        method_args = (e.command[1], *method_args) if method_args is not None else (e.command[1],)
-                        eval_value, error = eval_method(*method_args)
-
-                        if error is not None:
-                            preamble: str = _("Error on line %s. %s ") % (e.line, e.command[0])
-                            error_msg: str = preamble + error
-                            errors.append(error_msg)
-                        else:
-                            # If no error, replace the event value by its evaluated version
-                            e.command[1] = eval_value
-                else:
-                    errors.append(
-                        _("Error on line %s. The %s plugin does not have a %s parameter")
-                        % (e.line, e.plugin, e.command[-2])
-                    )
+                        # If no error, replace the event value by its evaluated version
+                        e.command[1] = eval_value
+            else:
+                errors.append(
+                    _("Error on line %s. The %s plugin does not have a %s parameter")
+                    % (e.line, e.plugin, e.command[-2])
+                )
         return errors
 
     def get_validation_dict(self, pluginname: str) -> dict[str, Any]:
@@ -6,17 +6,24 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from time import perf_counter
 from typing import Any
 
 from pyglet.app import EventLoop
 
 from core.clock import Clock
 from core.constants import REPLAY_MODE, SYSTEM_PSEUDO_PLUGIN
+from core.controlserver import ControlServer
 from core.error import get_errors
 from core.event import Event
 from core.joystick import joystick
 from core.logger import get_logger
+from core.pseudorandom import flush_draws
+from core.pseudorandom import get_mode as get_random_mode
+from core.relayout import Relayout
 from core.scenario import Scenario
+from core.telemetry import SchedulerTelemetry
+from core.utils import get_conf_value
 from core.window import Window
 
 
@@ -25,9 +32,17 @@ class Scheduler:
     This class manages events execution.
     """
 
+    # Shared memory telemetry bus (see core.telemetry), when enabled in config.ini
+    telemetry: SchedulerTelemetry | None = None
+
+    # Local events injection server (see core.controlserver), when a control_port is set in config.ini
+    control_server: ControlServer | None = None
+
     def __init__(self, scenario_path: Path | None = None) -> None:
         with open("VERSION", "r") as f:
-            get_logger().log_manual_entry(f.read().strip(), key="version")
+            self.version: str = f.read().strip()
+            get_logger().log_manual_entry(self.version, key="version")
+        get_logger().log_manual_entry(get_random_mode(), key="random_mode")
 
         self.clock: Clock = Clock("main")
         self.scenario_time: float = 0
@@ -39,7 +54,9 @@ class Scheduler:
 
         self.joystick: Any = joystick
         self.set_scenario()
+        self.open_control_server()
 
+        Window.MainWindow.add_relayout_listener(self.relayout)
         Window.MainWindow.display_session_id()
         self.event_loop.run()
 
@@ -59,6 +76,14 @@ class Scheduler:
 
             self.plugins[p].on_scenario_loaded(self.scenario)
 
+        scenario_path: str | None = None if self.scenario.path is None else self.scenario.path.as_posix()
+        get_logger().update_metadata(
+            version=self.version,
+            scenario_path=scenario_path,
+            scenario_sha256=self.scenario.sha256,
+            plugins=list(self.plugins),
+        )
+
         self.pause_scenario_time: bool = False
         self.scenario_time = 0
 
@@ -72,11 +97,51 @@ class Scheduler:
         # Track whether plugins have been paused due to a modal dialog (e.g. pause prompt)
         self._dialog_paused: bool = False
 
-    def update(self, dt: float) -> None:
+        self.open_telemetry()
+
+    def open_telemetry(self) -> None:
+        # The bus channels depend on the scenario plugins
+        self.close_telemetry()
+        try:
+            enabled: bool = get_conf_value("Openmatb", "telemetry") and not REPLAY_MODE
+        except (KeyError, TypeError):
+            enabled = False
+        if enabled:
+            try:
+                self.telemetry = SchedulerTelemetry(self.plugins)
+            except FileExistsError as error:
+                get_errors().add_error(_("The telemetry bus could not be created (%s)") % error)
+
+    def open_control_server(self) -> None:
+        try:
+            port: int = get_conf_value("Openmatb", "control_port")
+        except (KeyError, TypeError):
+            port = 0
+        if port <= 0 or REPLAY_MODE:
+            return
+
+        self.control_server = ControlServer(port)
+        try:
+            self.control_server.start()
+        except OSError as error:
+            get_errors().add_error(_("The control server could not be started (%s)") % error)
+            self.control_server = None
+
+    def close_telemetry(self) -> None:
+        if self.telemetry is not None:
+            self.telemetry.close()
+            self.telemetry = None
+
+    def update(self, dt: float, refresh: bool = True) -> None:
+        # The rows logged since the previous update (including the flip onsets) are written at once
+        get_logger().write_row_queue()
+
         if Window.MainWindow.modal_dialog is not None:
             if not self._dialog_paused:
                 self.execute_plugins_methods(self.get_active_plugins(), ["pause"])
                 self._dialog_paused = True
+            if self.control_server is not None:
+                self.reject_control_requests()
             return
 
         if self._dialog_paused:
@@ -88,7 +153,11 @@ class Scheduler:
 
         self.update_timers(dt)
         self.update_joystick()
-        self.update_active_plugins()
+        if self.control_server is not None:
+            self.execute_control_requests()
+        self.update_active_plugins(refresh)
+        if self.telemetry is not None:
+            self.telemetry.publish(self.scenario_time)
         self.execute_events()
         self.check_if_must_exit()
 
@@ -98,9 +167,9 @@ class Scheduler:
             self.scenario_time += dt
             get_logger().set_scenario_time(self.scenario_time)
 
-    def update_active_plugins(self) -> None:
+    def update_active_plugins(self, refresh: bool = True) -> None:
         for p in self.get_active_plugins():
-            p.update(self.scenario_time)
+            p.update(self.scenario_time, refresh)
 
     def update_joystick(self) -> None:
         # Execute the update method of the joystick
@@ -141,6 +210,38 @@ class Scheduler:
                     self.execute_one_event(stop_event)
             self.exit()
 
+    def parse_control_line(self, line: str) -> Event:
+        # A scenario line, whose time is optional (now by default)
+        fields: list[str] = line.split(Event.sep)
+        if ":" in fields[0]:
+            return Event.parse_from_string(0, line)
+        return Event(0, int(self.scenario_time), fields[0], fields[1:])
+
+    def reject_control_requests(self) -> None:
+        # While a modal dialog pauses the session, injected events are refused rather than left waiting
+        for request in self.control_server.pop_requests():
+            request.reply("BUSY")
+
+    def execute_control_requests(self) -> None:
+        # Events injected through the control server are checked like the scenario ones. Those
+        # scheduled in the future join the scenario events, the others are executed right away.
+        for request in self.control_server.pop_requests():
+            try:
+                event: Event = self.parse_control_line(request.line)
+            except ValueError:
+                request.reply("ERROR " + _("Invalid event: %s") % request.line)
+                continue
+
+            errors: list[str] = self.scenario.check_event(event)
+            if len(errors) > 0:
+                request.reply("ERROR " + " ".join(errors))
+            elif event.time_sec > self.scenario_time:
+                self.events.append(event)
+                request.reply("QUEUED")
+            else:
+                self.execute_one_event(event)
+                request.reply("OK")
+
     def execute_events(self) -> None:
         # Detect a potential blocking plugin
         active_blocking_plugin: Any | None = self.get_active_blocking_plugin()
@@ -265,8 +366,21 @@ class Scheduler:
 
         return None
 
+    def relayout(self, relayout: Relayout) -> None:
+        # Rescale the geometry of all plugins widgets in a single pass, after a window resize
+        start: float = perf_counter()
+        for plugin in self.plugins.values():
+            plugin.relayout(relayout)
+        get_logger().log_manual_entry(f"{round((perf_counter() - start) * 1000, 3)} ms", key="relayout")
+
     def exit(self) -> None:
+        Window.MainWindow.log_render_stats()
+        flush_draws()
         get_logger().log_manual_entry("end")
+        get_logger().close()
+        self.close_telemetry()
+        if self.control_server is not None:
+            self.control_server.stop()
         self.event_loop.exit()
         Window.MainWindow.close()  # needed for windows clean exit
         sys.exit(0)
@@ -0,0 +1,102 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Pseudorandom draws table of a session file.
+
+A session logged with compact_seeds=True only holds the seed streams descriptions and the
+draws counters (see core.pseudorandom.DrawRecorder). The seed and output of each draw are
+regenerated here from them. Sessions logged with seed_value/seed_output rows are read as is,
+so that both formats give the same table, for audits or comparisons with a replay
+(the scenario_time of a regenerated draw is its scenario second).
+
+The output of a choice or sample over items that could not be logged as literals is the
+index of the drawn item, prefixed with "#".
+"""
+
+from __future__ import annotations
+
+import ast
+import csv
+import random
+from pathlib import Path
+from typing import Any
+
+from rstr import Rstr
+
+from core.pseudorandom import CounterRandom, counter_key, legacy_seed
+from core.sessionfile import read_session_rows
+
+SEED_TABLE_FIELDS: list[str] = ["scenario_time", "module", "seed", "output"]
+
+
+def draw_output(spec: tuple[Any, ...], rng: random.Random) -> Any:
+    """Redo a draw from its specification, with a generator seeded as it was"""
+    function: str = spec[0]
+    if function in ("choice", "sample"):
+        items: Any = spec[1]
+        population: Any = items if isinstance(items, list) else range(items)
+        output: Any = rng.choice(population) if function == "choice" else rng.sample(population, 1)[0]
+        return output if isinstance(items, list) else f"#{output}"
+    elif function == "randint":
+        return rng.randint(spec[1], spec[2])
+    elif function == "uniform":
+        return rng.uniform(spec[1], spec[2])
+    elif function == "xeger":
+        return Rstr(rng).xeger(spec[1])
+    raise ValueError(f"Unknown pseudorandom function: {function}")
+
+
+def reconstruct_seed_table(session_path: Path) -> list[dict[str, Any]]:
+    """Return the {scenario_time, module, seed, output} rows of the session draws, in draw order"""
+    table: list[dict[str, Any]] = list()
+    streams: dict[str, tuple[str, int, int]] = dict()  # module: (mode, session, plugin number)
+    specs: dict[tuple[str, int], tuple[Any, ...]] = dict()
+    pending_seeds: dict[str, tuple[str, str]] = dict()  # module: (scenario_time, seed) of a seed_value row
+
+    for row in read_session_rows(session_path):
+        row_type: str = row["type"]
+        module: str = row["module"]
+        if row_type == "seed_value":
+            pending_seeds[module] = (row["scenario_time"], row["value"])
+        elif row_type == "seed_output" and module in pending_seeds:
+            scenario_time, seed = pending_seeds.pop(module)
+            table.append(
+                {"scenario_time": float(scenario_time), "module": module, "seed": int(seed), "output": row["value"]}
+            )
+        elif row_type == "seed_stream":
+            numbers: dict[str, int] = dict()
+            for entry in row["value"].split(";"):
+                name, value = entry.split("=")
+                numbers[name] = int(value)
+            streams[module] = (row["address"], numbers["session"], numbers["plugin"])
+        elif row_type == "seed_spec":
+            specs[(module, int(row["address"]))] = tuple(ast.literal_eval(row["value"]))
+        elif row_type == "seed_draws":
+            mode, session_id, plugin_int = streams[module]
+            time_sec: int = int(row["address"])
+            for token in row["value"].split():
+                spec_n, add = (int(t) for t in token.split(":"))
+                if mode == "legacy":
+                    seed: int = legacy_seed(session_id, plugin_int, time_sec, add)
+                    rng: random.Random = random.Random(seed)
+                else:
+                    seed = counter_key(session_id, plugin_int, time_sec, add)
+                    rng = CounterRandom(seed)
+                output: Any = draw_output(specs[(module, spec_n)], rng)
+                table.append({"scenario_time": float(time_sec), "module": module, "seed": seed, "output": output})
+    return table
+
+
+def write_seed_table(session_path: Path, output_path: Path | None = None) -> Path:
+    """Write the draws table next to the session file (<session>_seeds.csv), and return its path"""
+    session_path = Path(session_path)
+    if output_path is None:
+        output_path = session_path.with_name(f"{session_path.stem}_seeds.csv")
+    table: list[dict[str, Any]] = reconstruct_seed_table(session_path)
+    with open(str(output_path), "w", newline="") as output_file:
+        writer: csv.DictWriter = csv.DictWriter(output_file, fieldnames=SEED_TABLE_FIELDS)
+        writer.writeheader()
+        writer.writerows(table)
+    return output_path
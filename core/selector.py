@@ -15,11 +15,13 @@ from pyglet.text import Label
 from pyglet.window import key as winkey
 from pyglet.window import mouse
 
+from core.catalog import get_catalog
 from core.constants import COLORS as C
 from core.constants import FONT_SIZES as F
 from core.constants import PATHS as P
 from core.constants import Group as G
 from core.rendering import get_group, get_program, polygon_indices
+from core.sessionfile import read_metadata
 
 
 class FileSelector:
@@ -40,13 +42,15 @@ class FileSelector:
 
         # Scan files
         self._files: list[Path] = self._scan_files()
-        self._display_texts: list[str] = [self._format_entry(f) for f in self._files]
+        # Replay: the sessions metadata sidecars, None for older sessions (see core.sessionfile)
+        self._metadata: list[dict[str, Any] | None] = [
+            read_metadata(f) if self.mode == "replay" else None for f in self._files
+        ]
+        self._display_texts: list[str] = [self._format_entry(f, m) for f, m in zip(self._files, self._metadata)]
 
         # Identify empty/near-empty files (crash, immediate close, etc.)
-        EMPTY_THRESHOLD = 500  # bytes
         self._empty_indices: set[int] = {
-            i for i, f in enumerate(self._files)
-            if f.stat().st_size < EMPTY_THRESHOLD
+            i for i, (f, m) in enumerate(zip(self._files, self._metadata)) if self._is_empty(f, m)
         }
         for i in self._empty_indices:
             self._display_texts[i] += "  (vide)"
@@ -82,20 +86,15 @@ class FileSelector:
     def _scan_files(self) -> list[Path]:
         if self.mode == "scenario":
             return sorted(P["SCENARIOS"].glob("**/*.txt"))
-        files: list[Path] = list(P["SESSIONS"].glob("**/*.csv"))
-        return sorted(files, key=self._session_sort_key)
-
-    @staticmethod
-    def _session_sort_key(path: Path) -> int:
-        try:
-            return int(path.stem.split("_")[0])
-        except (ValueError, IndexError):
-            return 0
+        return get_catalog().get_sessions()
 
-    def _format_entry(self, filepath: Path) -> str:
+    def _format_entry(self, filepath: Path, metadata: dict[str, Any] | None = None) -> str:
         if self.mode == "scenario":
             return str(filepath.relative_to(P["SCENARIOS"]).with_suffix(""))
-        # Replay: parse {ID}_{YYMMDD}_{HHMMSS}.csv
+        if metadata is not None:
+            return self._format_metadata(filepath, metadata)
+
+        # Older sessions: parse {ID}_{YYMMDD}_{HHMMSS}.csv
         parts: list[str] = filepath.stem.split("_")
         if len(parts) >= 3:
             try:
@@ -105,6 +104,26 @@ class FileSelector:
                 pass
         return filepath.stem
 
+    @staticmethod
+    def _format_metadata(filepath: Path, metadata: dict[str, Any]) -> str:
+        start: str = str(metadata.get("start", "")).replace("T", " ")
+        text: str = f"#{metadata.get('session_id', filepath.stem.split('_')[0])} \u2014 {start}"
+        if metadata.get("status") == "complete":
+            minutes, seconds = divmod(int(metadata.get("scenario_duration", 0)), 60)
+            text += f" \u2014 {minutes}:{seconds:02d}"
+        else:
+            text += " \u2014 " + _("interrupted")
+        if metadata.get("scenario_path") is not None:
+            text += f" \u2014 {Path(metadata['scenario_path']).stem}"
+        return text
+
+    @staticmethod
+    def _is_empty(filepath: Path, metadata: dict[str, Any] | None) -> bool:
+        if metadata is not None:  # A session closed before its scenario started
+            return metadata.get("status") == "complete" and metadata.get("scenario_duration", 0) == 0
+        EMPTY_THRESHOLD = 500  # bytes
+        return filepath.stat().st_size < EMPTY_THRESHOLD
+
     # ---- UI building ----
 
     def _build_ui(self) -> None:
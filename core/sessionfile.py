@@ -0,0 +1,143 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Segmented and compressed session files.
+
+A session can be split into segments (rotation by size or duration, see Logger.checkpoint).
+The first segment is the session file itself (<session>.csv): it is never compressed, as it is
+the entry point found from the session id. The next ones are <session>.csv.001, .002... Each
+segment starts with the header row, so that it is a valid csv file on its own.
+
+Closed segments can be gzipped by a background thread (<session>.csv.001.gz). A segment is
+compressed into a temporary file, which is synced and renamed once complete, and only then is
+the uncompressed segment removed: an interrupted compression leaves a readable session.
+
+The sessions must be read through read_session_rows, which chains the segments (compressed or
+not) and drops a last row truncated by a crash.
+
+Each session also has a small metadata sidecar (<session>.meta.json, see Logger.write_metadata),
+written at start, completed once the scenario is loaded and finalized at exit (duration, rows
+counts...), so that sessions can be listed without reading them. A sidecar whose status is
+"interrupted" belongs to a session ended by an error, and one still "running" to a session that
+was killed.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import os
+import shutil
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from queue import Queue
+from typing import IO, Any
+
+SESSION_FIELDS: list[str] = ["logtime", "scenario_time", "type", "module", "address", "value"]
+
+
+def get_segment_path(session_path: Path, number: int) -> Path:
+    """Return the (uncompressed) path of a segment, the segment 0 being the session file"""
+    if number == 0:
+        return session_path
+    return session_path.with_name(f"{session_path.name}.{number:03d}")
+
+
+def get_session_segments(session_path: Path) -> list[Path]:
+    """Return the paths of the segments of a session, in order (compressed ones end with .gz)"""
+    segments: list[Path] = [session_path]
+    number: int = 1
+    while True:
+        path: Path = get_segment_path(session_path, number)
+        compressed: Path = path.with_name(f"{path.name}.gz")
+        if compressed.exists():  # Preferred: the uncompressed one may remain after an interrupted removal
+            segments.append(compressed)
+        elif path.exists():
+            segments.append(path)
+        else:
+            return segments
+        number += 1
+
+
+def open_segment(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(str(path), "rt", newline="")
+    return open(str(path), newline="")
+
+
+def read_session_rows(session_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the rows of a session, whether segmented, compressed or not"""
+    for segment in get_session_segments(Path(session_path)):
+        with open_segment(segment) as segment_file:
+            for row in csv.DictReader(segment_file):
+                if row.get("value") is None:  # Last row truncated by a crash
+                    continue
+                yield row
+
+
+def get_metadata_path(session_path: Path) -> Path:
+    return session_path.with_name(f"{session_path.stem}.meta.json")
+
+
+def write_metadata(session_path: Path, metadata: dict[str, Any]) -> None:
+    # Written atomically, as the sidecar is read by the file selector (possibly of another instance)
+    path: Path = get_metadata_path(session_path)
+    temporary: Path = path.with_name(f"{path.name}.tmp")
+    with open(str(temporary), "w") as metadata_file:
+        json.dump(metadata, metadata_file, indent=1)
+    os.replace(str(temporary), str(path))
+
+
+def read_metadata(session_path: Path) -> dict[str, Any] | None:
+    """Return the metadata of a session, or None for the sessions logged without sidecar"""
+    try:
+        with open(str(get_metadata_path(session_path))) as metadata_file:
+            return json.load(metadata_file)
+    except (OSError, ValueError):
+        return None
+
+
+def compress_segment(path: Path) -> Path:
+    """Gzip a closed segment, remove it, and return the compressed segment path"""
+    compressed: Path = path.with_name(f"{path.name}.gz")
+    temporary: Path = path.with_name(f"{path.name}.gz.tmp")
+    with open(str(path), "rb") as source, open(str(temporary), "wb") as raw:
+        with gzip.GzipFile(filename=path.name, mode="wb", fileobj=raw) as destination:
+            shutil.copyfileobj(source, destination)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(str(temporary), str(compressed))
+    path.unlink()
+    return compressed
+
+
+class SegmentCompressor:
+    """Compress the segments, in order, in a background thread"""
+
+    def __init__(self) -> None:
+        self.segments: Queue[Path | None] = Queue()
+        self.thread: threading.Thread = threading.Thread(target=self.run, name="segment-compressor", daemon=True)
+        self.thread.start()
+
+    def compress(self, path: Path) -> None:
+        self.segments.put(path)
+
+    def run(self) -> None:
+        while True:
+            path: Path | None = self.segments.get()
+            if path is None:
+                return
+            try:
+                compress_segment(path)
+            except OSError as error:  # The segment is left uncompressed (it is read all the same)
+                print(_("Warning, the session segment %s could not be compressed (%s)") % (path.name, error))
+                path.with_name(f"{path.name}.gz.tmp").unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Wait for the pending compressions"""
+        self.segments.put(None)
+        self.thread.join()
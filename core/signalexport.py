@@ -0,0 +1,149 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Fixed rate signals export.
+
+Samples are written in place into a preallocated ring buffer (no container is created
+per sample). Once a chunk is full, it is handed to the sink as memoryviews over the
+buffer: a sink must consume (or copy) them before returning, as the slots are reused.
+
+A sink exposes open(channels, rate), write(logtimes, scenario_times, data) and close().
+data is flat: one row of len(channels) values per sample.
+"""
+
+from __future__ import annotations
+
+import csv
+from array import array
+from pathlib import Path
+from typing import IO, Any
+
+from core.lslstream import SOURCE_ID, measure_clock_offset, push_samples
+from core.telemetry import TelemetryBus
+
+# Number of chunks held by the ring buffer
+RING_CHUNKS: int = 4
+
+
+class SignalRingBuffer:
+    def __init__(self, channel_count: int, chunk_size: int, chunks: int = RING_CHUNKS) -> None:
+        # The capacity is a multiple of the chunk size, and chunks start on a chunk boundary,
+        # so a chunk is always contiguous
+        self.channel_count: int = channel_count
+        self.chunk_size: int = chunk_size
+        self.capacity: int = chunk_size * chunks
+        self.logtimes: array = array("d", bytes(8 * self.capacity))
+        self.scenario_times: array = array("d", bytes(8 * self.capacity))
+        self.data: array = array("d", bytes(8 * self.capacity * channel_count))
+        self.chunk_start: int = 0  # First slot of the chunk being filled
+        self.pending: int = 0  # Number of samples of this chunk
+
+    def start_sample(self, logtime: float, scenario_time: float) -> int:
+        """Reserve the next sample slot, and return the offset of its values in data"""
+        index: int = self.chunk_start + self.pending
+        self.logtimes[index] = logtime
+        self.scenario_times[index] = scenario_time
+        self.pending += 1
+        return index * self.channel_count
+
+    def is_chunk_full(self) -> bool:
+        return self.pending >= self.chunk_size
+
+    def pop_chunk(self) -> tuple[memoryview, memoryview, memoryview]:
+        """Return the samples of the current chunk (possibly incomplete) and start the next chunk"""
+        start: int = self.chunk_start
+        end: int = start + self.pending
+        self.chunk_start = (start + self.chunk_size) % self.capacity
+        self.pending = 0
+        return (
+            memoryview(self.logtimes)[start:end],
+            memoryview(self.scenario_times)[start:end],
+            memoryview(self.data)[start * self.channel_count : end * self.channel_count],
+        )
+
+
+class FileSink:
+    """Write the samples in a CSV file (one column per channel)"""
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self.file: IO[str] | None = None
+        self.writer: Any = None
+        self.channel_count: int = 0
+
+    def open(self, channels: list[str], rate: float) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(str(self.path), "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["logtime", "scenario_time"] + channels)
+        self.channel_count = len(channels)
+
+    def write(self, logtimes: memoryview, scenario_times: memoryview, data: memoryview) -> None:
+        n: int = self.channel_count
+        self.writer.writerows(
+            [logtimes[i], scenario_times[i], *data[i * n : (i + 1) * n]] for i in range(len(logtimes))
+        )
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class LslSink:
+    """Push the samples to a regularly sampled, multi-channel, LSL outlet"""
+
+    def __init__(self, lsl: Any, name: str = "OpenMATB-signals") -> None:
+        self.lsl: Any = lsl
+        self.name: str = name
+        self.outlet: Any = None
+        self.clock_offset: float = 0.0
+        self.channel_count: int = 0
+
+    def open(self, channels: list[str], rate: float) -> None:
+        info: Any = self.lsl.StreamInfo(
+            self.name,
+            type="Signals",
+            channel_count=len(channels),
+            nominal_srate=rate,
+            channel_format="float32",
+            source_id=f"{SOURCE_ID}-signals",
+        )
+        self.outlet = self.lsl.StreamOutlet(info)
+        self.clock_offset = measure_clock_offset(self.lsl.local_clock)
+        self.channel_count = len(channels)
+
+    def write(self, logtimes: memoryview, scenario_times: memoryview, data: memoryview) -> None:
+        # push_chunk takes a single timestamp, so each sample is pushed with its own
+        n: int = self.channel_count
+        samples: list[list[float]] = [data[i * n : (i + 1) * n].tolist() for i in range(len(logtimes))]
+        push_samples(self.outlet, samples, [t + self.clock_offset for t in logtimes])
+
+    def close(self) -> None:
+        self.outlet = None
+
+
+class SharedMemorySink:
+    """Write the samples in a shared memory bus (see core.telemetry for its layout)"""
+
+    def __init__(self, name: str = "openmatb_signals") -> None:
+        self.name: str = name
+        self.bus: TelemetryBus | None = None
+        self.channel_count: int = 0
+
+    def open(self, channels: list[str], rate: float) -> None:
+        # Keep about 10 seconds of signals
+        self.bus = TelemetryBus(channels, name=self.name, slot_count=max(int(rate * 10), 1))
+        self.channel_count = len(channels)
+
+    def write(self, logtimes: memoryview, scenario_times: memoryview, data: memoryview) -> None:
+        n: int = self.channel_count
+        for i in range(len(logtimes)):
+            self.bus.write(scenario_times[i], data[i * n : (i + 1) * n], logtimes[i])
+
+    def close(self) -> None:
+        if self.bus is not None:
+            self.bus.close()
+            self.bus = None
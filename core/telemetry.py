@@ -0,0 +1,225 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Shared memory live telemetry bus.
+
+The bus is a multiprocessing.shared_memory block, written once per frame by OpenMATB and
+readable at any rate by other processes (e.g. an experimenter dashboard) with TelemetryReader,
+or any language able to map a shared memory block.
+
+Binary layout (little-endian, offsets in bytes):
+
+  Header (HEADER_SIZE = 64)
+    0   4s   magic, b"OMTB"
+    4   u32  layout version (LAYOUT_VERSION)
+    8   u32  channel count (C)
+    12  u32  slot count (N)
+    16  u32  slot size (S = 24 + 8 * C)
+    20  u32  process id of the writer
+    24  u64  written slots count (W), updated after each complete slot write
+    32  ...  (reserved, zeros)
+
+  Channels table (C * NAME_SIZE), at HEADER_SIZE
+    one utf-8 channel name per entry, padded with NUL bytes
+
+  Slots ring (N * S), at HEADER_SIZE + C * NAME_SIZE
+    slot i holds the write number w (w % N == i):
+    0   u64  sequence: 2w + 1 while the slot is being written, 2w + 2 once written
+    8   f64  scenario_time (s)
+    16  f64  logtime (perf_counter() clock of the writer, s)
+    24  C * f64  channel values (NaN when unavailable)
+
+The last complete slot is (W - 1) % N. A reader copies a slot, then checks that its sequence
+is even and unchanged (otherwise it was overwritten meanwhile, and must be read again).
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from time import perf_counter
+from typing import Any, Callable
+
+TELEMETRY_NAME: str = "openmatb_telemetry"
+MAGIC: bytes = b"OMTB"
+LAYOUT_VERSION: int = 1
+HEADER_SIZE: int = 64
+NAME_SIZE: int = 32
+DEFAULT_SLOT_COUNT: int = 1024
+
+HEADER: struct.Struct = struct.Struct("<4sIIIII")
+WRITTEN: struct.Struct = struct.Struct("<Q")
+WRITTEN_OFFSET: int = 24
+
+# Names of the blocks created by this process (their reader must not unregister them)
+_created_names: set[str] = set()
+
+
+def slot_struct(channel_count: int) -> struct.Struct:
+    return struct.Struct(f"<Qdd{channel_count}d")
+
+
+def is_process_alive(pid: int) -> bool:
+    # On Windows, a shared memory block disappears with its last handle, so an existing block
+    # is always in use (and os.kill would terminate the process)
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # Alive, but owned by another user
+        return True
+    return True
+
+
+def unlink_stale_block(name: str) -> None:
+    """Unlink a bus block left by a crashed session. A block of a running writer (or that is not
+    a bus) is left untouched, and FileExistsError is raised."""
+    stale: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name)
+    try:
+        magic, _version, _channel_count, _slot_count, _slot_size, owner = HEADER.unpack_from(stale.buf, 0)
+    except struct.error:  # Smaller than a header
+        magic, owner = b"", 0
+    if name in _created_names or magic != MAGIC or owner == 0 or is_process_alive(owner):
+        stale.close()
+        raise FileExistsError(f"{name} is already in use")
+    stale.close()
+    stale.unlink()
+
+
+class TelemetryBus:
+    """Writer side of the bus (a single writer, the OpenMATB main thread)"""
+
+    def __init__(self, channels: list[str], name: str = TELEMETRY_NAME, slot_count: int = DEFAULT_SLOT_COUNT) -> None:
+        self.channels: list[str] = channels
+        self.slot_count: int = slot_count
+        self.slot: struct.Struct = slot_struct(len(channels))
+        self.slots_offset: int = HEADER_SIZE + NAME_SIZE * len(channels)
+        size: int = self.slots_offset + slot_count * self.slot.size
+
+        try:
+            self.shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:  # Left by a crashed session?
+            unlink_stale_block(name)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created_names.add(name)
+
+        buf: memoryview = self.shm.buf
+        buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        HEADER.pack_into(buf, 0, MAGIC, LAYOUT_VERSION, len(channels), slot_count, self.slot.size, os.getpid())
+        for i, channel in enumerate(channels):
+            buf[HEADER_SIZE + i * NAME_SIZE : HEADER_SIZE + (i + 1) * NAME_SIZE] = channel.encode("utf-8")[
+                :NAME_SIZE
+            ].ljust(NAME_SIZE, b"\0")
+        self.written: int = 0
+
+    def write(self, scenario_time: float, values: Any, logtime: float | None = None) -> None:
+        """Write a slot of len(channels) values"""
+        if logtime is None:
+            logtime = perf_counter()
+        buf: memoryview = self.shm.buf
+        offset: int = self.slots_offset + (self.written % self.slot_count) * self.slot.size
+        WRITTEN.pack_into(buf, offset, 2 * self.written + 1)
+        self.slot.pack_into(buf, offset, 2 * self.written + 1, scenario_time, logtime, *values)
+        WRITTEN.pack_into(buf, offset, 2 * self.written + 2)
+        self.written += 1
+        WRITTEN.pack_into(buf, WRITTEN_OFFSET, self.written)
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+        _created_names.discard(self.shm.name)
+
+
+class TelemetryReader:
+    """Reader side of the bus, to be used by another process"""
+
+    def __init__(self, name: str = TELEMETRY_NAME) -> None:
+        self.shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name)
+        # The segment belongs to the writer: do not let this process unlink it at exit
+        if name not in _created_names:
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+
+        magic, version, channel_count, self.slot_count, _slot_size, _owner = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.shm.close()
+            raise ValueError(f"{name} is not an OpenMATB telemetry bus (version {LAYOUT_VERSION})")
+
+        self.channels: list[str] = [
+            bytes(self.shm.buf[HEADER_SIZE + i * NAME_SIZE : HEADER_SIZE + (i + 1) * NAME_SIZE])
+            .rstrip(b"\0")
+            .decode("utf-8")
+            for i in range(channel_count)
+        ]
+        self.slot: struct.Struct = slot_struct(channel_count)
+        self.slots_offset: int = HEADER_SIZE + NAME_SIZE * channel_count
+
+    def get_written_count(self) -> int:
+        return WRITTEN.unpack_from(self.shm.buf, WRITTEN_OFFSET)[0]
+
+    def read_slot(self, number: int) -> tuple[float, float, tuple[float, ...]] | None:
+        """Return (scenario_time, logtime, values) of the write number, or None if it was overwritten"""
+        offset: int = self.slots_offset + (number % self.slot_count) * self.slot.size
+        sequence, scenario_time, logtime, *values = self.slot.unpack_from(self.shm.buf, offset)
+        if sequence != 2 * number + 2 or WRITTEN.unpack_from(self.shm.buf, offset)[0] != sequence:
+            return None
+        return scenario_time, logtime, tuple(values)
+
+    def read_latest(self) -> tuple[float, float, dict[str, float]] | None:
+        written: int = self.get_written_count()
+        if written == 0:
+            return None
+        slot: tuple[float, float, tuple[float, ...]] | None = self.read_slot(written - 1)
+        if slot is None:
+            return None
+        return slot[0], slot[1], dict(zip(self.channels, slot[2]))
+
+    def read_since(self, number: int) -> tuple[int, list[tuple[float, float, tuple[float, ...]]]]:
+        """Return the next write number to read, and the slots written from number (the overwritten are lost)"""
+        written: int = self.get_written_count()
+        slots: list[tuple[float, float, tuple[float, ...]]] = list()
+        for n in range(max(number, written - self.slot_count), written):
+            slot: tuple[float, float, tuple[float, ...]] | None = self.read_slot(n)
+            if slot is not None:
+                slots.append(slot)
+        return written, slots
+
+    def close(self) -> None:
+        self.shm.close()
+
+
+class SchedulerTelemetry:
+    """Publish the scheduler state (plugins states and performance levels) on the bus, at each frame"""
+
+    def __init__(self, plugins: dict[str, Any], name: str = TELEMETRY_NAME) -> None:
+        sources: dict[str, Callable[[], float]] = dict()
+        for alias, plugin in plugins.items():
+            sources[f"{alias}_alive"] = lambda plugin=plugin: float(plugin.alive)
+            sources[f"{alias}_paused"] = lambda plugin=plugin: float(plugin.paused)
+
+        # Performance aggregates, as computed by the performance plugin (NaN until available)
+        performance: Any = plugins.get("performance")
+        if performance is not None:
+            sources["performance_level"] = lambda: float(performance.current_level)
+            for alias in ("sysmon", "track", "resman", "communications"):
+                if alias in plugins:
+                    sources[f"{alias}_performance"] = lambda alias=alias: performance.performance_levels.get(
+                        alias, float("nan")
+                    )
+
+        self.sources: tuple[Callable[[], float], ...] = tuple(sources.values())
+        self.values: list[float] = [float("nan")] * len(self.sources)
+        self.bus: TelemetryBus = TelemetryBus(list(sources.keys()), name=name)
+
+    def publish(self, scenario_time: float) -> None:
+        values: list[float] = self.values
+        for i, source in enumerate(self.sources):
+            values[i] = source()
+        self.bus.write(scenario_time, values)
+
+    def close(self) -> None:
+        self.bus.close()
@@ -0,0 +1,105 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""
+Text caching layer for text widgets.
+
+Parsing HTML into a pyglet document is the costly part of an HTMLLabel text change,
+so decoded documents are kept in a bounded LRU cache, and the OpenMATB tags
+preprocessing is memoised.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+from pyglet.text import decode_html
+
+from core.constants import FONT_SIZES as F
+
+HTML_CACHE_SIZE: int = 64
+
+
+class LayoutCache:
+    """A bounded least-recently-used mapping."""
+
+    def __init__(self, maxsize: int = HTML_CACHE_SIZE) -> None:
+        self.maxsize: int = maxsize
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def get(self, key: Any) -> Any | None:
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Any, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+_html_documents: LayoutCache = LayoutCache()
+
+
+def get_html_cache() -> LayoutCache:
+    return _html_documents
+
+
+def _nearest_html_size(pt: int) -> int:
+    # See https://github.com/pyglet/pyglet/blob/master/pyglet/text/formats/html.py
+    # Where pyglet HTML sizes are defined
+    font_sizes: dict[int, int] = {8: 1, 10: 2, 12: 3, 14: 4, 18: 5, 24: 6, 48: 7}
+    diffs: list[int] = [abs(pt - k) for k in font_sizes]
+    nearest_key: int = [k for k, v in zip(list(font_sizes.keys()), diffs) if v == min(diffs)][0]
+    return font_sizes[nearest_key]
+
+
+HTML_SIZES: dict[str, int] = {k: _nearest_html_size(v) for k, v in F.items()}
+
+
+@lru_cache(maxsize=256)
+def preparse_html(text: str, font_name: str | None) -> str:
+    """Replace the OpenMATB title and paragraph tags by pyglet-compatible HTML"""
+    hs: dict[str, int] = HTML_SIZES
+    pars_dict: dict[str, str] = {
+        "<h1>": f"<center><strong><font size={hs['XLARGE']} face={font_name}>",
+        "</h1>": "</font></strong></center><br>",
+        "<h2>": f"<center><font size={hs['XLARGE']} face={font_name}><em>",
+        "</h2>": "</em></font></center><br>",
+        "<p>": f"<p><font size={hs['LARGE']} face={font_name}>",
+        "</p>": "</font></p>",
+    }
+
+    for b in ["<h1>", "<h2>", "<p>"]:
+        for bb in [b, b.replace("<", "</")]:
+            text = text.replace(bb, pars_dict[bb])
+    return text
+
+
+def get_html_document(html: str, location: Any = None) -> Any:
+    """Return a decoded (and cached) pyglet document for an already preparsed html string"""
+    key: tuple[str, Any] = (html, getattr(location, "path", location))
+    document: Any | None = _html_documents.get(key)
+    if document is None:
+        document = decode_html(html, location)
+        _html_documents.put(key, document)
+    return document
@@ -6,8 +6,8 @@ from typing import Any, Optional
 
 from pyglet import font
 
+from core.catalog import get_catalog
 from core.constants import CONFIG
-from core.constants import PATHS as P
 
 
 def clamp(x: float, val_min: float, val_max: float) -> float:
@@ -19,36 +19,16 @@ def clamp(x: float, val_min: float, val_max: float) -> float:
 
 
 def get_session_numbers() -> list[int]:
-    try:
-        session_numbers = [int(s.name.split("_")[0]) for s in P["SESSIONS"].glob("**/*.csv")]
-    except (ValueError, IndexError):
-        session_numbers = [0]
-
-    return session_numbers
+    return get_catalog().get_ids()
 
 
 def find_the_first_available_session_number() -> int:
-    session_numbers: list[int] = get_session_numbers()
-    first_avail: Optional[int] = None
-
-    # Take max session number + 1, and find the minimum available number into [1, max+1]
-    # If no session has been manually removed, it will be max+1
-    if len(session_numbers) == 0:
-        first_avail = 1
-    else:
-        for n in range(1, max(session_numbers) + 1):
-            if n not in session_numbers and first_avail is None:
-                first_avail = n
-
-    if first_avail is None:
-        first_avail = max(session_numbers) + 1
-
-    return first_avail
+    # A removed session number is reused (if no session has been removed, it is the last number + 1)
+    return get_catalog().get_next_id()
 
 
 def find_the_last_session_number() -> int:
-    session_numbers: list[int] = get_session_numbers()
-    return max(session_numbers)
+    return get_catalog().get_last_id()
 
 
 def has_conf_value(section: str, key: str) -> bool:
@@ -59,7 +39,18 @@ def get_conf_value(section: str, key: str, val_type: Optional[type] = None) -> A
     value: str = CONFIG[section][key]
 
     # Boolean boolean values
-    if key in ["fullscreen", "highlight_aoi", "hide_on_pause", "display_session_number"]:
+    if key in [
+        "fullscreen",
+        "highlight_aoi",
+        "hide_on_pause",
+        "display_session_number",
+        "render_on_change",
+        "frame_onsets",
+        "telemetry",
+        "compact_seeds",
+        "compact_states",
+        "compress_segments",
+    ]:
         if value.strip().lower() == "true":
             return True
         elif value.strip().lower() == "false":
@@ -71,7 +62,7 @@ def get_conf_value(section: str, key: str, val_type: Optional[type] = None) -> A
             )
 
     # Integer values
-    elif key in ["screen_index"]:
+    elif key in ["screen_index", "control_port", "segment_size", "segment_duration"]:
         try:
             value = int(value)
         except (ValueError, TypeError):
@@ -80,7 +71,7 @@ def get_conf_value(section: str, key: str, val_type: Optional[type] = None) -> A
             return value
 
     # Float values
-    elif key in ["clock_speed"]:
+    elif key in ["clock_speed", "fsync_period"]:
         try:
             value = float(value)
         except (ValueError, TypeError):
@@ -4,6 +4,7 @@
 
 from .abstractwidget import AbstractWidget  # noqa: F401
 from .button import MuteButton, PlayPause  # noqa: F401
+from .chronometer import Chronometer  # noqa: F401
 from .frame import Frame  # noqa: F401
 from .light import Light  # noqa: F401
 from .performancescale import Performancescale  # noqa: F401
@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import math
-from typing import Any
+from typing import Any, ClassVar
 
 from pyglet import sprite
 from pyglet.gl import (  # noqa: F401
@@ -25,7 +25,8 @@ from core.constants import COLORS as C
 from core.constants import FONT_SIZES as F  # noqa: F401
 from core.constants import Group as G
 from core.container import Container
-from core.logger import Logger, get_logger
+from core.logger import LogChannel, Logger, get_logger
+from core.relayout import Relayout, rescale, scale_geometry, set_rescaled
 from core.rendering import (
     expand_colors_for_line_loop,
     get_group,
@@ -39,6 +40,10 @@ from core.window import Window
 
 
 class AbstractWidget:
+    # Pixel attributes computed from the container, that must follow a window resize
+    # ({attribute_name: axis}, axis being "x", "y" or "xy" for flat coordinates sequences)
+    geometry: ClassVar[dict[str, str]] = {}
+
     def __init__(self, name: str, container: Container | None) -> None:
         self.name: str = name
         self.container: Container | None = container
@@ -59,6 +64,24 @@ class AbstractWidget:
             else:
                 self.m_draw = 0
 
+    def mark_dirty(self) -> None:
+        # Tell the window that its content changed (render-on-change mode)
+        if Window.MainWindow is not None:
+            Window.MainWindow.mark_dirty()
+
+    def record_state(self, attribute: str, value: Any) -> None:
+        # Every logged state is a visual change
+        self.mark_dirty()
+        self.logger.get_state_recorder(self.name, attribute).record(value)
+
+    def register_channel(self, attribute: str, deadband: float = 0.0) -> LogChannel:
+        # A numeric state changing at a high rate (e.g. at each tracking update)
+        return self.logger.register_channel(self.name, attribute, deadband)
+
+    def record_channel(self, channel: LogChannel, value: Any) -> None:
+        self.mark_dirty()
+        self.logger.record_channel(channel, value)
+
     def is_visible(self) -> bool:
         return self.visible is True
 
@@ -69,6 +92,7 @@ class AbstractWidget:
             print("Show ", self.name)
         self.show_aoi_highlight()
         self.assign_vertices_to_batch()
+        self.mark_dirty()
         if hasattr(self, "set_visibility"):
             self.set_visibility(True)
         else:
@@ -81,6 +105,7 @@ class AbstractWidget:
             print("Hide ", self.name)
 
         self.empty_batch()
+        self.mark_dirty()
         if hasattr(self, "set_visibility"):
             self.set_visibility(False)
         else:
@@ -174,6 +199,26 @@ class AbstractWidget:
 
         self.on_batch = dict()
 
+    def relayout(self, relayout: Relayout) -> None:
+        """Rescale the widget geometry (containers, vertices, labels positions) after a window resize"""
+        scale_geometry(self, self.geometry, relayout)
+        for name, v_def in self.vertex.items():
+            if isinstance(v_def, (Label, HTMLLabel, sprite.Sprite)):
+                x, y = rescale(self, ("label", name), (v_def.x, v_def.y), "xy", relayout)
+                v_def.position = (x, y, v_def.z)
+                if getattr(v_def, "multiline", False) and v_def.width:
+                    v_def.width = rescale(self, ("label_width", name), v_def.width, "x", relayout)
+            else:
+                kind, group, positions, colors = v_def
+                self.vertex[name] = (kind, group, rescale(self, ("vertex", name), positions, "xy", relayout), colors)
+
+        # Vertex lists on the batch are updated in place (their buffer rounds the positions)
+        for name, vertex_list in self.on_batch.items():
+            key: tuple[str, str] = ("batch", name)
+            vertex_list.position[:] = rescale(self, key, list(vertex_list.position[:]), "xy", relayout)
+            set_rescaled(self, key, list(vertex_list.position[:]))
+        self.mark_dirty()
+
     def resize_quad(self, name: str, new_count: int) -> None:
         """Resize an indexed quad vertex list, recalculating indices."""
         vlist = self.on_batch[name]
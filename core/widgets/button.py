@@ -93,6 +93,7 @@ class PlayPause(Button):
         HIDDEN: tuple[int, int, int, int] = (255, 255, 255, 0)
         self.on_batch["play_tri"].colors = list(W * 3) if is_paused else list(HIDDEN * 3)
         self.on_batch["pause_bars"].colors = list(HIDDEN * 8) if is_paused else list(W * 8)
+        self.mark_dirty()
 
 
 class MuteButton(Button):
@@ -166,3 +167,4 @@ class MuteButton(Button):
         self.on_batch["unmute_waves"].colors = (
             list(HIDDEN * self._n_wave_pts) if is_muted else list(W * self._n_wave_pts)
         )
+        self.mark_dirty()
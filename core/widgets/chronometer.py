@@ -0,0 +1,118 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+from __future__ import annotations
+
+from typing import ClassVar
+
+from pyglet import font
+
+from core.constants import COLORS as C
+from core.constants import FONT_SIZES as F
+from core.widgets.abstractwidget import *
+
+
+class Chronometer(AbstractWidget):
+    """
+    A text whose last word (the time) is rendered one glyph per fixed-width cell,
+    so that a tick only relayouts the digits that changed.
+    Any text before the last space is displayed as a (rarely changing) caption.
+    """
+
+    geometry: ClassVar[dict[str, str]] = {"x_pos": "x", "y_pos": "y"}
+
+    def __init__(
+        self,
+        name: str,
+        container: Any,
+        text: str,
+        draw_order: int = 1,
+        font_size: int = F["SMALL"],
+        x: float = 0.5,
+        y: float = 0.5,
+        color: tuple[int, ...] = C["BLACK"],
+        cells: int = 8,
+    ) -> None:
+        super().__init__(name, container)
+
+        self.text: str = ""
+        self.x_pos: float = self.container.l + x * self.container.w
+        self.y_pos: float = self.container.b + y * self.container.h
+        self.label_kwargs: dict[str, Any] = dict(
+            font_size=font_size,
+            y=self.y_pos,
+            anchor_y="center",
+            color=color,
+            group=G(draw_order),
+            font_name=self.font_name,
+        )
+
+        # Use the widest digit advance so that every digit fits into its cell
+        glyphs: list[Any] = font.load(self.font_name, font_size).get_glyphs("0123456789")
+        self.cell_width: float = max(g.advance for g in glyphs)
+        self.gap: float = self.cell_width
+
+        self.vertex["caption"] = Label("", x=self.x_pos, anchor_x="left", **self.label_kwargs)
+        self.cells: list[Any] = list()
+        self.clock_length: int = 0
+        self.add_cells(cells)
+        self.display(text)
+
+    def add_cells(self, n: int) -> None:
+        for _i in range(n):
+            c: int = len(self.cells)
+            cell: Any = Label("", x=self.x_pos, anchor_x="center", **self.label_kwargs)
+            if self.is_visible():
+                cell.batch = Window.MainWindow.batch
+            self.vertex[f"cell_{c}"] = cell
+            self.cells.append(cell)
+
+    def relayout(self, relayout: Relayout) -> None:
+        # The cells keep their (font) width: the labels are placed again around the rescaled centre
+        scale_geometry(self, self.geometry, relayout)
+        for label in [self.vertex["caption"], *self.cells]:
+            label.y = self.y_pos
+        self.place()
+        self.mark_dirty()
+
+    def set_text(self, text: str) -> None:
+        if text == self.get_text():
+            return
+        self.display(text)
+        self.record_state("text", text)
+
+    def display(self, text: str) -> None:
+        caption, _sep, clock = text.rpartition(" ")
+        caption = caption.strip()
+
+        moved: bool = len(clock) != self.clock_length
+        if caption != self.vertex["caption"].text:
+            self.vertex["caption"].text = caption
+            moved = True
+
+        if len(clock) > len(self.cells):
+            self.add_cells(len(clock) - len(self.cells))
+
+        # Only the glyphs that differ are relayouted
+        for i, cell in enumerate(self.cells):
+            char: str = clock[i] if i < len(clock) else ""
+            if cell.text != char:
+                cell.text = char
+
+        self.text = text
+        self.clock_length = len(clock)
+        if moved:
+            self.place()
+
+    def place(self) -> None:
+        """Centre the caption, the gap and the used cells on x_pos, as the whole text would be"""
+        caption: Any = self.vertex["caption"]
+        caption_width: float = caption.content_width + self.gap if caption.text else 0
+        left: float = self.x_pos - (caption_width + self.clock_length * self.cell_width) / 2
+        caption.x = left
+        for c, cell in enumerate(self.cells):
+            cell.x = left + caption_width + (c + 0.5) * self.cell_width
+
+    def get_text(self) -> str:
+        return self.text
@@ -56,7 +56,7 @@ class Frame(AbstractWidget):
         if thickness == self.get_border_thickness():
             return
         self.border_thickness = thickness
-        self.logger.record_state(self.name, "border_thickness", thickness)
+        self.record_state("border_thickness", thickness)
 
         if self.is_visible():
             self.on_batch["border"].position[:] = self.get_border_vertices()
@@ -68,7 +68,7 @@ class Frame(AbstractWidget):
         if color == self.get_border_color():
             return
         self.on_batch["border"].colors[:] = color * 16
-        self.logger.record_state(self.name, "color", color)
+        self.record_state("color", color)
 
     def get_border_color(self) -> tuple[int, int, int, int]:
         return self.get_vertex_color("border")
@@ -86,4 +86,4 @@ class Frame(AbstractWidget):
             v = self.vertice_border(self.container) if self.is_visible() else (0,) * 8
             self.on_batch["fillarea"].position[:] = v
 
-        self.logger.record_state(self.name, "visibility", visible)
+        self.record_state("visibility", visible)
@@ -38,7 +38,7 @@ class Light(AbstractWidget):
         if label_to_upper == self.get_label():
             return
         self.vertex["label"].text = label_to_upper
-        self.logger.record_state(self.name, "label", label_to_upper)
+        self.record_state("label", label_to_upper)
 
     def get_label(self) -> str:
         return self.vertex["label"].text
@@ -49,8 +49,8 @@ class Light(AbstractWidget):
         self.on_batch["background"].colors[:] = color * 4
         self.on_batch["border"].colors[:] = self.border_color * 8
 
-        self.logger.record_state(self.name, "background", color)
-        self.logger.record_state(self.name, "border", self.border_color)
+        self.record_state("background", color)
+        self.record_state("border", self.border_color)
 
     def get_color(self) -> tuple[int, int, int, int]:
         return self.get_vertex_color("background")
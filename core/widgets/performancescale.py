@@ -4,11 +4,15 @@
 
 from __future__ import annotations
 
+from typing import ClassVar
+
 from core.container import Container
 from core.widgets.abstractwidget import *
 
 
 class Performancescale(AbstractWidget):
+    geometry: ClassVar[dict[str, str]] = {"border_vertices": "xy", "tick_width": "x"}
+
     def __init__(
         self,
         name: str,
@@ -113,7 +117,7 @@ class Performancescale(AbstractWidget):
         v1: list[float] = list(self.vertice_border(self.container))
         v1[1] = v1[3] = self.get_y_of(self.performance_level)
         self.on_batch["performance"].position[:] = v1
-        self.logger.record_state(self.name, "level", self.performance_level)
+        self.record_state("level", self.performance_level)
 
     def get_performance_level(self) -> int:
         return self.performance_level
@@ -123,7 +127,7 @@ class Performancescale(AbstractWidget):
             return
         self.performance_color = color
         self.on_batch["performance"].colors[:] = color * 4
-        self.logger.record_state(self.name, "color", self.performance_color)
+        self.record_state("color", self.performance_color)
 
     def get_performance_color(self) -> tuple[int, int, int, int]:
         return self.get_vertex_color("performance")
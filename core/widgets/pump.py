@@ -86,7 +86,7 @@ class Pump(AbstractWidget):
         if color == self.get_color():
             return
         self.on_batch["triangle"].colors[:] = color * 3
-        self.logger.record_state(self.name, "triangle", color)
+        self.record_state("triangle", color)
 
     def get_color(self) -> tuple[int, int, int, int]:
         return self.get_vertex_color("triangle")
@@ -39,7 +39,7 @@ class PumpFlow(AbstractWidget):
         if self.pump_string(flow) == self.get_flow():
             return
         self.vertex[self.label].text = self.pump_string(flow)
-        self.logger.record_state(self.name, self.label, flow)
+        self.record_state(self.label, flow)
 
     def get_flow(self) -> str:
         return self.vertex[self.label].text
@@ -66,14 +66,14 @@ class Radio(AbstractWidget):
             v: tuple[int, ...] = (0, 0) * 3  # Get an invisible vertice (hide)
             self.on_batch[name].position[:] = v
         self.is_selected = False
-        self.logger.record_state(self.name, "selected", False)
+        self.record_state("selected", False)
 
     def show_arrows(self) -> None:
         for name, info in self.arrows.items():
             v: list[float] = self.get_triangle_vertice(x_ratio=info["x_ratio"], angle=info["angle"])
             self.on_batch[name].position[:] = v
         self.is_selected = True
-        self.logger.record_state(self.name, "selected", True)
+        self.record_state("selected", True)
 
     def is_new_frequency(self, frequency: float) -> bool:
         return self.get_frequency_string(frequency) != self.vertex["radio_frequency"].text
@@ -82,10 +82,10 @@ class Radio(AbstractWidget):
         if not self.is_new_frequency(frequency):
             return
         self.vertex["radio_frequency"].text = self.get_frequency_string(frequency)
-        self.logger.record_state(self.name, "radio_frequency", frequency)
+        self.record_state("radio_frequency", frequency)
 
     def set_feedback_color(self, color: tuple[int, int, int, int]) -> None:
         if color == self.get_vertex_color("feedback_lines"):
             return
         self.on_batch["feedback_lines"].colors[:] = color * 8
-        self.logger.record_state(self.name, "feedback_color", color)
+        self.record_state("feedback_color", color)
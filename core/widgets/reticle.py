@@ -4,10 +4,19 @@
 
 from __future__ import annotations
 
+from typing import ClassVar
+
 from core.widgets.abstractwidget import *
 
 
 class Reticle(AbstractWidget):
+    geometry: ClassVar[dict[str, str]] = {
+        "cursor_relative": "xy",
+        "cursor_absolute": "xy",
+        "cursor_radius": "x",
+        "target_radius": "x",
+    }
+
     def __init__(
         self,
         name: str,
@@ -26,6 +35,8 @@ class Reticle(AbstractWidget):
         self.cursor_proportional: tuple[float, ...] = self.relative_to_proportional()
         self.cursor_radius: float = self.container.w / 2 * 0.08
         self.cursor_absolute: tuple[float, ...] = self.relative_to_absolute()
+        self.cursor_relative_channel: LogChannel = self.register_channel("cursor_relative")
+        self.cursor_proportional_channel: LogChannel = self.register_channel("cursor_proportional")
 
         # Set widths
         self.corner_width: float = 0.07 * self.container.w
@@ -77,7 +88,7 @@ class Reticle(AbstractWidget):
         v: list[float] = self.vertice_circle([self.container.cx, self.container.cy], self.target_radius, 50)
         self.on_batch["target_area"].position[:] = v
         self.on_batch["target_border"].position[:] = v
-        self.logger.record_state(self.name, "target_proportion", proportion)
+        self.record_state("target_proportion", proportion)
 
     def get_target_proportion(self) -> float:
         return self.target_proportion
@@ -123,8 +134,8 @@ class Reticle(AbstractWidget):
         self.cursor_absolute = self.relative_to_absolute()
         v: list[float] = self.get_cursor_vertice()
         self.on_batch["cursor"].position[:] = v
-        self.logger.record_state(self.name, "cursor_relative", (x, y))
-        self.logger.record_state(self.name, "cursor_proportional", self.relative_to_proportional())
+        self.record_channel(self.cursor_relative_channel, (x, y))
+        self.record_channel(self.cursor_proportional_channel, self.relative_to_proportional())
 
     def get_cursor_absolute_position(self) -> tuple[float, ...]:
         return self.cursor_absolute
@@ -143,7 +154,7 @@ class Reticle(AbstractWidget):
             return
         length: int = len(self.get_cursor_vertice()) // 2
         self.on_batch["cursor"].colors[:] = color * length
-        self.logger.record_state(self.name, "cursor_color", color)
+        self.record_state("cursor_color", color)
 
     def get_cursor_color(self) -> tuple[int, ...]:
         return self.get_vertex_color("cursor")
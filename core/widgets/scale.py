@@ -4,6 +4,8 @@
 
 from __future__ import annotations
 
+from typing import ClassVar
+
 from core.constants import COLORS as C
 from core.constants import FONT_SIZES as F
 from core.constants import Group as G
@@ -11,6 +13,14 @@ from core.widgets.abstractwidget import *
 
 
 class Scale(AbstractWidget):
+    geometry: ClassVar[dict[str, str]] = {
+        "positions": "y",
+        "tick_width": "x",
+        "arrow_width": "x",
+        "arrow_x_offset": "x",
+        "feedback_height": "y",
+    }
+
     def __init__(self, name: str, container: Any, label: str, arrow_position: int = 5) -> None:
         super().__init__(name, container)
 
@@ -89,7 +99,7 @@ class Scale(AbstractWidget):
             else (0, 0) * 4
         )
         self.on_batch["feedback"].position[:] = v
-        self.logger.record_state(self.name, "feedback_visible", visible)
+        self.record_state("feedback_visible", visible)
 
     def is_feedback_visible(self) -> bool:
         return self.feedback_visible is True
@@ -98,7 +108,7 @@ class Scale(AbstractWidget):
         if color == self.get_feedback_color():
             return
         self.on_batch["feedback"].colors[:] = color * 4
-        self.logger.record_state(self.name, "feedback_color", color)
+        self.record_state("feedback_color", color)
 
     def get_feedback_color(self) -> tuple[int, ...]:
         return self.get_vertex_color("feedback")
@@ -108,7 +118,7 @@ class Scale(AbstractWidget):
             return
         self.position = position
         self.on_batch["arrow"].position[:] = self.return_arrow_vertice(self.position)
-        self.logger.record_state(self.name, "arrow", self.position)
+        self.record_state("arrow", self.position)
 
     def get_arrow_position(self) -> int:
         return self.position
@@ -118,7 +128,7 @@ class Scale(AbstractWidget):
         if label == self.get_label():
             return
         self.vertex["label"].text = label_to_upper
-        self.logger.record_state(self.name, "label", label_to_upper)
+        self.record_state("label", label_to_upper)
 
     def get_label(self) -> str:
         return self.vertex["label"].text
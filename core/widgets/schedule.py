@@ -4,10 +4,14 @@
 
 from __future__ import annotations
 
+from typing import ClassVar
+
 from core.widgets.abstractwidget import *
 
 
 class Schedule(AbstractWidget):
+    geometry: ClassVar[dict[str, str]] = {"line_radius": "y", "bound_radius": "y", "box_radius": "y"}
+
     def __init__(self, name: str, container: Any, label: str) -> None:
         super().__init__(name, container)
 
@@ -69,7 +73,7 @@ class Schedule(AbstractWidget):
         if bound_color == self.get_vertex_color("top_bound"):
             return
         self.on_batch["top_bound"].colors[:] = bound_color * 4
-        self.logger.record_state(self.name, "top_bound_color", bound_color)
+        self.record_state("top_bound_color", bound_color)
 
     def sec_to_y(self, sec: float, max_sec: float) -> float:
         return self.container.y1 - (sec / max_sec * (self.container.y1 - self.container.y2))
@@ -98,6 +102,7 @@ class Schedule(AbstractWidget):
             self.resize_quad(time_mode, len(v) // 2)
             self.on_batch[time_mode].position[:] = v
             self.on_batch[time_mode].colors[:] = list(color) * (len(v) // 2)
+        self.mark_dirty()
 
     def update(self) -> None:
         if self.visible:
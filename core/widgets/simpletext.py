@@ -50,7 +50,7 @@ class Simpletext(AbstractWidget):
         if text == self.get_text():
             return
         self.vertex["text"].text = text
-        self.logger.record_state(self.name, "text", text)
+        self.record_state("text", text)
 
     def get_text(self) -> str:
         return self.vertex["text"].text
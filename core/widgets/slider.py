@@ -146,6 +146,7 @@ class Slider(AbstractWidget):
         self.on_batch["groove_b"].position[:] = new_verts
         new_line_pos, _ = line_loop_to_lines(new_verts)
         self.on_batch["groove"].position[:] = new_line_pos
+        self.mark_dirty()
 
     def set_value_label(self) -> None:
         if not self.showvalue:
@@ -154,6 +155,7 @@ class Slider(AbstractWidget):
         if display_value == self.vertex["value"].text:
             return
         self.vertex["value"].text = display_value
+        self.mark_dirty()
 
     def coordinates_in_groove_container(self, x: float, y: float) -> bool:
         return self.containers["allgroove"].contains_xy(x, y)
@@ -189,7 +191,7 @@ class Slider(AbstractWidget):
         if math.isclose(val, self.groove_value):
             return
         self.groove_value = val
-        self.logger.record_state(self.name, "value", str(val))
+        self.record_state("value", str(val))
         self.update()
 
     def get_title(self) -> str:
@@ -214,6 +216,7 @@ class Slider(AbstractWidget):
             outline = C["BLUE"] if is_selected else C["BLACK"]
             n_verts = len(self.on_batch["groove"].colors) // 4
             self.on_batch["groove"].colors = outline * n_verts
+        self.mark_dirty()
 
     def adjust_value(self, steps: int) -> None:
         step_size: float = (self.value_max - self.value_min) / 20
@@ -4,11 +4,15 @@
 
 from __future__ import annotations
 
+from typing import ClassVar
+
 from core.container import Container
 from core.widgets.abstractwidget import *
 
 
 class Tank(AbstractWidget):
+    geometry: ClassVar[dict[str, str]] = {"border_vertices": "xy"}
+
     def __init__(
         self,
         name: str,
@@ -92,15 +96,15 @@ class Tank(AbstractWidget):
             return
         self.tolerance_radius = radius
         self.on_batch["tolerance"].position[:] = self.get_tolerance_vertices(radius, target, level_max)
-        self.logger.record_state(self.name, "tolerance_radius", radius)
-        self.logger.record_state(self.name, "target", target)
-        self.logger.record_state(self.name, "level_max", level_max)
+        self.record_state("tolerance_radius", radius)
+        self.record_state("target", target)
+        self.record_state("level_max", level_max)
 
     def set_tolerance_color(self, color: tuple[int, ...]) -> None:
         if color == self.get_tolerance_color():
             return
         self.on_batch["tolerance"].colors[:] = color * 4
-        self.logger.record_state(self.name, "tolerance_color", color)
+        self.record_state("tolerance_color", color)
 
     def get_tolerance_radius(self) -> float:
         return self.tolerance_radius
@@ -115,7 +119,7 @@ class Tank(AbstractWidget):
         v1: list[float] = list(self.vertice_border(self.container))
         v1[1] = v1[3] = self.get_y_of(level, level_max)
         self.on_batch["fluid"].position[:] = v1
-        self.logger.record_state(self.name, "fluid_level", level)
+        self.record_state("fluid_level", level)
 
     def get_fluid_level(self) -> float:
         return self.level
@@ -124,7 +128,7 @@ class Tank(AbstractWidget):
         if label == self.get_fluid_label():
             return
         self.vertex["fluid_label"].text = label
-        self.logger.record_state(self.name, "fluid_label", label)
+        self.record_state("fluid_label", label)
 
     def get_fluid_label(self) -> str:
         return self.vertex["fluid_label"].text
@@ -62,7 +62,7 @@ class Timeline(AbstractWidget):
         self.max_time_minute = max_time_minute
         self.draw_timeline()
         self.show()
-        self.logger.record_state(self.name, "max_time_minute", max_time_minute)
+        self.record_state("max_time_minute", max_time_minute)
 
     def get_max_time(self) -> int:
         return self.max_time_minute
@@ -4,7 +4,9 @@
 
 from __future__ import annotations
 
-from typing import Any
+from math import inf, sqrt
+from time import perf_counter, sleep
+from typing import Any, Callable
 
 from pyglet import image
 from pyglet.display import get_display
@@ -19,22 +21,85 @@ from core.constants import PLUGIN_TITLE_HEIGHT_PROPORTION, REPLAY_MODE, REPLAY_S
 from core.container import Container
 from core.logger import get_logger
 from core.modaldialog import ModalDialog
+from core.relayout import Relayout, rescale, set_rescaled
 from core.rendering import get_group, get_program, polygon_indices
 from core.utils import get_conf_value
 
+# Render-on-change mode: period used to pace the loop when a frame is skipped (no vsync wait then),
+# and maximal number of consecutive skipped frames before forcing a redraw (safety net)
+FRAME_PERIOD: float = 1 / 60
+MAX_CONSECUTIVE_SKIPPED_FRAMES: int = 60
+
+
+class FlipStatistics:
+    """Online (Welford) statistics of the intervals between two consecutive buffer flips"""
+
+    def __init__(self, nominal_period: float = FRAME_PERIOD) -> None:
+        self.nominal_period: float = nominal_period
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.min: float = inf
+        self.max: float = 0.0
+        self.missed: int = 0  # Intervals longer than 1.5 nominal period (dropped frames)
+
+    def add(self, interval: float) -> None:
+        self.count += 1
+        delta: float = interval - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (interval - self.mean)
+        self.min = min(self.min, interval)
+        self.max = max(self.max, interval)
+        if interval > 1.5 * self.nominal_period:
+            self.missed += 1
+
+    def get_sd(self) -> float:
+        return sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def get_summary(self) -> str:
+        if self.count == 0:
+            return "n=0"
+        ms: list[float] = [round(v * 1000, 3) for v in (self.mean, self.get_sd(), self.min, self.max)]
+        return f"n={self.count};mean_ms={ms[0]};sd_ms={ms[1]};min_ms={ms[2]};max_ms={ms[3]};missed={self.missed}"
+
 
 class Window(Window):
     # Static variable
     MainWindow: Window | None = None
 
+    # Render-on-change (damage tracking) state. Class level defaults, as pyglet may
+    # dispatch events during the base class initialization
+    render_on_change: bool = False
+    skipped_frames: int = 0
+    _dirty: bool = True
+    _skip_flip: bool = False
+    _consecutive_skips: int = 0
+    _last_frame_time: float = 0.0
+    _mouse_visible: bool | None = None
+    _last_flip_time: float | None = None
+
+    # Containers layout, computed once per window size
+    _layout: dict[str, Container] | None = None
+    _layout_size: tuple[int, int] | None = None
+    _layout_bounds: tuple[list[float], list[float]] | None = None
+    # Size the layout was first computed for, and the current scale relative to it (see core.relayout)
+    _reference_size: tuple[int, int] | None = None
+    _layout_scale: tuple[float, float] = (1.0, 1.0)
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         Window.MainWindow = self  # correct way to set it as a static
+        self.relayout_listeners: list[Callable[[Relayout], None]] = list()
+        self.background_vertices: list[Any] = list()
 
         screen: Any = self.get_screen()
 
         self._width: int = int(screen.width)
         self._height: int = int(screen.height)
         self._fullscreen: bool = get_conf_value("Openmatb", "fullscreen")
+        try:
+            self.render_on_change = get_conf_value("Openmatb", "render_on_change")
+        except (KeyError, TypeError):
+            self.render_on_change = False
 
         super().__init__(
             fullscreen=self._fullscreen, width=self._width, height=self._height, vsync=True, *args, **kwargs
@@ -47,9 +112,12 @@ class Window(Window):
 
         self.set_size_and_location(screen)  # Postpone multiple monitor support
         self.set_mouse_visible(REPLAY_MODE)
+        self._mouse_visible = REPLAY_MODE
 
         self.batch: Batch = Batch()
         self.keyboard: dict[str, bool] = dict()  # Reproduce a simple KeyStateHandler
+        self.key_times: dict[str, float] = dict()  # perf_counter() time of the last press dispatch of each key
+        self.flip_callbacks: list[Callable[[float], None]] = list()
 
         self.create_MATB_background()
         self.alive: bool = True
@@ -57,6 +125,7 @@ class Window(Window):
         self.slider_visible: bool = False
 
         self.on_key_press_replay: Any | None = None  # used by the replay
+        self.flip_stats: FlipStatistics = FlipStatistics()
 
     def display_session_id(self) -> None:
         # Display the session ID if needed at window instanciation
@@ -104,7 +173,7 @@ class Window(Window):
         indices = polygon_indices(4)
 
         # Main background
-        program.vertex_list_indexed(
+        main_background: Any = program.vertex_list_indexed(
             4,
             GL_TRIANGLES,
             indices,
@@ -115,7 +184,7 @@ class Window(Window):
         )
 
         # Upper band
-        program.vertex_list_indexed(
+        upper_band: Any = program.vertex_list_indexed(
             4,
             GL_TRIANGLES,
             indices,
@@ -129,7 +198,7 @@ class Window(Window):
         )
 
         # Middle band
-        program.vertex_list_indexed(
+        middle_band: Any = program.vertex_list_indexed(
             4,
             GL_TRIANGLES,
             indices,
@@ -151,33 +220,104 @@ class Window(Window):
             colors=("Bn", C["BLACK"] * 4),
         )
 
+        self.background_vertices = [main_background, upper_band, middle_band]
+
     def on_draw(self) -> None:
-        self.set_mouse_visible(self.is_mouse_necessary())
+        self.update_mouse_visibility()
+        if not self.needs_redraw():
+            self._skip_flip = True
+            return
+
+        self._dirty = False
+        self._consecutive_skips = 0
         glClearColor(0, 0, 0, 1)
         self.clear()
         self.batch.draw()
 
+    def flip(self) -> None:
+        # When on_draw did not redraw, the front buffer still holds the last frame: do not swap.
+        # As no vsync wait happens then, pace the loop to the frame period to release the CPU
+        if self._skip_flip:
+            self._skip_flip = False
+            self.skipped_frames += 1
+            self._consecutive_skips += 1
+            remaining: float = self._last_frame_time + FRAME_PERIOD - perf_counter()
+            if remaining > 0:
+                sleep(remaining)
+            self._last_flip_time = None  # Do not measure an interval across skipped frames
+        else:
+            super().flip()
+            self.record_flip(perf_counter())
+        self._last_frame_time = perf_counter()
+
+    def record_flip(self, flip_time: float) -> None:
+        # With vsync, flip() returns once the frame is swapped: flip_time approximates its onset
+        if self._last_flip_time is not None:
+            self.flip_stats.add(flip_time - self._last_flip_time)
+        self._last_flip_time = flip_time
+        get_logger().record_onsets(flip_time)
+
+        callbacks: list[Callable[[float], None]] = self.flip_callbacks
+        self.flip_callbacks = list()
+        for callback in callbacks:
+            callback(flip_time)
+
+    def call_on_next_flip(self, callback: Callable[[float], None]) -> None:
+        """Call callback(flip_time) after the next buffer flip, i.e. when the current changes become visible"""
+        self.flip_callbacks.append(callback)
+
+    def dispatch_event(self, event_type: str, *args: Any) -> Any:
+        # Any input or window event (key, mouse, resize, expose...) may alter the display
+        if event_type not in ("on_draw", "on_refresh"):
+            self._dirty = True
+        return super().dispatch_event(event_type, *args)
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def needs_redraw(self) -> bool:
+        if not self.render_on_change or self._dirty:
+            return True
+
+        # Guards: dialogs are always drawn, and a frame is periodically redrawn anyway
+        return self.modal_dialog is not None or self._consecutive_skips >= MAX_CONSECUTIVE_SKIPPED_FRAMES
+
+    def update_mouse_visibility(self) -> None:
+        visible: bool = self.is_mouse_necessary()
+        if visible != self._mouse_visible:
+            self.set_mouse_visible(visible)
+            self._mouse_visible = visible
+
     def is_mouse_necessary(self) -> bool:
         return self.slider_visible or REPLAY_MODE
 
+    def log_render_stats(self) -> None:
+        get_logger().log_manual_entry(self.flip_stats.get_summary(), key="flip_interval")
+        if self.render_on_change:
+            get_logger().log_manual_entry(self.skipped_frames, key="skipped_frames")
+
     # Log any keyboard input, either plugins accept it or not
     # is subclassed in replay mode
     def on_key_press(self, symbol: int, modifiers: int) -> None:
+        # Stamped as soon as pyglet dispatches the OS event (before any processing)
+        input_time: float = perf_counter()
         if REPLAY_MODE:
             return
 
         if self.modal_dialog is None:
             keystr: str = winkey.symbol_string(symbol)
             self.keyboard[keystr] = True  # KeyStateHandler
+            self.key_times[keystr] = input_time
 
             if keystr == "ESCAPE":
                 self.exit_prompt()
             elif keystr == "P":
                 self.pause_prompt()
 
-            get_logger().record_input("keyboard", keystr, "press")
+            get_logger().record_input("keyboard", keystr, "press", logtime=input_time)
 
     def on_key_release(self, symbol: int, modifiers: int) -> None:
+        input_time: float = perf_counter()
         if self.modal_dialog is not None:
             self.modal_dialog.on_key_release(symbol, modifiers)
             return
@@ -187,7 +327,7 @@ class Window(Window):
 
         keystr: str = winkey.symbol_string(symbol)
         self.keyboard[keystr] = False  # KeyStateHandler
-        get_logger().record_input("keyboard", keystr, "release")
+        get_logger().record_input("keyboard", keystr, "release", logtime=input_time)
 
     def exit_prompt(self) -> None:
         self.modal_dialog = ModalDialog(self, _("You hit the Escape key"), title=_("Exit OpenMATB?"), exit_key="q")
@@ -198,6 +338,15 @@ class Window(Window):
     def exit(self) -> None:
         self.alive = False
 
+    def get_layout_bounds(self) -> tuple[list[float], list[float]]:
+        # The vertical bounds are read (and evaluated) from the configuration only once
+        if self._layout_bounds is None:
+            self._layout_bounds = (
+                get_conf_value("Openmatb", "top_bounds"),
+                get_conf_value("Openmatb", "bottom_bounds"),
+            )
+        return self._layout_bounds
+
     def get_container_list(self) -> list[Container]:
         mar: float = REPLAY_STRIP_PROPORTION if REPLAY_MODE else 0
         w: float = (1 - mar) * self.width
@@ -205,8 +354,9 @@ class Window(Window):
         b: float = self.height * mar
 
         # Vertical bounds
-        x1, x2 = (int(w * bound) for bound in get_conf_value("Openmatb", "top_bounds"))  # Top row
-        x3, x4 = (int(w * bound) for bound in get_conf_value("Openmatb", "bottom_bounds"))  # Bottom row
+        top_bounds, bottom_bounds = self.get_layout_bounds()
+        x1, x2 = (int(w * bound) for bound in top_bounds)  # Top row
+        x3, x4 = (int(w * bound) for bound in bottom_bounds)  # Bottom row
 
         # Horizontal bound
         y1: float = b + h / 2
@@ -224,13 +374,52 @@ class Window(Window):
             Container("inputstrip", w, b, self._width * mar, h),
         ]
 
+    def get_layout(self) -> dict[str, Container]:
+        # Containers are immutable, so the same instances are shared until the window is resized
+        size: tuple[int, int] = (self.width, self.height)
+        if self._layout is None or self._layout_size != size:
+            self._layout = {c.name: c for c in self.get_container_list()}
+            self._layout_size = size
+        return self._layout
+
     def get_container(self, placement_name: str) -> Container | None:
-        container: list[Container] = [c for c in self.get_container_list() if c.name == placement_name]
-        if len(container) > 0:
-            return container[0]
+        container: Container | None = self.get_layout().get(placement_name)
+        if container is not None:
+            return container
         else:
             print(_("Error. No placement found for the [%s] alias") % placement_name)
 
+    def on_resize(self, width: int, height: int) -> Any:
+        # Ignore minimization, so the geometry can be rescaled from the last real size
+        if width == 0 or height == 0:
+            return super().on_resize(width, height)
+
+        previous_size: tuple[int, int] | None = self._layout_size
+        self._layout = None
+        self._dirty = True
+        result: Any = super().on_resize(width, height)
+        if previous_size is not None and previous_size != (width, height):
+            if self._reference_size is None:
+                self._reference_size = previous_size
+            self.relayout(width / self._reference_size[0], height / self._reference_size[1])
+        return result
+
+    def add_relayout_listener(self, listener: Callable[[Relayout], None]) -> None:
+        self.relayout_listeners.append(listener)
+
+    def relayout(self, sx: float, sy: float) -> None:
+        """Rescale the window geometry to a scale of the reference size, and notify listeners (the
+        scheduler) to rescale theirs"""
+        relayout: Relayout = Relayout(self._layout_scale, (sx, sy))
+        for n, vertex_list in enumerate(self.background_vertices):
+            key: tuple[str, int] = ("background", n)
+            vertex_list.position[:] = rescale(self, key, list(vertex_list.position[:]), "xy", relayout)
+            set_rescaled(self, key, list(vertex_list.position[:]))
+        for listener in self.relayout_listeners:
+            listener(relayout)
+        self._layout_scale = (sx, sy)
+        self.get_layout()
+
     def open_modal_window(self, pass_list: list[str], title: str, continue_key: str | None, exit_key: str) -> None:
         # TODO: would be better to use callbacks than to detect the alive variable
         # for example to close
@@ -12,5 +12,6 @@ from .parallelport import Parallelport  # noqa: F401
 from .performance import Performance  # noqa: F401
 from .resman import Resman  # noqa: F401
 from .scheduling import Scheduling  # noqa: F401
+from .signalexport import Signalexport  # noqa: F401
 from .sysmon import Sysmon  # noqa: F401
 from .track import Track  # noqa: F401
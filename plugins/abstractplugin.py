@@ -6,15 +6,17 @@ from __future__ import annotations
 
 from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, ClassVar
 
 from pyglet.window import key as winkey
 
+from core.clock import MAX_STEPS_PER_FRAME, due_steps, fixed_steps
 from core.constants import BFLIM, PLUGIN_TITLE_HEIGHT_PROPORTION, REPLAY_MODE
 from core.constants import COLORS as C
 from core.constants import FONT_SIZES as F
 from core.container import Container
 from core.logger import get_logger
+from core.relayout import Relayout, scale_geometry
 from core.widgets import Frame, SimpleHTML, Simpletext
 from core.window import Window
 
@@ -22,6 +24,16 @@ from core.window import Window
 class AbstractPlugin:
     """Any plugin (or task) depends on this meta-class"""
 
+    # Pixel attributes of the plugin, that must follow a window resize (see AbstractWidget.geometry)
+    geometry: ClassVar[dict[str, str]] = {}
+
+    # When True, the fixed steps grid restarts at the next update (after a start or a resume)
+    _resync_steps: bool = True
+
+    # Steps a frame can catch up, and number of the steps dropped beyond it
+    max_steps_per_frame: int = MAX_STEPS_PER_FRAME
+    dropped_steps: int = 0
+
     def __init__(self, label: str | None = "", taskplacement: str = "fullscreen", taskupdatetime: int = -1) -> None:
         self.label: str | None = label  #   The name as displayed on the interface
         self.alias: str = self.__class__.__name__.lower()  #   A lower version of the plugin class name
@@ -58,13 +70,32 @@ class AbstractPlugin:
         # Define minimal draw order depending on task placement
         self.m_draw: int = BFLIM if self.parameters["taskplacement"] == "fullscreen" else 0
 
+    def declare_parameters(self, events: list[Any]) -> list[str]:
+        """Create the parameters declared by the plugin events, before they are checked (return the errors)"""
+        return list()
+
     def on_scenario_loaded(self, scenario: Any) -> None:
         pass
 
-    def update(self, scenario_time: float) -> None:
+    def update(self, scenario_time: float, refresh: bool = True) -> None:
+        # The plugin state is computed at fixed steps (multiples of taskupdatetime since the plugin
+        # start or resume), independently of the frame rate. Late frames are caught up.
+        if not self.is_paused():
+            if self._resync_steps:
+                self.next_refresh_time = scenario_time
+                self._resync_steps = False
+
+            period: float = self.parameters["taskupdatetime"] / 1000
+            dropped: int = due_steps(scenario_time, self.next_refresh_time, period) - self.max_steps_per_frame
+            if dropped > 0:
+                self.dropped_steps += dropped
+            for step_time in fixed_steps(scenario_time, self.next_refresh_time, period, self.max_steps_per_frame):
+                self.scenario_time = self.next_refresh_time = step_time
+                self.compute_next_plugin_state()
+
         self.scenario_time = scenario_time
-        self.compute_next_plugin_state()
-        self.refresh_widgets()
+        if refresh:  # Intermediate refreshes are skipped when a frame is sub-stepped (fast replay)
+            self.refresh_widgets()
         self.update_can_receive_key()
 
     # State handling
@@ -134,6 +165,7 @@ class AbstractPlugin:
         if self.verbose:
             print("Resume ", self.alias)
         self.paused = False
+        self._resync_steps = True
         self.update_can_receive_key()
 
     def start(self) -> None:
@@ -198,6 +230,7 @@ class AbstractPlugin:
         if self.verbose:
             print(self.alias, "Compute next state")
 
+        # Computed from the scheduled step time, so the update cadence does not drift
         self.next_refresh_time = self.scenario_time + self.parameters["taskupdatetime"] / 1000
 
         # Should an automation state (string) be displayed ?
@@ -304,6 +337,20 @@ class AbstractPlugin:
         else:
             return
 
+    def get_input_time(self, keystr: str) -> float:
+        """Return the perf_counter() time of the last press of a (keyboard or joystick) key, NaN if unknown"""
+        joystick: Any = getattr(self, "joystick", None)
+        if keystr in Window.MainWindow.key_times:
+            return Window.MainWindow.key_times[keystr]
+        elif joystick is not None and keystr in joystick.key_times:
+            return joystick.key_times[keystr]
+        return float("nan")
+
+    def call_on_next_flip(self, callback: Callable[[float], None]) -> None:
+        """Call callback(flip_time) once the changes computed in this frame are displayed"""
+        if Window.MainWindow is not None:
+            Window.MainWindow.call_on_next_flip(callback)
+
     def create_widgets(self) -> None:
         if self.verbose:
             print(self.alias, "Creating widgets")
@@ -352,6 +399,14 @@ class AbstractPlugin:
                 )
                 self.add_widget("automode", Simpletext, container=autocont, text=self.automode_string, x=0.5, y=0.5)
 
+    def relayout(self, relayout: Relayout) -> None:
+        # Only geometries are rescaled: the widgets keep their states
+        scale_geometry(self, self.geometry, relayout)
+        for fullname, widget in self.widgets.items():
+            widget.relayout(relayout)
+            if widget.container is not None:
+                self.logger.record_aoi(widget.container, fullname)
+
     def add_widget(self, name: str, cls: type, container: Container | None, **kwargs: Any) -> Any:
         fullname: str = self.get_widget_fullname(name)
         self.widgets[fullname] = cls(fullname, container, **kwargs)
@@ -393,6 +448,14 @@ class AbstractPlugin:
         self.performance[name].append(value)
         self.logger.log_performance(self.alias, name, value)
 
+    def log_input_response_time(self, onset_time: float | None, input_time: float) -> None:
+        """Log a response time at the input events resolution (ms), with its onset and input perf_counter() times"""
+        if onset_time is None:  # The stimulus was not displayed
+            onset_time = float("nan")
+        self.log_performance("onset_time", onset_time)
+        self.log_performance("input_time", input_time)
+        self.log_performance("input_response_time", (input_time - onset_time) * 1000)
+
     def keep_value_between(self, value: float, down: float, up: float) -> float:
         return max(min(value, up), down)
 
@@ -450,8 +513,8 @@ class BlockingPlugin(AbstractPlugin):
         else:
             pass  # This should not happen (input_path is checked before the scenario is played)
 
-    def update(self, dt: float) -> None:
-        super().update(dt)
+    def update(self, scenario_time: float, refresh: bool = True) -> None:
+        super().update(scenario_time, refresh)
         if self.go_to_next_slide:
             self.go_to_next_slide = False
             if len(self.slides) > 0:  # Are there remaining slides ?
@@ -4,9 +4,11 @@
 
 from __future__ import annotations
 
+from time import perf_counter
 from typing import Any, Callable
 
 from core import validation
+from core.lslstream import DEFAULT_TANK_LETTERS, LslStreamer, get_continuous_states
 from plugins import Instructions
 
 try:
@@ -28,35 +30,38 @@ class Labstreaminglayer(Instructions):
 
         self.parameters.update({"marker": "", "streamsession": False, "pauseatstart": False})
 
-        self.stream_info: Any | None = None
-        self.stream_outlet: Any | None = None
+        self.streamer: LslStreamer | None = None
+        self.plugins: dict[str, Any] = dict()
         self.stop_on_end: bool = False
 
         self.lsl_wait_msg: str = _("Please enable the OpenMATB stream into your LabRecorder.")
 
+    def on_scenario_loaded(self, scenario: Any) -> None:
+        self.plugins = scenario.plugins
+
+    def get_tank_letters(self) -> list[str]:
+        # The tanks of the scenario network (the default ones when resman is not in use)
+        resman: Any = self.plugins.get("resman")
+        if resman is None:
+            return list(DEFAULT_TANK_LETTERS)
+        return list(resman.parameters["tank"])
+
     def start(self) -> None:
         # If we get there it's because the plugin is used.
         # If pylsl is not available this part should fail.
-        # Create a LSL marker outlet.
+        # Create the LSL outlets (markers and continuous states), fed by a worker thread.
         super().start()
-        self.stream_info = pylsl.StreamInfo(
-            "OpenMATB",
-            type="Markers",
-            channel_count=1,
-            nominal_srate=0,
-            channel_format="string",
-            source_id="myuidw435368",
-        )
-        self.stream_outlet = pylsl.StreamOutlet(self.stream_info)
+        self.streamer = LslStreamer(pylsl, states=get_continuous_states(self.get_tank_letters()))
+        self.streamer.start()
 
         if self.parameters["pauseatstart"] is True:
             self.slides = [self.get_msg_slide_content(self.lsl_wait_msg)]
 
-    def update(self, dt: float) -> None:
-        super().update(dt)
+    def update(self, scenario_time: float, refresh: bool = True) -> None:
+        super().update(scenario_time, refresh)
 
         if self.parameters["streamsession"] is True and self.logger.lsl is None:
-            self.logger.lsl = self
+            self.logger.lsl = self.streamer
         elif self.parameters["streamsession"] is False and self.logger.lsl is not None:
             self.logger.lsl = None
 
@@ -68,16 +73,18 @@ class Labstreaminglayer(Instructions):
             self.parameters["marker"] = ""
 
     def push(self, message: str) -> None:
-        if self.stream_outlet is None:
+        if self.streamer is None:
             return
-        self.stream_outlet.push_sample([message])
-
-    #        print(message)
+        self.streamer.push_marker(message, perf_counter())
 
     def stop(self) -> None:
         super().stop()
-        self.stream_info = None
-        self.stream_outlet = None
+        if self.streamer is None:
+            return
+        if self.logger.lsl is self.streamer:
+            self.logger.lsl = None
+        self.streamer.stop()
+        self.streamer = None
 
     def get_msg_slide_content(self, str_msg: str) -> str:
         return f"<title>Lab streaming layer\n{self.lsl_wait_msg}"
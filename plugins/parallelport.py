@@ -4,15 +4,74 @@
 
 from __future__ import annotations
 
+import threading
+from queue import Empty, Queue
+from time import perf_counter
 from typing import Any, Callable
 
 from core import validation
+from core.clock import wait_until
 from core.error import get_errors
 from core.logger import get_logger
 from plugins.abstractplugin import AbstractPlugin
 
 
+class TriggerThread(threading.Thread):
+    """
+    Send the trigger pulses (up value, delayms, down value) to the port from a dedicated thread,
+    so the pulses width is not quantised to the frame time. A pulse is queued as soon as the
+    scheduler executes its trigger event (see Parallelport.set_parameter): its onset is thus the
+    scheduler update that executes the event, not a later plugin update. The pulses are sent in
+    order, one at a time. The actual edges times are queued, as the logger must only be used by
+    the main thread (see pop_edges).
+    """
+
+    def __init__(self, port: Any, downvalue: int = 0) -> None:
+        super().__init__(name="parallelport-trigger", daemon=True)
+        self.port: Any = port
+        self.downvalue: int = downvalue
+        self.pulses: Queue[tuple[int, float] | None] = Queue()
+        self.edges: Queue[tuple[float, int]] = Queue()
+
+    def send(self, value: int, delayms: float) -> None:
+        self.pulses.put((value, delayms))
+
+    def stop(self) -> None:
+        """Send the pending pulses, then end the thread"""
+        self.pulses.put(None)
+        if self.is_alive():
+            self.join()
+
+    def set_port(self, value: int) -> float:
+        self.port.setData(value)
+        edge_time: float = perf_counter()
+        self.edges.put((edge_time, value))
+        return edge_time
+
+    def run(self) -> None:
+        while True:
+            pulse: tuple[int, float] | None = self.pulses.get()
+            if pulse is None:
+                return
+            value, delayms = pulse
+            up_time: float = self.set_port(value)
+            wait_until(up_time + delayms / 1000)
+            self.set_port(self.downvalue)
+
+    def pop_edges(self) -> list[tuple[float, int]]:
+        """Return the (time, value) edges sent since the last call"""
+        edges: list[tuple[float, int]] = list()
+        while True:
+            try:
+                edges.append(self.edges.get_nowait())
+            except Empty:
+                return edges
+
+
 class Parallelport(AbstractPlugin):
+    # Without a trigger thread, the pulses are timed by the plugin updates (frame quantised)
+    _trigger_thread: TriggerThread | None = None
+
     def __init__(self, label: str = "", taskplacement: str = "invisible", taskupdatetime: int = 5) -> None:
         super().__init__(_("Parallel port"), taskplacement, taskupdatetime)
 
@@ -39,21 +98,58 @@ class Parallelport(AbstractPlugin):
             self._last_trigger: int = self._downvalue
             self._awaiting_triggers: list[int] = []
 
+            self._trigger_thread = TriggerThread(self._port, self._downvalue)
+            self._trigger_thread.start()
+
     def is_trigger_being_sent(self) -> bool:
         """Return if the last trigger value is not the down value (trigger being sent)"""
         return self._last_trigger != self._downvalue
 
+    def stop(self) -> None:
+        super().stop()
+        if self._trigger_thread is not None:
+            self._trigger_thread.stop()
+            self.log_trigger_edges()
+
+    def log_trigger_edges(self) -> None:
+        """Log the edges actually sent by the trigger thread, at their own time"""
+        if self._trigger_thread is None:
+            return
+        for edge_time, value in self._trigger_thread.pop_edges():
+            get_logger().record_state(f"{self.alias}_trigger", "value", value, logtime=edge_time)
+            self._last_trigger = value
+
     def set_trigger_value(self, value: int) -> None:
+        if self._trigger_thread is not None:
+            # The whole pulse (up value, delayms, down value) is timed by the trigger thread
+            self._trigger_thread.send(value, self.parameters["delayms"])
+            return
+
         self._port.setData(value)
         self._triggertimerms = 0
         get_logger().record_state(f"{self.alias}_trigger", "value", value)
         self._last_trigger = value
 
+    def set_parameter(self, keys_str: str, value: Any) -> dict[str, Any]:
+        dic: dict[str, Any] = super().set_parameter(keys_str, value)
+        # With the trigger thread, a started plugin queues the pulse right away, rather than at its next update
+        if keys_str == "trigger" and self._trigger_thread is not None and self.alive and value != self._downvalue:
+            self.set_trigger_value(value)
+            self.parameters["trigger"] = self._downvalue
+        return dic
+
     def compute_next_plugin_state(self) -> None:
         """Send the trigger value defined in upvalue, lasting for delayms"""
         if not super().compute_next_plugin_state():
             return
 
+        if self._trigger_thread is not None:
+            self.log_trigger_edges()
+            if self.parameters["trigger"] != self._downvalue:
+                self.set_trigger_value(self.parameters["trigger"])
+                self.parameters["trigger"] = self._downvalue
+            return
+
         # If the trigger value is not null...
         if self.parameters["trigger"] != self._downvalue:
             # ... and no trigger being sent: send it
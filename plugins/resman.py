@@ -11,12 +11,30 @@ from core.constants import COLORS as C
 from core.constants import FONT_SIZES as F
 from core.constants import PLUGIN_TITLE_HEIGHT_PROPORTION
 from core.container import Container
+from core.fluid import FluidNetwork
 from core.widgets import Frame, Pump, PumpFlow, Simpletext, Tank
 from core.window import Window
 from plugins.abstractplugin import AbstractPlugin
 
+# Layout of the default network: tank left coordinate and width (proportions of the task width), and row
+DEFAULT_TANK_LAYOUT: dict[str, tuple[float, float, str]] = dict(
+    a=(0.14, 0.15, "upper"),
+    b=(0.64, 0.15, "upper"),
+    c=(0.05, 0.1, "lower"),
+    d=(0.55, 0.1, "lower"),
+    e=(0.3, 0.12, "lower"),
+    f=(0.8, 0.12, "lower"),
+)
+
 
 class Resman(AbstractPlugin):
+    # Fluid model of the tanks network (tanks and pumps ordered as tank_letters and pump_numbers),
+    # integrated up to fluid_time
+    fluid: FluidNetwork | None = None
+    fluid_time: float | None = None
+    tank_letters: tuple[str, ...] = ()
+    pump_numbers: tuple[str, ...] = ()
+
     def __init__(self, label: str = "", taskplacement: str = "bottommid", taskupdatetime: int = 2000) -> None:
         super().__init__(_("Resources management"), taskplacement, taskupdatetime)
 
@@ -29,60 +47,6 @@ class Resman(AbstractPlugin):
             "displaystatus": validation.is_boolean,
             "tolerancecolor": validation.is_color,
             "tolerancecoloroutside": validation.is_color,
-            "pump-1-flow": validation.is_positive_integer,
-            "pump-1-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-1-key": validation.is_keyboard_key,
-            "pump-2-flow": validation.is_positive_integer,
-            "pump-2-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-2-key": validation.is_keyboard_key,
-            "pump-3-flow": validation.is_positive_integer,
-            "pump-3-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-3-key": validation.is_keyboard_key,
-            "pump-4-flow": validation.is_positive_integer,
-            "pump-4-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-4-key": validation.is_keyboard_key,
-            "pump-5-flow": validation.is_positive_integer,
-            "pump-5-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-5-key": validation.is_keyboard_key,
-            "pump-6-flow": validation.is_positive_integer,
-            "pump-6-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-6-key": validation.is_keyboard_key,
-            "pump-7-flow": validation.is_positive_integer,
-            "pump-7-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-7-key": validation.is_keyboard_key,
-            "pump-8-flow": validation.is_positive_integer,
-            "pump-8-state": (validation.is_in_list, ["off", "on", "failure"]),
-            "pump-8-key": validation.is_keyboard_key,
-            "tank-a-level": validation.is_natural_integer,
-            "tank-a-max": validation.is_positive_integer,
-            "tank-a-target": validation.is_positive_integer,
-            "tank-a-depletable": validation.is_boolean,
-            "tank-a-lossperminute": validation.is_natural_integer,
-            "tank-b-level": validation.is_natural_integer,
-            "tank-b-max": validation.is_positive_integer,
-            "tank-b-target": validation.is_positive_integer,
-            "tank-b-depletable": validation.is_boolean,
-            "tank-b-lossperminute": validation.is_natural_integer,
-            "tank-c-level": validation.is_natural_integer,
-            "tank-c-max": validation.is_positive_integer,
-            "tank-c-target": validation.is_positive_integer,
-            "tank-c-depletable": validation.is_boolean,
-            "tank-c-lossperminute": validation.is_natural_integer,
-            "tank-d-level": validation.is_natural_integer,
-            "tank-d-max": validation.is_positive_integer,
-            "tank-d-target": validation.is_positive_integer,
-            "tank-d-depletable": validation.is_boolean,
-            "tank-d-lossperminute": validation.is_natural_integer,
-            "tank-e-level": validation.is_natural_integer,
-            "tank-e-max": validation.is_positive_integer,
-            "tank-e-target": validation.is_positive_integer,
-            "tank-e-depletable": validation.is_boolean,
-            "tank-e-lossperminute": validation.is_natural_integer,
-            "tank-f-level": validation.is_natural_integer,
-            "tank-f-max": validation.is_positive_integer,
-            "tank-f-target": validation.is_positive_integer,
-            "tank-f-depletable": validation.is_boolean,
-            "tank-f-lossperminute": validation.is_natural_integer,
         }
 
         self.keys: set[str] = {"NUM_1", "NUM_2", "NUM_3", "NUM_4", "NUM_5", "NUM_6", "NUM_7", "NUM_8"}
@@ -108,14 +72,14 @@ class Resman(AbstractPlugin):
             ),
             pump=dict(
                 [
-                    ("1", dict(flow=800, state="off", key="NUM_1", _fromtank="c", _totank="a")),
-                    ("2", dict(flow=600, state="off", key="NUM_2", _fromtank="e", _totank="a")),
-                    ("3", dict(flow=800, state="off", key="NUM_3", _fromtank="d", _totank="b")),
-                    ("4", dict(flow=600, state="off", key="NUM_4", _fromtank="f", _totank="b")),
-                    ("5", dict(flow=600, state="off", key="NUM_5", _fromtank="e", _totank="c")),
-                    ("6", dict(flow=600, state="off", key="NUM_6", _fromtank="f", _totank="d")),
-                    ("7", dict(flow=400, state="off", key="NUM_7", _fromtank="a", _totank="b")),
-                    ("8", dict(flow=400, state="off", key="NUM_8", _fromtank="b", _totank="a")),
+                    ("1", dict(flow=800, state="off", key="NUM_1", fromtank="c", totank="a")),
+                    ("2", dict(flow=600, state="off", key="NUM_2", fromtank="e", totank="a")),
+                    ("3", dict(flow=800, state="off", key="NUM_3", fromtank="d", totank="b")),
+                    ("4", dict(flow=600, state="off", key="NUM_4", fromtank="f", totank="b")),
+                    ("5", dict(flow=600, state="off", key="NUM_5", fromtank="e", totank="c")),
+                    ("6", dict(flow=600, state="off", key="NUM_6", fromtank="f", totank="d")),
+                    ("7", dict(flow=400, state="off", key="NUM_7", fromtank="a", totank="b")),
+                    ("8", dict(flow=400, state="off", key="NUM_8", fromtank="b", totank="a")),
                 ]
             ),
         )
@@ -131,6 +95,70 @@ class Resman(AbstractPlugin):
                 tank["_response_time"] = 0
                 tank["_is_in_tolerance"] = None
                 tank["_tolerance_color"] = self.parameters["tolerancecolor"]
+        self.update_network_validation()
+
+    def update_network_validation(self) -> None:
+        """(Re)build the validation of the tanks and pumps parameters (the network can be extended)"""
+        tank_letters: list[str] = list(self.parameters["tank"].keys())
+        for letter in tank_letters:
+            self.validation_dict.update(
+                {
+                    f"tank-{letter}-level": validation.is_natural_integer,
+                    f"tank-{letter}-max": validation.is_positive_integer,
+                    f"tank-{letter}-target": validation.is_positive_integer,
+                    f"tank-{letter}-depletable": validation.is_boolean,
+                    f"tank-{letter}-lossperminute": validation.is_natural_integer,
+                }
+            )
+        for number in self.parameters["pump"]:
+            self.validation_dict.update(
+                {
+                    f"pump-{number}-flow": validation.is_positive_integer,
+                    f"pump-{number}-state": (validation.is_in_list, ["off", "on", "failure"]),
+                    f"pump-{number}-key": validation.is_keyboard_key,
+                    f"pump-{number}-fromtank": (validation.is_in_list, tank_letters),
+                    f"pump-{number}-totank": (validation.is_in_list, tank_letters),
+                }
+            )
+
+    def declare_parameters(self, events: list[Any]) -> list[str]:
+        """
+        Extend the network with the tanks and pumps the scenario mentions (e.g. tank-g-max, pump-9-fromtank),
+        with default values. A new tank is named by a single lowercase letter, a new pump by an integer.
+        """
+        errors: list[str] = list()
+        declared_pumps: dict[str, int] = dict()  # Pump name: line of its first mention
+        for kind in ("tank", "pump"):
+            for e in events:
+                address: list[str] = e.command[0].split("-") if len(e.command) == 2 else []
+                if len(address) != 3 or address[0] != kind or address[1] in self.parameters[kind]:
+                    continue
+                name: str = address[1]
+                if kind == "tank" and len(name) == 1 and name.isalpha() and name.islower():
+                    self.parameters["tank"][name] = dict(
+                        level=0,
+                        max=2000,
+                        target=None,
+                        depletable=True,
+                        lossperminute=0,
+                        _infoside="left",
+                        _response_time=0,
+                        _is_in_tolerance=None,
+                        _tolerance_color=self.parameters["tolerancecolor"],
+                    )
+                elif kind == "pump" and name.isdigit():
+                    self.parameters["pump"][name] = dict(flow=500, state="off", key=None, fromtank=None, totank=None)
+                    declared_pumps[name] = e.line
+                else:
+                    errors.append(_("Error on line %s. %s is not a valid %s name") % (e.line, name, kind))
+
+        # A new pump must be connected
+        for name, line in declared_pumps.items():
+            for end in ("fromtank", "totank"):
+                if not any(len(e.command) == 2 and e.command[0] == f"pump-{name}-{end}" for e in events):
+                    errors.append(_("Error on line %s. The pump %s must have a %s parameter") % (line, name, end))
+        self.update_network_validation()
+        return errors
 
     def show(self) -> None:
         super().show()
@@ -147,32 +175,46 @@ class Resman(AbstractPlugin):
     def get_response_timers(self) -> list[int]:
         return [t["_response_time"] for l, t in self.parameters["tank"].items() if t["target"] is not None]
 
+    def get_tank_layout(self) -> dict[str, tuple[float, float, str]]:
+        """Return the left coordinate and width (proportions of the task width), and the row of each tank"""
+        tanks: dict[str, dict[str, Any]] = self.parameters["tank"]
+        if set(tanks) <= set(DEFAULT_TANK_LAYOUT):
+            return {letter: DEFAULT_TANK_LAYOUT[letter] for letter in tanks}
+
+        # Other networks: target tanks in the upper row, the others in the lower row, evenly spaced
+        layout: dict[str, tuple[float, float, str]] = dict()
+        for row in ("upper", "lower"):
+            letters: list[str] = [k for k, t in tanks.items() if (t["target"] is not None) == (row == "upper")]
+            for i, letter in enumerate(letters):
+                slot: float = 1 / len(letters)
+                if row == "upper":
+                    w_prop: float = 0.15
+                else:
+                    w_prop = 0.1 if tanks[letter]["depletable"] else 0.12
+                w_prop = min(w_prop, 0.6 * slot)
+                l_prop: float = slot * (i + 0.5) - w_prop / 2
+                layout[letter] = (l_prop, w_prop, row)
+                tanks[letter]["_infoside"] = "left" if l_prop + w_prop / 2 < 0.5 else "right"
+        return layout
+
     def create_widgets(self) -> None:
         super().create_widgets()
 
         # Compute tank widgets container
         h: float = 0.35 * self.task_container.h  # Tank height
-        small: float
-        medium: float
-        large: float
-        small, medium, large = (x * self.task_container.w for x in [0.1, 0.12, 0.15])  # Tank widths
-        lower_y: float = self.task_container.b + 0.15 * self.task_container.h  # Bottom tank anchors
-        upper_y: float = self.task_container.b + 0.55 * self.task_container.h
-
-        # Tank left coordinates proportion
-        l_prop_dict: dict[str, float] = dict(a=0.14, b=0.64, c=0.05, d=0.55, e=0.3, f=0.8)
-        l_coord_dict: dict[str, float] = {
-            k: self.task_container.l + self.task_container.w * v for k, v in l_prop_dict.items()
-        }
-
-        tank_container_dict: dict[str, Container] = dict(
-            a=Container(name="tank_a", l=l_coord_dict["a"], b=upper_y, w=large, h=h),
-            b=Container(name="tank_b", l=l_coord_dict["b"], b=upper_y, w=large, h=h),
-            c=Container(name="tank_c", l=l_coord_dict["c"], b=lower_y, w=small, h=h),
-            d=Container(name="tank_d", l=l_coord_dict["d"], b=lower_y, w=small, h=h),
-            e=Container(name="tank_e", l=l_coord_dict["e"], b=lower_y, w=medium, h=h),
-            f=Container(name="tank_f", l=l_coord_dict["f"], b=lower_y, w=medium, h=h),
+        rows_y: dict[str, float] = dict(
+            lower=self.task_container.b + 0.15 * self.task_container.h,  # Bottom tank anchors
+            upper=self.task_container.b + 0.55 * self.task_container.h,
         )
+        tank_container_dict: dict[str, Container] = dict()
+        for letter, (l_prop, w_prop, row) in self.get_tank_layout().items():
+            tank_container_dict[letter] = Container(
+                name=f"tank_{letter}",
+                l=self.task_container.l + self.task_container.w * l_prop,
+                b=rows_y[row],
+                w=self.task_container.w * w_prop,
+                h=h,
+            )
 
         # The pump status are managed from Resman
         if self.parameters["displaystatus"] is True:
@@ -197,15 +239,15 @@ class Resman(AbstractPlugin):
                 color=C["WHITE"],
             )
 
-            # Add pump flows
-            for pump_number, this_pump in self.parameters["pump"].items():
-                pos: int = int(pump_number) - 1
+            # Add pump flows (closer when there are more than 8 pumps)
+            step: float = min(0.1, 0.8 / len(self.parameters["pump"]))
+            for pos, (pump_number, this_pump) in enumerate(self.parameters["pump"].items()):
                 flow_container: Container = Container(
                     f"pump_{pump_number}",
                     status_container.l,
-                    status_container.b + status_container.h * (0.8 - 0.1 * pos),
+                    status_container.b + status_container.h * (0.8 - step * pos),
                     status_container.w,
-                    status_container.h * 0.1,
+                    status_container.h * step,
                 )
 
                 this_pump["statuswidget"] = self.add_widget(
@@ -218,7 +260,7 @@ class Resman(AbstractPlugin):
 
         tanks: dict[str, dict[str, Any]] = self.parameters["tank"]
         for tank_letter, this_tank in tanks.items():
-            fluid_label: str = str(this_tank["level"]) if this_tank["depletable"] else ""
+            fluid_label: str = str(round(this_tank["level"])) if this_tank["depletable"] else ""
             this_tank["widget"] = self.add_widget(
                 f"tank_{tank_letter}",
                 Tank,
@@ -232,10 +274,16 @@ class Resman(AbstractPlugin):
                 infoside=this_tank["_infoside"],
             )
 
+        # Pumps joining the same two tanks are drawn one above the other (all but the last one are raised)
+        joining_pumps: dict[frozenset[str], list[str]] = dict()
         for pump_number, this_pump in self.parameters["pump"].items():
-            from_cont: Container = tanks[this_pump["_fromtank"]]["widget"].container
-            to_cont: Container = tanks[this_pump["_totank"]]["widget"].container
-            y_offset: float = 0.055 * self.task_container.h if pump_number == "7" else 0  # Raise the 7th pump
+            joining_pumps.setdefault(frozenset((this_pump["fromtank"], this_pump["totank"])), []).append(pump_number)
+
+        for pump_number, this_pump in self.parameters["pump"].items():
+            from_cont: Container = tanks[this_pump["fromtank"]]["widget"].container
+            to_cont: Container = tanks[this_pump["totank"]]["widget"].container
+            same_tanks: list[str] = joining_pumps[frozenset((this_pump["fromtank"], this_pump["totank"]))]
+            y_offset: float = 0.055 * self.task_container.h * (len(same_tanks) - 1 - same_tanks.index(pump_number))
             pump_width: float = 0.028 * self.task_container.w
 
             # Pump is not specified by a container (None), but by two containers (from-to)
@@ -251,30 +299,98 @@ class Resman(AbstractPlugin):
                 y_offset=y_offset,
             )
 
+    def compile_fluid_network(self) -> FluidNetwork:
+        self.tank_letters = tuple(self.parameters["tank"])
+        self.pump_numbers = tuple(self.parameters["pump"])
+        pumps: list[dict[str, Any]] = [self.parameters["pump"][n] for n in self.pump_numbers]
+        return FluidNetwork(
+            len(self.tank_letters),
+            [self.tank_letters.index(p["fromtank"]) for p in pumps],
+            [self.tank_letters.index(p["totank"]) for p in pumps],
+        )
+
+    def load_fluid_state(self) -> None:
+        """Copy the tanks and pumps parameters (which scenario events can change) into the fluid network"""
+        if self.fluid is None:
+            self.fluid = self.compile_fluid_network()
+        fluid: FluidNetwork = self.fluid
+        for t, letter in enumerate(self.tank_letters):
+            tank: dict[str, Any] = self.parameters["tank"][letter]
+            fluid.levels[t] = tank["level"]
+            fluid.capacities[t] = tank["max"]
+            fluid.depletable[t] = tank["depletable"]
+            fluid.losses[t] = tank["lossperminute"] / 60 if tank["target"] is not None else 0.0  # Target tanks leak
+        for p, number in enumerate(self.pump_numbers):
+            pump: dict[str, Any] = self.parameters["pump"][number]
+            fluid.flows[p] = int(pump["flow"]) / 60
+            fluid.running[p] = pump["state"] == "on"
+
+    def save_fluid_state(self, stopped_pumps: list[int]) -> None:
+        for t, letter in enumerate(self.tank_letters):
+            self.parameters["tank"][letter]["level"] = self.fluid.levels[t]
+        for p in stopped_pumps:
+            self.parameters["pump"][self.pump_numbers[p]]["state"] = "off"
+
+    def integrate_fluid(self, scenario_time: float) -> None:
+        """Bring the tanks levels up to scenario_time, with the pumps states of the elapsed period"""
+        if self.fluid_time is None:
+            self.fluid_time = scenario_time
+        if scenario_time > self.fluid_time and self.wait_before_leak == 0 and not self.is_paused():
+            self.load_fluid_state()
+            self.save_fluid_state(self.fluid.advance(scenario_time - self.fluid_time))
+        self.fluid_time = max(self.fluid_time, scenario_time)
+
+    def stop_bounded_pumps(self) -> None:
+        # Running pumps filling a full tank, or draining an empty one, are switched off
+        self.load_fluid_state()
+        self.save_fluid_state(self.fluid.stop_bounded_pumps())
+
+    def start(self) -> None:
+        # The topology is set by the scenario before the plugin starts: compile it once
+        self.fluid = self.compile_fluid_network()
+        super().start()
+
+    def resume(self) -> None:
+        super().resume()
+        self.fluid_time = self.scenario_time  # Nothing flows while paused
+
+    def set_parameter(self, keys_str: str, value: Any) -> dict[str, Any]:
+        # The elapsed period flowed with the former parameters
+        self.integrate_fluid(self.scenario_time)
+        dic: dict[str, Any] = super().set_parameter(keys_str, value)
+        if keys_str.endswith("tank") and keys_str.startswith("pump"):  # A pump is connected elsewhere
+            self.fluid = None
+        return dic
+
     def compute_next_plugin_state(self) -> None:
         if not super().compute_next_plugin_state():
             return
 
         tanks: dict[str, dict[str, Any]] = self.parameters["tank"]
         pumps: dict[str, dict[str, Any]] = self.parameters["pump"]
-        time_resolution: float = (self.parameters["taskupdatetime"] / 1000) / 60.0
-
-        # 0. Compute automatic actions if heuristicsolver activated, three heuristics
-        # Browse only woorking pumps (state != -1)
 
         if self.wait_before_leak > 0:
             self.wait_before_leak -= 1
+            self.fluid_time = self.scenario_time
         else:
+            # 1. Deplete target tanks and transfer the flows of the running pumps (exactly, since the last
+            # integration), switching off the pumps of the tanks that became full or empty meanwhile
+            self.integrate_fluid(self.scenario_time)
+
+            # 2. Compute automatic actions if heuristicsolver activated, three heuristics
+            # Browse only working pumps
             if self.parameters["automaticsolver"] is True:
-                for _pump_n, this_pump in {p: v for p, v in pumps.items() if v["state"] != "failure"}.items():
-                    from_tank: dict[str, Any] = tanks[this_pump["_fromtank"]]
-                    to_tank: dict[str, Any] = tanks[this_pump["_totank"]]
+                for this_pump in pumps.values():
+                    if this_pump["state"] == "failure":
+                        continue
+                    from_tank: dict[str, Any] = tanks[this_pump["fromtank"]]
+                    to_tank: dict[str, Any] = tanks[this_pump["totank"]]
 
-                    # 0.1. Systematically activate pumps draining non-depletable tanks
+                    # 2.1. Systematically activate pumps draining non-depletable tanks
                     if not from_tank["depletable"] and this_pump["state"] == "off":
                         this_pump["state"] = "on"
 
-                    # 0.2. Activate/deactivate pump whose target tank is too low/high
+                    # 2.2. Activate/deactivate pump whose target tank is too low/high
                     # "Too" means level is out of a tolerance zone around the target level (2500 +/- 150)
                     if to_tank["target"] is not None:
                         if to_tank["level"] <= to_tank["target"] - 50:
@@ -282,47 +398,18 @@ class Resman(AbstractPlugin):
                         elif to_tank["level"] >= to_tank["target"] + 50:
                             this_pump["state"] = "off"
 
-                    # 0.3. Equilibrate between the two A/B tanks if sufficient level
+                    # 2.3. Equilibrate between the two A/B tanks if sufficient level
                     if from_tank["target"] is not None and to_tank["target"] is not None:
                         if from_tank["level"] >= to_tank["target"] >= to_tank["level"]:
                             this_pump["state"] = "on"
                         else:
                             this_pump["state"] = "off"
 
-            for _, this_tank in tanks.items():  # 1. Deplete target tanks
-                if this_tank["target"] is not None:
-                    this_tank["level"] -= min(int(this_tank["lossperminute"] * time_resolution), this_tank["level"])
-
-            for _pump_n, this_pump in pumps.items():  # 2. For each pump
-                if this_pump["state"] == "on":  # 2.a Transfer flow if pump is ON
-                    fromtank: dict[str, Any] = tanks[this_pump["_fromtank"]]
-                    totank: dict[str, Any] = tanks[this_pump["_totank"]]
-
-                    # Compute (available) volume
-                    volume: float = min(int(this_pump["flow"]) * time_resolution, fromtank["level"])
-
-                    if fromtank["depletable"]:  # Drain it from tank (if its capacity is limited)...
-                        fromtank["level"] -= int(volume)
-
-                        # ...to tank (if it's not full)
-                    totank["level"] += min(int(volume), totank["max"] - totank["level"])
-
         # The following is always executed (independent on wait_before_leak)
-        for tank_l, this_tank in tanks.items():  # 3. For each tank
-            pumps_to_deactivate: list[dict[str, Any]] = []
-
-            if this_tank["level"] >= this_tank["max"]:  # If it is full, select incoming pumps for deactivation
-                pumps_to_deactivate.extend([v for p, v in pumps.items() if v["_totank"] == tank_l])
+        self.stop_bounded_pumps()  # 3. Also applies to the pumps activated meanwhile
 
-            elif this_tank["level"] <= 0:  # Likewise, if it is empty, select outcome
-                # pumps for deactivation
-                pumps_to_deactivate.extend([v for p, v in pumps.items() if v["_fromtank"] == tank_l])
-
-            for this_pump in pumps_to_deactivate:  # Deactivate selected pumps if not on failure
-                if this_pump["state"] != "failure":
-                    this_pump["state"] = "off"
-
-            if this_tank["target"] is not None:  # Record performance for target tanks
+        for tank_l, this_tank in tanks.items():  # 4. Record performance for target tanks
+            if this_tank["target"] is not None:
                 t: int = this_tank["target"]
                 r: int = self.parameters["toleranceradius"]
                 this_tank["_is_in_tolerance"] = float("nan")
@@ -337,11 +424,13 @@ class Resman(AbstractPlugin):
                         this_tank["_response_time"] = 0
                     this_tank["_tolerance_color"] = tolerance_color
 
-                deviation: int = this_tank["level"] - this_tank["target"]
+                deviation: float = this_tank["level"] - this_tank["target"]
                 self.log_performance(f"{tank_l}_in_tolerance", this_tank["_is_in_tolerance"])
                 self.log_performance(f"{tank_l}_deviation", deviation)
 
     def refresh_widgets(self) -> None:
+        # Levels are integrated up to the frame time, so that they are displayed continuously
+        self.integrate_fluid(self.scenario_time)
         if not super().refresh_widgets():
             return
         tanks: dict[str, dict[str, Any]] = self.parameters["tank"]
@@ -356,8 +445,9 @@ class Resman(AbstractPlugin):
                 this_pump["statuswidget"].set_flow(str(0))
 
         for _tank_letter, this_tank in tanks.items():
-            this_tank["widget"].set_fluid_level(this_tank["level"], this_tank["max"])
-            fluid_label: str = str(this_tank["level"]) if this_tank["depletable"] else ""
+            level: int = round(this_tank["level"])  # Displayed (and logged) by units
+            this_tank["widget"].set_fluid_level(level, this_tank["max"])
+            fluid_label: str = str(level) if this_tank["depletable"] else ""
             this_tank["widget"].set_fluid_label(fluid_label)
 
             # Apply modification that are specific to target tanks
@@ -385,4 +475,5 @@ class Resman(AbstractPlugin):
             if pump_key is None:
                 return
             if pump_key["state"] != "failure":
+                self.integrate_fluid(self.scenario_time)
                 pump_key["state"] = "on" if pump_key["state"] == "off" else "off"
@@ -10,7 +10,7 @@ from typing import Any, Callable
 from core import validation
 from core.constants import COLORS as C
 from core.container import Container
-from core.widgets import Schedule, Simpletext, Timeline
+from core.widgets import Chronometer, Schedule, Timeline
 from plugins.abstractplugin import AbstractPlugin
 
 
@@ -62,7 +62,7 @@ class Scheduling(AbstractPlugin):
             "timeline", Timeline, container=timeline_container, max_time_minute=self.parameters["minduration"]
         )
 
-        self.add_widget("elapsed_time", Simpletext, container=self.task_container, text=self.get_chrono_str(), y=0.05)
+        self.add_widget("elapsed_time", Chronometer, container=self.task_container, text=self.get_chrono_str(), y=0.05)
 
         for p, name in enumerate(self.planning.keys()):
             planning_container: Container = Container(
@@ -0,0 +1,152 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+from __future__ import annotations
+
+from math import ceil
+from time import perf_counter
+from typing import Any, Callable
+
+from core import validation
+from core.clock import MAX_STEPS_PER_FRAME
+from core.constants import REPLAY_MODE
+from core.error import get_errors
+from core.signalexport import FileSink, LslSink, SharedMemorySink, SignalRingBuffer
+from plugins.abstractplugin import AbstractPlugin
+
+try:
+    import pylsl
+except (ImportError, RuntimeError):
+    pylsl = None
+
+NAN: float = float("nan")
+TANK_LETTERS: str = "abcdef"
+
+# Longest frame whose steps are all sampled: beyond, the oldest steps are dropped (and logged)
+MAX_FRAME_DURATION: float = 0.5
+
+
+class Signalexport(AbstractPlugin):
+    """
+    Sample the tracking cursor, the resman tank levels and the joystick axes at a fixed rate
+    (1000 / taskupdatetime Hz), and publish them by chunks to a sink (file, lsl or sharedmemory).
+
+    The steps are run at each frame, and sample the state of that frame: a rate above the
+    frame rate repeats values, with their own timestamps. The steps of a frame longer than
+    MAX_FRAME_DURATION are partly dropped, which is logged.
+    """
+
+    def __init__(self, label: str = "", taskplacement: str = "invisible", taskupdatetime: int = 10) -> None:
+        super().__init__(_("Signal export"), taskplacement, taskupdatetime)
+
+        self.validation_dict: dict[str, Callable[..., Any]] = {
+            "chunksize": validation.is_positive_integer,
+            "sink": (validation.is_in_list, ["file", "lsl", "sharedmemory"]),
+        }
+
+        self.parameters.update({"chunksize": 25, "sink": "file"})
+
+        self.plugins: dict[str, Any] = dict()
+        self.channels: list[str] = list()
+        self.sources: tuple[Callable[[], float], ...] = tuple()
+        self.buffer: SignalRingBuffer | None = None
+        self.sink: Any = None
+
+        # Clock of the frame being run, to timestamp its (fixed) steps
+        self.frame_logtime: float = 0
+        self.frame_scenario_time: float = 0
+
+    def on_scenario_loaded(self, scenario: Any) -> None:
+        self.plugins = scenario.plugins
+
+    def get_sources(self) -> dict[str, Callable[[], float]]:
+        """Return the {channel: getter} of the exported signals. A plugin not in use is exported as NaN"""
+        sources: dict[str, Callable[[], float]] = dict()
+
+        track: Any = self.plugins.get("track")
+        if track is not None:
+            sources["track_cursor_x"] = lambda: track.cursor_position[0] if track.alive else NAN
+            sources["track_cursor_y"] = lambda: track.cursor_position[1] if track.alive else NAN
+            sources["track_deviation"] = lambda: track.reticle.return_deviation() if track.alive else NAN
+        else:
+            sources.update({name: lambda: NAN for name in ("track_cursor_x", "track_cursor_y", "track_deviation")})
+
+        # The tanks of the scenario network (the default ones when resman is not in use)
+        resman: Any = self.plugins.get("resman")
+        if resman is not None:
+            for letter, tank in resman.parameters["tank"].items():
+                sources[f"resman_tank_{letter}"] = lambda tank=tank: tank["level"]
+        else:
+            sources.update({f"resman_tank_{letter}": lambda: NAN for letter in TANK_LETTERS})
+
+        joystick: Any = getattr(self, "joystick", None)
+        sources["joystick_x"] = (lambda: joystick.x) if joystick is not None else (lambda: NAN)
+        sources["joystick_y"] = (lambda: joystick.y) if joystick is not None else (lambda: NAN)
+        return sources
+
+    def create_sink(self) -> Any:
+        if self.parameters["sink"] == "lsl":
+            if pylsl is None:
+                get_errors().add_error(_("The signals could not be exported (pylsl is not available)"))
+                return None
+            return LslSink(pylsl)
+        elif self.parameters["sink"] == "sharedmemory":
+            return SharedMemorySink()
+        path: Any = self.logger.path
+        return FileSink(path.with_name(f"{path.stem}_signals.csv"))
+
+    def start(self) -> None:
+        super().start()
+        sources: dict[str, Callable[[], float]] = self.get_sources()
+        self.channels = list(sources.keys())
+        self.sources = tuple(sources.values())
+        self.buffer = SignalRingBuffer(len(self.channels), self.parameters["chunksize"])
+
+        # Catch up all the steps of a slow frame, whatever the rate
+        rate: float = 1000 / self.parameters["taskupdatetime"]
+        self.max_steps_per_frame = max(MAX_STEPS_PER_FRAME, ceil(MAX_FRAME_DURATION * rate))
+
+        # A replayed session has no session file to write next to
+        if not REPLAY_MODE:
+            self.sink = self.create_sink()
+            if self.sink is not None:
+                try:
+                    self.sink.open(self.channels, rate)
+                except FileExistsError as error:
+                    get_errors().add_error(_("The signals could not be exported (%s)") % error)
+                    self.sink = None
+
+    def update(self, scenario_time: float, refresh: bool = True) -> None:
+        self.frame_logtime = perf_counter()
+        self.frame_scenario_time = scenario_time
+        dropped_steps: int = self.dropped_steps
+        super().update(scenario_time, refresh)
+        if self.dropped_steps > dropped_steps:
+            self.logger.log_manual_entry(str(self.dropped_steps - dropped_steps), key="signalexport_dropped_samples")
+
+    def compute_next_plugin_state(self) -> None:
+        if not super().compute_next_plugin_state() or self.sink is None:
+            return
+
+        # The step time is mapped to the clock of the frame that runs it (late steps are caught up)
+        logtime: float = self.frame_logtime - (self.frame_scenario_time - self.scenario_time)
+        data: Any = self.buffer.data
+        offset: int = self.buffer.start_sample(logtime, self.scenario_time)
+        for source in self.sources:
+            data[offset] = source()
+            offset += 1
+
+        if self.buffer.is_chunk_full():
+            self.publish()
+
+    def publish(self) -> None:
+        if self.sink is not None and self.buffer is not None and self.buffer.pending > 0:
+            self.sink.write(*self.buffer.pop_chunk())
+
+    def stop(self) -> None:
+        super().stop()
+        self.publish()
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
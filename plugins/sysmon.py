@@ -4,17 +4,28 @@
 
 from __future__ import annotations
 
+from array import array
+from math import ceil
 from typing import Any, Callable
 
 from core import validation
 from core.constants import COLORS as C
 from core.container import Container
-from core.pseudorandom import choice, sample
+from core.pseudorandom import choice, record_draw, sample, sample_indices
 from core.widgets import Light, Scale
 from plugins.abstractplugin import AbstractPlugin
 
+MOTION_DIRECTIONS: tuple[int, int] = (-1, 1)
+
 
 class Sysmon(AbstractPlugin):
+    # Arrows directions precomputed for a scenario second (one per moving seed, from motion_first_seed).
+    # The draw keys include the scenario second, which pauses shift: the walk cannot be drawn at start.
+    motion_second: int | None = None
+    motion_first_seed: int = 0
+    motion_seeds: array = array("Q")
+    motion_indices: array = array("B")
+
     def __init__(self, label: str = "", taskplacement: str = "topleft", taskupdatetime: int = 200) -> None:
         super().__init__(_("System monitoring"), taskplacement, taskupdatetime)
 
@@ -92,6 +103,7 @@ class Sysmon(AbstractPlugin):
         # to any gauge
         for gauge in self.get_all_gauges():
             gauge.update({"_failuretimer": None, "_onfailure": False, "_milliresponsetime": 0, "_freezetimer": None})
+            gauge.update({"_onsetrequested": False, "_onsettime": None})
 
         # and to scale only
         for gauge in self.get_scale_gauges():
@@ -179,7 +191,7 @@ class Sysmon(AbstractPlugin):
                     self.scale_zones[scale["_zone"]], self.alias, self.scenario_time, self.moving_seed
                 )
             else:  # Move into a delimited zone
-                direction: int = sample([-1, 1], self.alias, self.scenario_time, self.moving_seed)
+                direction: int = self.get_motion_direction()
                 if scale["_pos"] + direction in self.scale_zones[scale["_zone"]]:
                     scale["_pos"] += direction
                 else:
@@ -198,6 +210,34 @@ class Sysmon(AbstractPlugin):
         for gauge in self.get_gauges_key_value("failure", True):
             self.start_failure(gauge)
 
+    def precompute_motion(self) -> None:
+        # Directions only depend on the session, the scenario second and the moving seed: draw at once
+        # those of the second, for every update and scale (a late or faster update recomputes the table).
+        # Each direction used is still recorded, as replay checks the draws
+        count: int = (ceil(1000 / self.parameters["taskupdatetime"]) + 1) * len(self.parameters["scales"])
+        self.motion_second = int(self.scenario_time)
+        self.motion_first_seed = self.moving_seed
+        self.motion_seeds, self.motion_indices = sample_indices(
+            self.alias, self.motion_second, self.moving_seed, count, len(MOTION_DIRECTIONS)
+        )
+
+    def get_motion_direction(self) -> int:
+        """Return the direction sample(MOTION_DIRECTIONS, ...) would draw for the current moving seed"""
+        offset: int = self.moving_seed - self.motion_first_seed
+        if int(self.scenario_time) != self.motion_second or not 0 <= offset < len(self.motion_indices):
+            self.precompute_motion()
+            offset = 0
+        direction: int = MOTION_DIRECTIONS[self.motion_indices[offset]]
+        record_draw(
+            self.alias,
+            self.motion_seeds[offset],
+            direction,
+            ("sample", MOTION_DIRECTIONS),
+            self.scenario_time,
+            self.moving_seed,
+        )
+        return direction
+
     def refresh_widgets(self) -> None:
         if not super().refresh_widgets():
             return
@@ -217,6 +257,13 @@ class Sysmon(AbstractPlugin):
         for _light_n, light in self.parameters["lights"].items():
             light["widget"].set_color(self.determine_light_color(light))
 
+        # A failure onset is the flip that displays it (a scale failure, once its arrow is in the failure zone)
+        for gauge in self.get_gauges_on_failure():
+            displayed: bool = "default" in gauge or gauge["_pos"] in self.scale_zones[gauge["_zone"]]
+            if displayed and not gauge["_onsetrequested"]:
+                gauge["_onsetrequested"] = True
+                self.call_on_next_flip(lambda flip_time, gauge=gauge: gauge.update(_onsettime=flip_time))
+
         for gauge in self.get_all_gauges():
             gauge["widget"].set_label(gauge["name"])
 
@@ -247,7 +294,7 @@ class Sysmon(AbstractPlugin):
         )
         gauge["_failuretimer"] = delay
 
-    def stop_failure(self, gauge: dict[str, Any], success: bool = False) -> None:
+    def stop_failure(self, gauge: dict[str, Any], success: bool = False, input_time: float = float("nan")) -> None:
         # Reset the gauge failure timer
         gauge["_onfailure"] = False
         gauge["_failuretimer"] = None
@@ -278,6 +325,7 @@ class Sysmon(AbstractPlugin):
         self.log_performance("name", gauge["name"])
         self.log_performance("signal_detection", sdt_string)
         self.log_performance("response_time", rt)
+        self.log_input_response_time(gauge["_onsettime"] if success else None, input_time)
 
         # Reset gauge to its nominal (default) state
         if "default" in gauge:  # Light case
@@ -285,6 +333,7 @@ class Sysmon(AbstractPlugin):
         else:  # Scale case
             gauge["_zone"] = 0
         gauge["_milliresponsetime"] = 0
+        gauge.update({"_onsetrequested": False, "_onsettime": None})
 
     def get_gauges_key_value(self, key: str, value: Any) -> list[dict[str, Any]]:
         gauge_list: list[dict[str, Any]] = list()
@@ -328,7 +377,7 @@ class Sysmon(AbstractPlugin):
         if state == "press":
             gauge: dict[str, Any] = self.get_gauge_by_key(key)
             if key in [g["key"] for g in self.get_gauges_on_failure()]:
-                self.stop_failure(gauge=gauge, success=True)
+                self.stop_failure(gauge=gauge, success=True, input_time=self.get_input_time(key))
             else:
                 self.log_performance("name", gauge["name"])
                 self.log_performance("signal_detection", "FA")
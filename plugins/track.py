@@ -6,7 +6,7 @@ from __future__ import annotations
 
 from collections.abc import Generator
 from math import pi, sin
-from typing import Any, Callable
+from typing import Any, Callable, ClassVar
 
 from core import validation
 from core.constants import COLORS as C
@@ -17,6 +17,10 @@ from plugins.abstractplugin import AbstractPlugin
 
 
 class Track(AbstractPlugin):
+    geometry: ClassVar[dict[str, str]] = {"xgain": "x", "ygain": "y", "cursor_position": "xy"}
+    # Flip time (perf_counter) of the frame that displayed the cursor leaving the target
+    response_onset_time: float | None = None
+
     def __init__(
         self, label: str = "", taskplacement: str = "topmid", taskupdatetime: int = 20, silent: bool = False
     ) -> None:
@@ -96,12 +100,23 @@ class Track(AbstractPlugin):
         self.log_performance("center_deviation", self.reticle.return_deviation())
 
         if not self.reticle.is_cursor_in_target():  # A response is needed
+            if self.response_time == 0:
+                self.response_onset_time = None
+                self.call_on_next_flip(lambda flip_time: setattr(self, "response_onset_time", flip_time))
             self.response_time += self.parameters["taskupdatetime"]
         else:
             if self.response_time > 0:  # The cursor drift has been recovered
                 self.log_performance("response_time", self.response_time)
+                self.log_input_response_time(self.response_onset_time, self.get_recovery_input_time())
                 self.response_time = 0
 
+    def get_recovery_input_time(self) -> float:
+        # The drift is recovered by the joystick inputs polled in this frame (none with the automatic solver)
+        joystick: Any = getattr(self, "joystick", None)
+        if joystick is None or self.parameters["automaticsolver"]:
+            return float("nan")
+        return joystick.poll_time
+
     def refresh_widgets(self) -> None:
         if not super().refresh_widgets():
             return
@@ -0,0 +1,213 @@
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""Offline analysis of session files — no Window/plugin initialization at module level.
+
+This module computes the performance metrics of each task, per block, from the performance rows
+logged by the plugins (see AbstractPlugin.log_performance), for one session or a whole batch of
+sessions. It is imported by the CLI (session_analyzer.py).
+
+A session is streamed segment by segment (see core.sessionfile), and only its performance rows
+and the start events of the blocking plugins are kept, in columns: {(task, metric): (scenario
+times, values)}. A block is a period between two blocking plugins (instructions, questionnaires)
+that holds performance rows: blocks are numbered from 1, "all" being the whole session. As the
+scenario times are sorted, a block is a slice of each column (found by bisection), and metrics
+are computed over whole slices.
+
+The sessions are analysed in parallel by a pool of processes, and gathered in a tidy table: a row
+per session, block, task and metric (see SUMMARY_FIELDS).
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from math import fsum, inf, nan, sqrt
+from pathlib import Path
+from random import Random
+from statistics import fmean, median
+from typing import Any
+
+from core.catalog import SESSION_NAME
+from core.sessionfile import SESSION_FIELDS, get_session_segments, open_segment
+
+BLOCKING_PLUGINS: list[str] = ["instructions", "genericscales"]
+SUMMARY_FIELDS: list[str] = ["session", "block", "task", "metric", "value", "n"]
+
+# Metrics whose values are categories (signal detection outcomes), counted
+CATEGORICAL_METRICS: list[str] = ["signal_detection", "sdt_value"]
+
+# Metrics whose values are booleans, summarized by the proportion of true values
+RATIO_SUFFIXES: tuple[str, ...] = ("in_tolerance", "in_target", "correct_radio")
+
+# Booleans logged before they were written as 1/0
+BOOLEANS: dict[str, float] = {"True": 1.0, "False": 0.0}
+
+Column = tuple[list[float], list[str]]
+
+
+def read_performance(session_path: Path) -> tuple[list[float], dict[tuple[str, str], Column]]:
+    """Return the start times of the blocking plugins, and the performance columns of a session"""
+    starts: list[float] = list()
+    columns: dict[tuple[str, str], Column] = dict()
+    for segment in get_session_segments(Path(session_path)):
+        # Most rows are states and inputs: the lines are filtered before being parsed
+        with open_segment(segment) as segment_file:
+            lines: list[str] = [line for line in segment_file if ",performance," in line or ",event," in line]
+        for row in csv.reader(lines):
+            if len(row) < 6:  # Last row truncated by a crash
+                continue
+            if row[2] == "performance":
+                column: Column | None = columns.get((row[3], row[4]))
+                if column is None:
+                    column = columns[(row[3], row[4])] = (list(), list())
+                column[0].append(float(row[1]))
+                column[1].append(row[5])
+            elif row[2] == "event" and row[3] in BLOCKING_PLUGINS and row[4] == "self" and row[5] == "start":
+                starts.append(float(row[1]))
+    return starts, columns
+
+
+def get_blocks(starts: list[float], columns: dict[tuple[str, str], Column]) -> list[tuple[float, float]]:
+    """Return the (begin, end) scenario times of the periods between blocking plugins that hold performance rows"""
+    bounds: list[float] = [-inf] + sorted(starts) + [inf]
+    blocks: list[tuple[float, float]] = list()
+    for begin, end in zip(bounds, bounds[1:]):
+        if any(bisect_left(times, begin) < bisect_left(times, end) for times, values in columns.values()):
+            blocks.append((begin, end))
+    return blocks
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return BOOLEANS.get(value, nan)
+
+
+def to_floats(values: list[str]) -> list[float]:
+    """Convert a column of logged values, the empty or non numeric ones being nan"""
+    try:
+        return list(map(float, values))
+    except ValueError:
+        return list(map(_to_float, values))
+
+
+def compute_metrics(metric: str, values: list[str]) -> list[tuple[str, float, int]]:
+    """Return the (name, value, count) summaries of a performance column, according to its metric"""
+    if metric in CATEGORICAL_METRICS:
+        counts: Counter[str] = Counter(values)
+        summaries: list[tuple[str, float, int]] = [
+            (f"{metric}_{category.lower()}", counts[category], len(values)) for category in sorted(counts)
+        ]
+        responses: int = len(values) - counts["FA"]  # Outcomes of the signals (false alarms being outside)
+        if responses > 0:
+            summaries.append((f"{metric}_accuracy", counts["HIT"] / responses, responses))
+        return summaries
+
+    # Response times are nan for misses and false alarms, tolerance is nan without tolerance radius...
+    valid: list[float] = [v for v in to_floats(values) if v == v]
+    n: int = len(valid)
+    if n == 0:
+        return []
+    if metric.endswith("response_time"):
+        return [(f"{metric}_mean", fmean(valid), n), (f"{metric}_median", median(valid), n)]
+    if metric.endswith("deviation"):
+        return [
+            (f"{metric}_mean_abs", fsum(map(abs, valid)) / n, n),
+            (f"{metric}_rmse", sqrt(fsum(v * v for v in valid) / n), n),
+        ]
+    if metric.endswith(RATIO_SUFFIXES):
+        return [(f"{metric}_ratio", fsum(valid) / n, n)]
+    return []  # Descriptive metrics (gauge or radio names, onset times...)
+
+
+def analyze_session(session_path: Path) -> list[dict[str, Any]]:
+    """Return the summary rows of a session: the whole session ("all"), then each block"""
+    session_path = Path(session_path)
+    starts, columns = read_performance(session_path)
+    blocks: list[tuple[str, float, float]] = [("all", -inf, inf)]
+    blocks.extend((str(number), begin, end) for number, (begin, end) in enumerate(get_blocks(starts, columns), 1))
+
+    rows: list[dict[str, Any]] = list()
+    for block, begin, end in blocks:
+        for (task, metric), (times, values) in sorted(columns.items()):
+            first, last = bisect_left(times, begin), bisect_left(times, end)
+            if first == last:
+                continue
+            for name, value, n in compute_metrics(metric, values[first:last]):
+                rows.append(dict(session=session_path.stem, block=block, task=task, metric=name, value=value, n=n))
+    return rows
+
+
+def analyze_sessions(session_paths: list[Path], workers: int | None = None) -> list[dict[str, Any]]:
+    """Return the summary rows of sessions, analysed by a pool of processes (by default, one per CPU)"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(session_paths) < 2:
+        return [row for session_path in session_paths for row in analyze_session(session_path)]
+
+    # Sessions are sent by chunks (a few per worker) to limit the exchanges between processes
+    chunksize: int = max(1, len(session_paths) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results: Iterable[list[dict[str, Any]]] = executor.map(analyze_session, session_paths, chunksize=chunksize)
+        return [row for rows in results for row in rows]
+
+
+def find_sessions(paths: list[Path]) -> list[Path]:
+    """Return the given session files, and the session files found in the given directories (by id)"""
+    sessions: list[Path] = list()
+    for path in map(Path, paths):
+        if path.is_dir():
+            found: list[Path] = [p for p in path.rglob("*.csv") if SESSION_NAME.match(p.name)]
+            sessions.extend(sorted(found, key=lambda p: int(p.name.split("_")[0])))
+        else:
+            sessions.append(path)
+    return sessions
+
+
+def write_summary(rows: list[dict[str, Any]], summary_path: Path) -> None:
+    with open(str(summary_path), "w", newline="") as summary_file:
+        writer: csv.DictWriter = csv.DictWriter(summary_file, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict(row, value=round(row["value"], 6)))
+
+
+def write_synthetic_session(session_path: Path, duration: int = 300, blocks: int = 2, seed: int = 0) -> None:
+    """Write a session with the rows rates of the default tasks (to test and benchmark the analysis)"""
+    rand: Random = Random(seed)
+    with open(str(session_path), "w", newline="") as session_file:
+        writer = csv.writer(session_file)
+        writer.writerow(SESSION_FIELDS)
+        block_steps: int = duration * 50 // blocks
+        for step in range(duration * 50):  # The tracking task is updated at 50 Hz
+            time: float = round(step / 50, 2)
+            row_time: float = round(1000 + time * 1.001, 6)
+            if step % block_steps == 0:
+                writer.writerow([row_time, time, "event", "instructions", "self", "start"])
+            deviation: float = round(rand.gauss(0, 20), 6)
+            writer.writerow([row_time, time, "state", "track_cursor", "position", f"({deviation}, 0.0)"])
+            writer.writerow([row_time, time, "performance", "track", "cursor_in_target", int(abs(deviation) < 30)])
+            writer.writerow([row_time, time, "performance", "track", "center_deviation", abs(deviation)])
+            if step % 100 == 0:  # Resources management, every 2 s
+                for tank in ("a", "b"):
+                    tank_deviation: float = rand.gauss(0, 300)
+                    in_tolerance: int = int(abs(tank_deviation) < 150)
+                    writer.writerow([row_time, time, "performance", "resman", f"{tank}_in_tolerance", in_tolerance])
+                    writer.writerow([row_time, time, "performance", "resman", f"{tank}_deviation", tank_deviation])
+            if step % 500 == 250:  # A system monitoring failure, every 10 s
+                outcome: str = rand.choice(["HIT", "HIT", "HIT", "MISS", "FA"])
+                response_time: float = round(rand.uniform(500, 3000)) if outcome == "HIT" else nan
+                writer.writerow([row_time, time, "performance", "sysmon", "name", "F1"])
+                writer.writerow([row_time, time, "performance", "sysmon", "signal_detection", outcome])
+                writer.writerow([row_time, time, "performance", "sysmon", "response_time", response_time])
+            if step % 1500 == 750:  # A communication, every 30 s
+                outcome = rand.choice(["HIT", "HIT", "MISS", "BAD_FREQ"])
+                response_time = round(rand.uniform(2000, 8000)) if outcome != "MISS" else nan
+                writer.writerow([row_time, time, "performance", "communications", "sdt_value", outcome])
+                writer.writerow([row_time, time, "performance", "communications", "response_time", response_time])
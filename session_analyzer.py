@@ -0,0 +1,74 @@
+#! .venv/bin/python3.9
+# Copyright 2023-2026, by Julien Cegarra & Benoît Valéry. All rights reserved.
+# Institut National Universitaire Champollion (Albi, France).
+# License : CeCILL, version 2.1 (see the LICENSE file)
+
+"""Summarize the tasks performance of sessions (see session_analysis.py).
+
+    python session_analyzer.py [sessions or directories] [-o summary.csv] [-j workers]
+    python session_analyzer.py --benchmark 500
+
+Without sessions, all the sessions of the sessions directory are analysed.
+"""
+
+from __future__ import annotations
+
+import gettext
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+# Read and install the specified language iso
+# The LOCALE_PATH constant can't be set into constants.py because
+# the latter must be translated itself
+LOCALE_PATH: Path = Path(".", "locales")
+
+# Only language is accessed manually from the config.ini to avoid circular imports
+with open("config.ini", "r") as f:
+    language_iso: str = [l for l in f.readlines() if "language=" in l][0].split("=")[-1].strip()
+language: gettext.GNUTranslations = gettext.translation("openmatb", LOCALE_PATH, [language_iso])
+language.install()
+
+
+# Imports #
+from core.catalog import get_catalog
+from core.constants import PATHS
+from session_analysis import analyze_sessions, find_sessions, write_summary, write_synthetic_session
+
+
+def benchmark(session_number: int, workers: int | None) -> None:
+    """Analyse synthetic sessions (of 5 minutes) serially, then with the process pool"""
+    with TemporaryDirectory() as directory:
+        paths: list[Path] = [Path(directory, f"{n}_260101_{n:06d}.csv") for n in range(1, session_number + 1)]
+        for n, path in enumerate(paths):
+            write_synthetic_session(path, seed=n)
+        size: float = sum(p.stat().st_size for p in paths) / 1e6
+        print(f"{session_number} synthetic sessions ({size:.0f} MB)")
+        for label, worker_number in (("serial", 1), ("pool", workers)):
+            start: float = perf_counter()
+            rows: int = len(analyze_sessions(paths, worker_number))
+            duration: float = perf_counter() - start
+            print(f"{label}: {duration:.2f} s ({size / duration:.0f} MB/s, {rows} summary rows)")
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description="OpenMATB - Session analyzer")
+    parser.add_argument("paths", nargs="*", type=Path, help="session files, or directories of sessions")
+    parser.add_argument("-o", "--output", type=Path, default=PATHS["SESSIONS"].joinpath("summary.csv"))
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (one per CPU by default)")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="analyse N synthetic sessions instead")
+    arguments: Namespace = parser.parse_args()
+
+    if arguments.benchmark:
+        benchmark(arguments.benchmark, arguments.workers)
+        return
+
+    paths: list[Path] = find_sessions(arguments.paths) if arguments.paths else get_catalog().get_sessions()
+    rows = analyze_sessions(paths, arguments.workers)
+    write_summary(rows, arguments.output)
+    print(f"{len(paths)} sessions analysed: {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -181,6 +181,15 @@ class _FakePygletWindow:
     def clear(self):
         pass
 
+    def flip(self):
+        pass
+
+    def on_resize(self, width, height):
+        pass
+
+    def dispatch_event(self, *args):
+        pass
+
 
 sys.modules["pyglet.window"].Window = _FakePygletWindow
 sys.modules["pyglet.window"].key = key_mod
@@ -264,6 +273,7 @@ for mod_name in ["parallel", "parallel.parallelppdev", "pylsl"]:
 if "rstr" not in sys.modules:
     rstr_mod = _MockModule("rstr")
     rstr_mod.xeger = lambda pattern: "ABC123"
+    rstr_mod.Rstr = lambda _random=None: types.SimpleNamespace(xeger=rstr_mod.xeger)
     sys.modules["rstr"] = rstr_mod
 
 
@@ -273,6 +283,22 @@ if "rstr" not in sys.modules:
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def sessions_path(tmp_path_factory, monkeypatch):
+    """Point the sessions directory to a temporary one, so that a real logger never writes in the repository."""
+    import importlib
+
+    from core import catalog
+    from core.constants import PATHS
+
+    logger = importlib.import_module("core.logger")
+    path = tmp_path_factory.mktemp("sessions")
+    monkeypatch.setitem(PATHS, "SESSIONS", path)
+    monkeypatch.setattr(catalog, "_catalog", None)
+    monkeypatch.setattr(logger, "_logger", None)
+    yield path
+
+
 @pytest.fixture
 def mock_logger():
     """Provide a mock logger that prevents file I/O."""
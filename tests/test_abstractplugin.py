@@ -224,3 +224,49 @@ class TestPluginStates:
         assert p.alive is False
         assert p.paused is True
         assert p.visible is False
+
+
+class TestFixedStepUpdate:
+    def _make(self, **kwargs):
+        p = _make_plugin(paused=False, **kwargs)
+        p.computed_at = []
+
+        def compute():
+            p.computed_at.append(p.scenario_time)
+            return AbstractPlugin.compute_next_plugin_state(p)
+
+        p.compute_next_plugin_state = compute
+        p.refresh_widgets = MagicMock()
+        return p
+
+    def test_first_update_computes_immediately(self):
+        """After a start or resume, the state is computed at the first update."""
+        p = self._make()
+        p.update(3.0)
+        assert p.computed_at == [3.0]
+        assert p.next_refresh_time == 3.1
+
+    def test_cadence_does_not_drift_with_frame_jitter(self):
+        """Steps stay on the taskupdatetime grid whatever the frame times."""
+        p = self._make()
+        for t in (0.0, 0.13, 0.19, 0.31, 0.45):
+            p.update(t)
+        assert [round(t, 6) for t in p.computed_at] == [0.0, 0.1, 0.2, 0.3, 0.4]
+        assert p.scenario_time == 0.45
+
+    def test_late_frame_is_caught_up(self):
+        """A long frame runs every missed step."""
+        p = self._make()
+        p.update(0.0)
+        p.update(0.35)
+        assert [round(t, 6) for t in p.computed_at] == [0.0, 0.1, 0.2, 0.3]
+
+    def test_resume_does_not_catch_up_pause(self):
+        """Steps missed while paused are not run after resume."""
+        p = self._make()
+        p.update(0.0)
+        p.pause()
+        p.update(5.0)
+        p.resume()
+        p.update(10.0)
+        assert p.computed_at == [0.0, 10.0]
@@ -0,0 +1,86 @@
+"""Tests for core.catalog - Persistent index of the session files."""
+
+import json
+import os
+
+import pytest
+
+from core.catalog import CATALOG_NAME, SessionCatalog
+
+
+def _touch_session(root, name, directory="2026-01-02"):
+    """Create an (empty) session file."""
+    path = root / directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("logtime,scenario_time,type,module,address,value\n")
+    return path
+
+
+class TestNextId:
+    @pytest.mark.parametrize(
+        "ids, expected",
+        [([], 1), ([1, 2, 3], 4), ([1, 3, 4], 2), ([1], 2), ([2, 3], 1)],
+    )
+    def test_first_available(self, tmp_path, ids, expected):
+        """The next id is the first one available (a removed session id is reused)."""
+        for session_id in ids:
+            _touch_session(tmp_path, f"{session_id}_260102_100000.csv")
+        assert SessionCatalog(tmp_path).get_next_id() == expected
+
+    def test_add_session(self, tmp_path):
+        """Adding a session skips the ids in use, and updates the last id."""
+        for session_id in (2, 3):
+            _touch_session(tmp_path, f"{session_id}_260102_100000.csv")
+        catalog = SessionCatalog(tmp_path)
+        catalog.add_session(_touch_session(tmp_path, "1_260103_100000.csv", directory="2026-01-03"))
+        assert catalog.get_next_id() == 4
+        assert catalog.get_last_id() == 3
+        assert catalog.get_sessions_on("2026-01-03") == [tmp_path / "2026-01-03" / "1_260103_100000.csv"]
+
+
+class TestLookup:
+    def test_by_id_and_date(self, tmp_path):
+        """Sessions are found by id and by date, other csv files being ignored."""
+        first = _touch_session(tmp_path, "1_260102_100000.csv")
+        second = _touch_session(tmp_path, "2_260103_090000.csv", directory="2026-01-03")
+        _touch_session(tmp_path, "1_260102_100000_seeds.csv")
+        catalog = SessionCatalog(tmp_path)
+        assert catalog.get_session_paths(1) == [first]
+        assert catalog.get_session_paths(5) == []
+        assert catalog.get_sessions_on("2026-01-03") == [second]
+        assert catalog.get_sessions() == [first, second]
+        assert catalog.get_last_id() == 2
+
+    def test_empty(self, tmp_path):
+        """An empty sessions directory has no last id."""
+        catalog = SessionCatalog(tmp_path)
+        assert catalog.get_last_id() == 0
+        assert catalog.get_ids() == []
+
+
+class TestPersistence:
+    def test_saved_index_reused(self, tmp_path):
+        """An unchanged directory is not scanned again."""
+        _touch_session(tmp_path, "1_260102_100000.csv")
+        SessionCatalog(tmp_path)
+        index = json.loads((tmp_path / CATALOG_NAME).read_text())
+        index["files"]["2026-01-02"].append("7_260102_110000.csv")  # Only known from the index
+        (tmp_path / CATALOG_NAME).write_text(json.dumps(index))
+        assert SessionCatalog(tmp_path).get_ids() == [1, 7]
+
+    def test_modified_directory_scanned(self, tmp_path):
+        """Sessions added or removed by hand are seen through the directory modification time."""
+        first = _touch_session(tmp_path, "1_260102_100000.csv")
+        SessionCatalog(tmp_path)
+        first.unlink()
+        _touch_session(tmp_path, "4_260102_100000.csv")
+        directory = tmp_path / "2026-01-02"
+        os.utime(directory, ns=(0, directory.stat().st_mtime_ns + 1000))
+        assert SessionCatalog(tmp_path).get_ids() == [4]
+
+    def test_unreadable_index_rebuilt(self, tmp_path):
+        """A corrupted index is rebuilt from the session files."""
+        _touch_session(tmp_path, "3_260102_100000.csv")
+        (tmp_path / CATALOG_NAME).write_text("{not json")
+        assert SessionCatalog(tmp_path).get_ids() == [3]
+        assert json.loads((tmp_path / CATALOG_NAME).read_text())["files"]["2026-01-02"] == ["3_260102_100000.csv"]
@@ -0,0 +1,101 @@
+"""Tests for core/widgets/chronometer.py — per glyph updates and centring."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from core.container import Container
+
+ADVANCE = 10  # Width of a digit, and of any caption character
+
+
+class _FakeLabel:
+    """A label counting its text updates (each one is a relayout in pyglet)."""
+
+    def __init__(self, text, x=0, anchor_x="left", **kwargs):
+        self._text = text
+        self.x = x
+        self.anchor_x = anchor_x
+        self.batch = None
+        self.updates = 0
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.updates += 1
+
+    @property
+    def content_width(self):
+        return ADVANCE * len(self._text)
+
+
+@pytest.fixture
+def chronometer(mock_logger, mock_window):
+    """Create a Chronometer centred on x=100, with fake labels."""
+    from core.widgets import chronometer as module
+
+    glyphs = [SimpleNamespace(advance=ADVANCE)] * 10
+    loaded_font = SimpleNamespace(get_glyphs=lambda s: glyphs)
+    with patch.object(module, "Label", _FakeLabel), patch.object(module.font, "load", return_value=loaded_font):
+        yield module.Chronometer("chrono", Container("c", 0, 0, 200, 100), "Elapsed 00:00:00")
+
+
+def _updates(chronometer):
+    """Return the text updates count of the caption and of each cell."""
+    return [chronometer.vertex["caption"].updates] + [cell.updates for cell in chronometer.cells]
+
+
+class TestGlyphUpdates:
+    def test_only_changed_glyphs_updated(self, chronometer):
+        """A tick updates only the cells whose digit changed."""
+        before = _updates(chronometer)
+        chronometer.set_text("Elapsed 00:00:01")
+        chronometer.set_text("Elapsed 00:00:02")
+        after = _updates(chronometer)
+        assert [b - a for a, b in zip(before, after)] == [0, 0, 0, 0, 0, 0, 0, 0, 2]
+
+    def test_carry_updates_two_glyphs(self, chronometer):
+        """A carry updates the two digits involved, the caption being left untouched."""
+        chronometer.set_text("Elapsed 00:00:09")
+        before = _updates(chronometer)
+        chronometer.set_text("Elapsed 00:00:10")
+        after = _updates(chronometer)
+        assert sum(after) - sum(before) == 2
+        assert after[0] == before[0]
+
+    def test_unchanged_text_not_recorded(self, chronometer, mock_logger):
+        """Setting the same text updates nothing and records no state."""
+        before = _updates(chronometer)
+        chronometer.set_text("Elapsed 00:00:00")
+        assert _updates(chronometer) == before
+        mock_logger.get_state_recorder.assert_not_called()
+
+
+class TestCentring:
+    def test_whole_text_centred(self, chronometer):
+        """The caption, the gap and the digits are centred on x_pos, as a centred label."""
+        caption, cells = chronometer.vertex["caption"], chronometer.cells
+        width = caption.content_width + ADVANCE + 8 * ADVANCE
+        assert caption.x == chronometer.x_pos - width / 2
+        assert cells[-1].x + ADVANCE / 2 == chronometer.x_pos + width / 2
+
+    def test_clock_alone_centred(self, chronometer):
+        """Without caption, the digits alone are centred."""
+        chronometer.set_text("00:00")
+        cells = chronometer.cells
+        assert cells[0].x - ADVANCE / 2 == chronometer.x_pos - 2.5 * ADVANCE
+        assert cells[4].x + ADVANCE / 2 == chronometer.x_pos + 2.5 * ADVANCE
+
+    def test_centred_after_relayout(self, chronometer):
+        """After a resize, the text is centred on the rescaled position, the cells keeping their width."""
+        from core.relayout import Relayout
+
+        chronometer.relayout(Relayout((1, 1), (2, 1)))
+        caption = chronometer.vertex["caption"]
+        assert chronometer.x_pos == 200
+        assert caption.x == 200 - (caption.content_width + ADVANCE + 8 * ADVANCE) / 2
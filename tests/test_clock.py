@@ -24,6 +24,19 @@ class TestClockSpeed:
         fc.get_time = Clock.get_time.__get__(fc)
         return fc
 
+    def test_advance_ticks_once_per_frame(self):
+        """Whatever the speed, a frame is a single tick covering dt * speed."""
+        from unittest.mock import MagicMock
+
+        from core.clock import Clock
+
+        c = self._make_clock()
+        c._speed = 100
+        c.tick = MagicMock()
+        Clock.advance(c, 0.016)
+        c.tick.assert_called_once()
+        assert abs(c._time - 1.6) < 1e-9
+
     def test_initial_speed(self):
         """Default speed is 1."""
         c = self._make_clock()
@@ -36,11 +49,22 @@ class TestClockSpeed:
         assert c._speed == 2
 
     def test_max_speed_cap(self):
-        """Speed cannot exceed 10."""
+        """Speed cannot exceed the highest speed level (200)."""
         c = self._make_clock()
         for _ in range(20):
             c.increase_speed()
-        assert c._speed == 10
+        assert c._speed == 200
+
+    def test_speed_levels_beyond_10(self):
+        """Beyond 10, the speed goes through 20, 50, 100 and 200, and back."""
+        c = self._make_clock()
+        c._speed = 10
+        c.increase_speed()
+        assert c._speed == 20
+        c.increase_speed()
+        assert c._speed == 50
+        c.decrease_speed()
+        assert c._speed == 20
 
     def test_decrease_speed(self):
         """Decrease drops speed by 1."""
@@ -88,3 +112,64 @@ class TestClockTime:
         """Default time is 0.0."""
         c = self._make_clock()
         assert c.get_time() == 0.0
+
+
+class TestFixedSteps:
+    def test_no_step_before_next_time(self):
+        """Nothing is due before the scheduled time."""
+        from core.clock import fixed_steps
+
+        assert list(fixed_steps(0.9, 1.0, 0.1)) == []
+
+    def test_steps_on_the_scheduled_grid(self):
+        """Due steps are at exact multiples of the period from the scheduled time."""
+        from core.clock import fixed_steps
+
+        steps = list(fixed_steps(1.25, 1.0, 0.1))
+        assert len(steps) == 3
+        assert steps[0] == 1.0
+        assert abs(steps[-1] - 1.2) < 1e-9
+
+    def test_backlog_is_capped(self):
+        """At most max_steps are run, the oldest being dropped."""
+        from core.clock import fixed_steps
+
+        steps = list(fixed_steps(10.0, 0.0, 1.0, max_steps=3))
+        assert steps == [8.0, 9.0, 10.0]
+
+    def test_null_period_runs_once(self):
+        """A null or negative period means one step, at the current time."""
+        from core.clock import fixed_steps
+
+        assert list(fixed_steps(5.0, 0.0, -0.001)) == [5.0]
+
+    def test_due_steps_counts_dropped_ones(self):
+        """The due steps count includes the steps beyond max_steps."""
+        from core.clock import due_steps
+
+        assert due_steps(0.9, 1.0, 0.1) == 0
+        assert due_steps(10.0, 0.0, 1.0) == 11
+        assert due_steps(5.0, 0.0, 0) == 1
+
+
+class TestWaitUntil:
+    def test_waits_until_deadline(self):
+        """The wait ends at the deadline, with a sub-millisecond overshoot."""
+        from time import perf_counter
+
+        from core.clock import wait_until
+
+        deadline = perf_counter() + 0.01
+        end = wait_until(deadline)
+        assert end >= deadline
+        assert perf_counter() >= deadline
+
+    def test_past_deadline_returns_immediately(self):
+        """A deadline already reached does not wait."""
+        from time import perf_counter
+
+        from core.clock import wait_until
+
+        start = perf_counter()
+        wait_until(start - 1.0)
+        assert perf_counter() - start < 0.01
@@ -158,3 +158,11 @@ class TestContainsXY:
         c = Container("t", 0, 0, 100, 100)
         # y1=100, y2=0, so y=150 > y1 => y1 >= y is False
         assert c.contains_xy(50, 150) is False
+
+
+class TestReduceAndTranslateMemo:
+    def test_same_arguments_same_instance(self):
+        """Identical reductions of a container are computed once."""
+        c = Container("c", 0, 0, 100, 100)
+        assert c.reduce_and_translate(0.5, 0.5, 1, 0) is c.reduce_and_translate(0.5, 0.5, 1, 0)
+        assert c.reduce_and_translate(0.5, 0.5, 0, 0) is not c.reduce_and_translate(0.5, 0.5, 1, 0)
@@ -0,0 +1,172 @@
+"""Tests for core.controlserver - Local events injection server."""
+
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.controlserver import ControlServer, measure_round_trips
+from core.event import Event
+
+
+@pytest.fixture
+def server():
+    s = ControlServer(0)
+    s.start()
+    yield s
+    s.stop()
+
+
+def _send_lines(port, lines):
+    """Send lines on a single connection and return the reply lines."""
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        f = sock.makefile("rw", encoding="utf-8", newline="\n")
+        replies = []
+        for line in lines:
+            f.write(line + "\n")
+            f.flush()
+            replies.append(f.readline().strip())
+        return replies
+
+
+class FrameLoop:
+    """Emulate the scheduler frames: drain the requests every period and reply to them."""
+
+    def __init__(self, server, period, reply="OK"):
+        self.server = server
+        self.period = period
+        self.reply = reply
+        self.lines = []
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            for request in self.server.pop_requests():
+                self.lines.append(request.line)
+                request.reply(self.reply)
+            time.sleep(self.period)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+
+class TestControlServer:
+    def test_listens_on_free_port(self, server):
+        """A null port is replaced by the port chosen by the system."""
+        assert server.port > 0
+
+    def test_ping(self, server):
+        """ping is answered by the server thread itself."""
+        assert _send_lines(server.port, ["ping"]) == ["PONG"]
+
+    def test_request_replied_by_main_thread(self, server):
+        """A request waits for the main thread reply."""
+        loop = FrameLoop(server, 0.001, reply="OK")
+        try:
+            assert _send_lines(server.port, ["track;targetproportion;0.2", "sysmon;start"]) == ["OK", "OK"]
+        finally:
+            loop.stop()
+        assert loop.lines == ["track;targetproportion;0.2", "sysmon;start"]
+
+    def test_port_in_use(self, server):
+        """A busy port raises an OSError at start."""
+        with pytest.raises(OSError):
+            ControlServer(server.port).start()
+
+    def test_loopback_round_trip(self, server):
+        """Loopback benchmark: the round trip is bounded by the frame period."""
+        loop = FrameLoop(server, 0.001)
+        try:
+            round_trips = asyncio.run(measure_round_trips(server.port, ["track;start"] * 50))
+        finally:
+            loop.stop()
+        assert len(round_trips) == 50
+        assert statistics.median(round_trips) < 0.05
+
+
+def _make_scheduler(check_errors=()):
+    from core.scheduler import Scheduler
+
+    sched = object.__new__(Scheduler)
+    sched.scenario_time = 10.0
+    sched.events = []
+    sched.scenario = MagicMock()
+    sched.scenario.check_event.return_value = list(check_errors)
+    sched.execute_one_event = MagicMock()
+    sched.control_server = MagicMock()
+    return sched
+
+
+def _request(line):
+    request = MagicMock()
+    request.line = line
+    return request
+
+
+class TestExecuteControlRequests:
+    def test_parse_without_time(self):
+        """A line without time is an event at the current scenario time."""
+        event = _make_scheduler().parse_control_line("track;targetproportion;0.2")
+        assert (event.time_sec, event.plugin, event.command) == (10, "track", ["targetproportion", "0.2"])
+
+    def test_parse_with_time(self):
+        """A scenario line keeps its time."""
+        event = _make_scheduler().parse_control_line("0:01:00;sysmon;start")
+        assert (event.time_sec, event.plugin, event.command) == (60, "sysmon", ["start"])
+
+    def test_immediate_event_is_executed(self):
+        """A valid event without time is executed right away."""
+        sched = _make_scheduler()
+        request = _request("sysmon;stop")
+        sched.control_server.pop_requests.return_value = [request]
+        sched.execute_control_requests()
+        event = sched.execute_one_event.call_args[0][0]
+        assert isinstance(event, Event)
+        assert event.command == ["stop"]
+        request.reply.assert_called_once_with("OK")
+
+    def test_future_event_is_queued(self):
+        """A valid event scheduled later joins the scenario events."""
+        sched = _make_scheduler()
+        request = _request("0:01:00;sysmon;stop")
+        sched.control_server.pop_requests.return_value = [request]
+        sched.execute_control_requests()
+        sched.execute_one_event.assert_not_called()
+        assert sched.events[0].time_sec == 60
+        request.reply.assert_called_once_with("QUEUED")
+
+    def test_invalid_event_is_rejected(self):
+        """An event failing the scenario checks is not executed, and the errors are replied."""
+        sched = _make_scheduler(check_errors=["Error on line 0. bad value"])
+        request = _request("track;targetproportion;2")
+        sched.control_server.pop_requests.return_value = [request]
+        sched.execute_control_requests()
+        sched.execute_one_event.assert_not_called()
+        assert request.reply.call_args[0][0] == "ERROR Error on line 0. bad value"
+
+    def test_bad_syntax(self):
+        """A malformed time is replied as an error."""
+        sched = _make_scheduler()
+        request = _request("1:00;sysmon;start")
+        sched.control_server.pop_requests.return_value = [request]
+        sched.execute_control_requests()
+        assert request.reply.call_args[0][0].startswith("ERROR")
+
+    def test_busy_while_modal_dialog(self):
+        """Requests received while a modal dialog is open are replied BUSY, not left waiting."""
+        sched = _make_scheduler()
+        sched._dialog_paused = True
+        request = _request("sysmon;stop")
+        sched.control_server.pop_requests.return_value = [request]
+        with patch("core.scheduler.Window") as window, patch("core.scheduler.get_logger"):
+            window.MainWindow.modal_dialog = MagicMock()
+            sched.update(0.1)
+        sched.execute_one_event.assert_not_called()
+        request.reply.assert_called_once_with("BUSY")
@@ -0,0 +1,87 @@
+"""Tests for core.fluid - Piecewise-linear resman fluid model."""
+
+import pytest
+
+from core.fluid import FluidNetwork
+
+
+def _make_network():
+    """Two tanks (0 depletable, 1 not) and a pump from 1 to 0, of 10 units/s."""
+    n = FluidNetwork(2, [1], [0])
+    n.levels[:] = [100.0, 500.0]
+    n.capacities[:] = [200.0, 1000.0]
+    n.depletable[:] = [True, False]
+    n.flows[0] = 10.0
+    return n
+
+
+class TestTopology:
+    def test_adjacency(self):
+        """Incoming and outgoing pumps are indexed per tank."""
+        n = FluidNetwork(3, [0, 2, 0], [1, 1, 2])
+        assert n.incoming == [(), (0, 1), (2,)]
+        assert n.outgoing == [(0, 2), (), (1,)]
+
+
+class TestAdvance:
+    def test_linear_flow(self):
+        """A running pump transfers flow * duration, without truncation."""
+        n = _make_network()
+        n.running[0] = True
+        n.advance(2.5)
+        assert n.levels == [125.0, 500.0]  # The non depletable source is not drained
+
+    def test_leak(self):
+        """A leaking tank loses loss * duration."""
+        n = _make_network()
+        n.losses[0] = 0.4
+        n.advance(3)
+        assert n.levels[0] == pytest.approx(98.8)
+
+    def test_leak_stops_when_empty(self):
+        """An empty tank stays empty."""
+        n = _make_network()
+        n.losses[0] = 10.0
+        n.advance(60)
+        assert n.levels[0] == 0.0
+
+    def test_full_tank_stops_incoming_pumps(self):
+        """The pump is switched off when the tank becomes full, and the tank stays full."""
+        n = _make_network()
+        n.running[0] = True
+        n.losses[0] = 5.0
+        stopped = n.advance(60)
+        assert stopped == [0]
+        assert n.running == [False]
+        # Full after 100 / (10 - 5) = 20 s, then leaks for 40 s
+        assert n.levels[0] == pytest.approx(200 - 40 * 5)
+
+    def test_empty_tank_stops_outgoing_pumps(self):
+        """A depletable source is drained until empty, then its pump is switched off."""
+        n = FluidNetwork(2, [0], [1])
+        n.levels[:] = [30.0, 0.0]
+        n.capacities[:] = [100.0, 100.0]
+        n.flows[0] = 10.0
+        n.running[0] = True
+        assert n.advance(5) == [0]
+        assert n.levels == [0.0, 30.0]
+
+    def test_step_independent(self):
+        """Any sequence of durations gives the same levels."""
+        a, b = _make_network(), _make_network()
+        for n in (a, b):
+            n.running[0] = True
+            n.losses[0] = 2.0
+        a.advance(30)
+        for _ in range(300):
+            b.advance(0.1)
+        assert b.levels == pytest.approx(a.levels)
+        assert a.running == b.running
+
+    def test_bounded_pumps_stopped_at_start(self):
+        """A pump filling an already full tank is switched off without any flow."""
+        n = _make_network()
+        n.levels[0] = 200.0
+        n.running[0] = True
+        assert n.advance(0) == [0]
+        assert n.levels[0] == 200.0
@@ -0,0 +1,46 @@
+"""Tests for core.joystick - Joystick polling and axes logging."""
+
+from types import SimpleNamespace
+
+from core.joystick import AXES_DEADBAND, Joystick, hat_sides
+
+
+def _make_joystick(device):
+    """Create a Joystick without opening its device."""
+    joystick = object.__new__(Joystick)
+    joystick.device = device
+    joystick.x = joystick.y = 0
+    joystick.poll_time = 0
+    joystick.key_times = dict()
+    joystick.axes_channel = None
+    joystick.keys = {f"JOY_HAT_{side}": False for side in hat_sides}
+    joystick.key_change = {key: None for key in joystick.keys}
+    return joystick
+
+
+def _device(x=0.0, y=0.0):
+    return SimpleNamespace(x=x, y=y, buttons=[], hat_x=0, hat_y=0)
+
+
+class TestAxesLogging:
+    def test_still_axes_not_logged(self, mock_logger):
+        """Nothing is logged while the axes do not move."""
+        joystick = _make_joystick(_device())
+        joystick.update()
+        mock_logger.register_channel.assert_not_called()
+        mock_logger.record_channel.assert_not_called()
+
+    def test_axes_logged_as_channel(self, mock_logger):
+        """Moved axes are logged together through a deadband channel, stamped with the poll time."""
+        joystick = _make_joystick(_device(0.5, -0.25))
+        joystick.update()
+        joystick.device.x = 0.75
+        joystick.update()
+        mock_logger.register_channel.assert_called_once_with("device_joystick", "axes", AXES_DEADBAND)
+        channel = mock_logger.register_channel.return_value
+        assert [c.args for c in mock_logger.record_channel.call_args_list] == [
+            (channel, (0.5, -0.25)),
+            (channel, (0.75, -0.25)),
+        ]
+        assert mock_logger.record_channel.call_args.kwargs == {"logtime": joystick.poll_time}
+        mock_logger.record_input.assert_not_called()
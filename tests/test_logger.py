@@ -1,11 +1,12 @@
 """Tests for core.logger - Logger slot formatting, queue management, and record methods."""
 
 import importlib
-from collections import namedtuple
+from collections import Counter
 from unittest.mock import MagicMock, patch
 
 from core.event import Event
 from core.logger import Logger
+from core.sessionfile import read_metadata, read_session_rows
 
 # core.__init__ re-exports the Logger instance as `core.logger`, shadowing
 # the module.  Use importlib to get the actual module for patching.
@@ -16,54 +17,53 @@ def _make_logger(**overrides):
     """Create a Logger instance bypassing __init__ to avoid file I/O."""
     lg = object.__new__(Logger)
     lg.fields_list = ["logtime", "scenario_time", "type", "module", "address", "value"]
-    lg.slot = namedtuple("Row", lg.fields_list)
     lg.maxfloats = 6
     lg.scenario_time = 0
     lg.session_id = 1
     lg.lsl = None
     lg.queue = []
+    lg.state_recorders = {}
+    lg.pending_onsets = []
+    lg.segment_number = 0
+    lg.compressor = None
+    lg.row_counts = Counter()
+    lg.metadata = {}
+    lg.start_time = 0.0
     lg.file = None
     lg.writer = MagicMock()
     lg.__dict__.update(overrides)
     return lg
 
 
-# ── round_row ────────────────────────────────────
+# ── format_rows ──────────────────────────────────
 
 
-class TestRoundRow:
+class TestFormatRows:
     def test_rounds_floats(self):
         """Float values are rounded to maxfloats decimals."""
         lg = _make_logger()
-        row = [1.123456789, 0, "event", "sysmon", "self", "start"]
-        result = lg.round_row(row)
-        assert result.logtime == round(1.123456789, 6)
+        rows = lg.format_rows([(1.123456789, 0.5, "state", "resman", "tank_a, level", 2500.123456789)])
+        assert rows[0][0] == round(1.123456789, 6)
+        assert rows[0][5] == round(2500.123456789, 6)
 
     def test_rounds_ints(self):
         """Integer values are passed through round() but stay unchanged."""
         lg = _make_logger()
-        row = [1, 0, "event", "sysmon", "self", "start"]
-        result = lg.round_row(row)
-        assert result.logtime == 1
+        rows = lg.format_rows([(1, 0, "sample", "", 3, 10)])
+        assert rows[0] == (1, 0, "sample", "", 3, 10)
 
     def test_preserves_strings(self):
         """String values are not rounded."""
         lg = _make_logger()
-        row = [1.0, 0, "event", "sysmon", "self", "start"]
-        result = lg.round_row(row)
-        assert result.type == "event"
-        assert result.module == "sysmon"
-        assert result.address == "self"
-        assert result.value == "start"
-
-    def test_returns_namedtuple(self):
-        """Result is a Row namedtuple with correct fields."""
+        rows = lg.format_rows([(1.0, 0, "event", "sysmon", "self", "start")])
+        assert rows[0][2:] == ("event", "sysmon", "self", "start")
+
+    def test_booleans_as_integers(self):
+        """Boolean values are logged as 1/0, as before."""
         lg = _make_logger()
-        row = [1.0, 0, "event", "sysmon", "self", "start"]
-        result = lg.round_row(row)
-        assert hasattr(result, "logtime")
-        assert hasattr(result, "scenario_time")
-        assert hasattr(result, "type")
+        rows = lg.format_rows([(1.0, 0, "state", "sysmon", "light1, on", True)])
+        assert rows[0][5] == 1
+        assert type(rows[0][5]) is int
 
 
 # ── Queue management ─────────────────────────────
@@ -160,6 +160,13 @@ class TestRecordInput:
         args = lg.write_single_slot.call_args[0][0]
         assert args == [2.0, 5, "input", "keyboard", "F1", "press"]
 
+    def test_dispatch_logtime(self):
+        """An input stamped at its dispatch keeps its logtime."""
+        lg = _make_logger(scenario_time=5)
+        lg.write_single_slot = MagicMock()
+        lg.record_input("keyboard", "F1", "press", logtime=1.5)
+        assert lg.write_single_slot.call_args[0][0][0] == 1.5
+
 
 # ── record_aoi ───────────────────────────────────
 
@@ -200,23 +207,34 @@ class TestRecordState:
     def test_parses_graph_name(self, _mock_pc):
         """Splits graph_name into module and widget, builds address."""
         lg = _make_logger(scenario_time=0)
-        lg.write_single_slot = MagicMock()
         lg.record_state("sysmon_light1", "color", "(255,0,0)")
-        args = lg.write_single_slot.call_args[0][0]
-        assert args[2] == "state"
-        assert args[3] == "sysmon"
-        assert args[4] == "light1, color"
-        assert args[5] == "(255,0,0)"
+        assert lg.queue[-1] == (4.0, 0, "state", "sysmon", "light1, color", "(255,0,0)")
 
     @patch.object(_logger_module, "perf_counter", return_value=4.0)
     def test_multi_underscore_graph_name(self, _mock_pc):
         """Graph name with multiple underscores preserves widget parts."""
         lg = _make_logger(scenario_time=0)
-        lg.write_single_slot = MagicMock()
         lg.record_state("resman_tank_a", "level", 2500)
-        args = lg.write_single_slot.call_args[0][0]
-        assert args[3] == "resman"
-        assert args[4] == "tank_a, level"
+        row = lg.queue[-1]
+        assert row[3] == "resman"
+        assert row[4] == "tank_a, level"
+
+    @patch.object(_logger_module, "perf_counter", return_value=4.0)
+    def test_explicit_logtime(self, _mock_pc):
+        """A given logtime (state changed earlier) is used instead of the current time."""
+        lg = _make_logger(scenario_time=0)
+        lg.record_state("parallelport_trigger", "value", 10, logtime=3.5)
+        assert lg.queue[-1][0] == 3.5
+
+    def test_recorder_bound_once(self):
+        """A state address is computed once, its recorder being reused."""
+        lg = _make_logger()
+        recorder = lg.get_state_recorder("resman_tank_a", "level")
+        assert lg.get_state_recorder("resman_tank_a", "level") is recorder
+        assert (recorder.module, recorder.address) == ("resman", "tank_a, level")
+        recorder.record(2400, logtime=1.0)
+        recorder.record(2300, logtime=2.0)
+        assert [row[5] for row in lg.queue] == [2400, 2300]
 
 
 # ── record_parameter ─────────────────────────────
@@ -280,6 +298,16 @@ class TestRecordPseudorandomValue:
         assert second_args[5] == "result"
 
 
+class TestRecordSeedEntry:
+    @patch.object(_logger_module, "perf_counter", return_value=7.0)
+    def test_formats_slot(self, _mock_pc):
+        """Writes a single slot of the given compact seeds type."""
+        lg = _make_logger(scenario_time=3)
+        lg.write_single_slot = MagicMock()
+        lg.record_seed_entry("seed_draws", "sysmon", 3, "0:1 1:2")
+        lg.write_single_slot.assert_called_once_with([7.0, 3, "seed_draws", "sysmon", 3, "0:1 1:2"])
+
+
 # ── log_manual_entry ─────────────────────────────
 
 
@@ -308,26 +336,12 @@ class TestLogManualEntry:
 
 
 class TestWriteSingleSlot:
-    @patch.object(_logger_module, "REPLAY_MODE", False)
-    def test_adds_to_queue_and_writes(self):
-        """Slot is queued then written via write_row_queue."""
-        lg = _make_logger()
-        values = [1.0, 0, "event", "sysmon", "self", "start"]
-        lg.write_single_slot(values)
-        # After write_row_queue, queue should be emptied
-        assert lg.queue == []
-        lg.writer.writerow.assert_called_once()
-
-    @patch.object(_logger_module, "REPLAY_MODE", False)
-    def test_written_row_has_correct_fields(self):
-        """Written dict has all 6 expected fields."""
+    def test_only_queues(self):
+        """Slot is queued as a tuple, and written at the next flush."""
         lg = _make_logger()
-        values = [1.0, 0, "event", "sysmon", "self", "start"]
-        lg.write_single_slot(values)
-        written = lg.writer.writerow.call_args[0][0]
-        assert set(written.keys()) == set(lg.fields_list)
-        assert written["type"] == "event"
-        assert written["module"] == "sysmon"
+        lg.write_single_slot([1.0, 0, "event", "sysmon", "self", "start"])
+        assert lg.queue == [(1.0, 0, "event", "sysmon", "self", "start")]
+        lg.writer.writerows.assert_not_called()
 
 
 # ── write_row_queue ──────────────────────────────
@@ -336,45 +350,256 @@ class TestWriteSingleSlot:
 class TestWriteRowQueue:
     @patch.object(_logger_module, "REPLAY_MODE", False)
     def test_writes_all_queued_rows(self):
-        """All queued rows are written and queue is emptied."""
+        """All queued rows are written at once and queue is emptied."""
         lg = _make_logger()
         lg.queue = [
-            lg.slot(1.0, 0, "event", "sysmon", "self", "start"),
-            lg.slot(2.0, 1, "event", "track", "self", "start"),
+            (1.0, 0, "event", "sysmon", "self", "start"),
+            (2.0000001, 1, "event", "track", "self", "start"),
         ]
         lg.write_row_queue()
-        assert lg.writer.writerow.call_count == 2
+        lg.writer.writerows.assert_called_once_with(
+            [(1.0, 0, "event", "sysmon", "self", "start"), (2.0, 1, "event", "track", "self", "start")]
+        )
         assert lg.queue == []
 
     @patch.object(_logger_module, "REPLAY_MODE", False)
     def test_change_dict_overrides_fields(self):
         """change_dict overrides specific fields in each row."""
         lg = _make_logger()
-        lg.queue = [lg.slot(1.0, 0, "event", "sysmon", "self", "start")]
+        lg.queue = [(1.0, 0, "event", "sysmon", "self", "start")]
         lg.write_row_queue(change_dict={"module": "OVERRIDE"})
-        written = lg.writer.writerow.call_args[0][0]
-        assert written["module"] == "OVERRIDE"
+        written = lg.writer.writerows.call_args[0][0]
+        assert written[0][3] == "OVERRIDE"
 
     @patch.object(_logger_module, "REPLAY_MODE", False)
-    def test_empty_queue_prints_warning(self, capsys=None):
-        """Empty queue prints a warning instead of writing."""
+    def test_empty_queue_writes_nothing(self):
+        """An empty queue (a frame without any row) writes nothing."""
         lg = _make_logger()
-        lg.write_row_queue()  # queue is empty
-        lg.writer.writerow.assert_not_called()
+        lg.write_row_queue()
+        lg.writer.writerows.assert_not_called()
 
     @patch.object(_logger_module, "REPLAY_MODE", True)
     def test_replay_mode_skips_writing(self):
-        """In replay mode, nothing is written."""
+        """In replay mode, nothing is written, but the queue is emptied."""
         lg = _make_logger()
-        lg.queue = [lg.slot(1.0, 0, "event", "sysmon", "self", "start")]
+        lg.queue = [(1.0, 0, "event", "sysmon", "self", "start")]
         lg.write_row_queue()
-        lg.writer.writerow.assert_not_called()
+        lg.writer.writerows.assert_not_called()
+        assert lg.queue == []
+
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_written_when_full(self):
+        """A queue reaching its maximal size is written without waiting for the frame end."""
+        lg = _make_logger(file=MagicMock())
+        with patch.object(_logger_module, "MAX_QUEUE_ROWS", 3), patch.object(lg, "checkpoint"):
+            for n in range(4):
+                lg.record_state("sysmon_light1", "on", n, logtime=1.0)
+        assert len(lg.writer.writerows.call_args[0][0]) == 3
+        assert len(lg.queue) == 1
+
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_written_when_old(self):
+        """A queue holding rows older than the maximal age is written."""
+        lg = _make_logger(file=MagicMock())
+        with patch.object(lg, "checkpoint"):
+            lg.log_manual_entry("first")
+            lg.record_state("sysmon_light1", "on", True, logtime=lg.queue[0][0] + 0.5)
+            lg.writer.writerows.assert_not_called()
+            lg.record_state("sysmon_light1", "on", False, logtime=lg.queue[0][0] + 1.5)
+        assert len(lg.writer.writerows.call_args[0][0]) == 3
+        assert lg.queue == []
+
+    def test_not_written_before_open(self):
+        """Without a session file, the rows stay queued."""
+        lg = _make_logger()
+        with patch.object(_logger_module, "MAX_QUEUE_ROWS", 1):
+            lg.log_manual_entry("entry")
+        assert len(lg.queue) == 1
 
     @patch.object(_logger_module, "REPLAY_MODE", False)
     def test_lsl_push_when_enabled(self):
         """When lsl is set, each row is also pushed to LSL."""
         mock_lsl = MagicMock()
         lg = _make_logger(lsl=mock_lsl)
-        lg.queue = [lg.slot(1.0, 0, "event", "sysmon", "self", "start")]
+        lg.queue = [(1.0, 0, "event", "sysmon", "self", "start")]
+        lg.write_row_queue()
+        mock_lsl.push_row.assert_called_once()
+        assert mock_lsl.push_row.call_args[0][0]["logtime"] == 1.0
+
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_written_to_file(self, tmp_path):
+        """The header and the flushed rows are written as csv lines."""
+        lg = _make_logger(path=tmp_path / "session.csv", mode="w")
+        lg.open()
+        lg.record_state("sysmon_light1", "on", True, logtime=1.25)
+        lg.close()
+        lines = (tmp_path / "session.csv").read_text().splitlines()
+        assert lines == ["logtime,scenario_time,type,module,address,value", '1.25,0,state,sysmon,"light1, on",1']
+
+
+class TestFrameOnsets:
+    @patch.object(_logger_module, "perf_counter", return_value=5.0)
+    def test_disabled_by_default(self, _mock_pc):
+        """Without frame_onsets, no onset is queued."""
+        lg = _make_logger(pending_onsets=[])
+        lg.record_state("sysmon_light", "color", "red")
+        assert lg.pending_onsets == []
+
+    @patch.object(_logger_module, "perf_counter", return_value=5.0)
+    def test_onset_rows_stamped_with_flip_time(self, _mock_pc):
+        """Each pending state gets an onset row at the flip time, valued with its state logtime."""
+        lg = _make_logger(frame_onsets=True, pending_onsets=[])
+        lg.record_state("sysmon_light", "color", "red")
+        lg.record_onsets(5.016)
+        assert lg.queue[-1] == (5.016, 0, "onset", "sysmon", "light, color", 5.0)
+        assert lg.pending_onsets == []
+
+    def test_no_pending_no_write(self):
+        """A flip without pending state change writes nothing."""
+        lg = _make_logger(frame_onsets=True, pending_onsets=[])
+        lg.record_onsets(1.0)
+        assert lg.queue == []
+
+
+# ── channels ─────────────────────────────────────
+
+
+class TestChannels:
+    @patch.object(_logger_module, "perf_counter", return_value=2.0)
+    def test_legacy_state_rows(self, _mock_pc):
+        """By default, a channel sample is logged as a state row."""
+        lg = _make_logger(channels=[])
+        channel = lg.register_channel("track_reticle", "cursor_relative")
+        assert lg.queue == []
+        lg.record_channel(channel, (0.5, -0.25))
+        assert lg.queue == [(2.0, 0, "state", "track", "reticle, cursor_relative", (0.5, -0.25))]
+
+    @patch.object(_logger_module, "perf_counter", return_value=2.0)
+    def test_compact_sample_rows(self, _mock_pc):
+        """With compact_states, the channel is described once, and its samples by number."""
+        lg = _make_logger(channels=[], compact_states=True)
+        lg.register_channel("sysmon_scale1", "arrow")
+        channel = lg.register_channel("track_reticle", "cursor_relative")
+        assert lg.queue[-1][2:] == ("channel", "track", "reticle, cursor_relative", 1)
+        lg.record_channel(channel, (0.123456789, -0.25))
+        assert lg.queue[-1][2:] == ("sample", "", 1, "0.123457 -0.25")
+
+    def test_deadband(self):
+        """Samples within the deadband of the last logged sample are dropped."""
+        lg = _make_logger(channels=[])
+        channel = lg.register_channel("track_reticle", "cursor_relative", deadband=0.1)
+        for value in [(0.0, 0.0), (0.05, 0.0), (0.09, -0.09), (0.11, 0.0), (0.2, 0.0)]:
+            lg.record_channel(channel, value)
+        assert [row[5] for row in lg.queue] == [(0.0, 0.0), (0.11, 0.0)]
+
+    def test_lsl_gets_state_rows(self):
+        """The lsl streamer gets the expanded state rows of the samples."""
+        lg = _make_logger(channels=[], compact_states=True, lsl=MagicMock())
+        channel = lg.register_channel("track_reticle", "cursor_proportional")
+        lg.record_channel(channel, (0.5, 0.25))
         lg.write_row_queue()
-        mock_lsl.push.assert_called_once()
+        row = lg.lsl.push_row.call_args[0][0]
+        assert (row["type"], row["module"], row["address"], row["value"]) == (
+            "state",
+            "track",
+            "reticle, cursor_proportional",
+            (0.5, 0.25),
+        )
+
+
+# ── segments ─────────────────────────────────────
+
+
+class TestSegments:
+    def _make_file_logger(self, tmp_path, **overrides):
+        """Create a logger writing a session file in tmp_path."""
+        lg = _make_logger(path=tmp_path / "1_session.csv", mode="w", **overrides)
+        lg.segment_start = 0.0
+        lg.open()
+        return lg
+
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_rotation_by_duration(self, tmp_path):
+        """A new segment, starting with the header, is opened once the segment duration is reached."""
+        lg = self._make_file_logger(tmp_path, segment_duration=60)
+        with patch.object(_logger_module, "perf_counter", return_value=30.0):
+            lg.log_manual_entry("first")
+            lg.write_row_queue()
+        with patch.object(_logger_module, "perf_counter", return_value=61.0):
+            lg.log_manual_entry("second")
+            lg.write_row_queue()
+            lg.log_manual_entry("third")
+            lg.close()
+        assert (tmp_path / "1_session.csv").read_text().splitlines()[1:] == [
+            "30.0,0,manual,,,first",
+            "61.0,0,manual,,,second",
+        ]
+        assert (tmp_path / "1_session.csv.001").read_text().splitlines() == [
+            "logtime,scenario_time,type,module,address,value",
+            "61.0,0,manual,,,third",
+        ]
+
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_rotation_by_size_and_compression(self, tmp_path):
+        """Closed segments but the first one are compressed, and read back as one session."""
+        lg = self._make_file_logger(tmp_path, segment_size=150, compress_segments=True)
+        for n in range(5):
+            with patch.object(_logger_module, "perf_counter", return_value=float(n * 2)):
+                lg.log_manual_entry("x" * 40)
+                lg.write_row_queue()
+        lg.close()
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "1_session.csv",
+            "1_session.csv.001.gz",
+            "1_session.csv.002.gz",
+            "1_session.meta.json",
+        ]
+        assert [row["logtime"] for row in read_session_rows(tmp_path / "1_session.csv")] == [
+            str(float(n * 2)) for n in range(5)
+        ]
+
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_periodic_sync(self, tmp_path):
+        """The written rows are synced to the disk at the fsync period."""
+        lg = self._make_file_logger(tmp_path, fsync_period=5)
+        with patch.object(_logger_module.os, "fsync") as mock_fsync:
+            for logtime in (1.0, 3.0, 6.0, 8.0, 12.0):
+                with patch.object(_logger_module, "perf_counter", return_value=logtime):
+                    lg.log_manual_entry("entry")
+                    lg.write_row_queue()
+            assert mock_fsync.call_count == 2  # At 6 and 12 s
+        lg.close()
+
+
+# ── metadata ─────────────────────────────────────
+
+
+class TestMetadata:
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_finalized_at_close(self, tmp_path):
+        """The sidecar is updated with the scenario, then finalized with the session counts."""
+        lg = _make_logger(path=tmp_path / "1_session.csv", mode="w", metadata={"status": "running"})
+        lg.open()
+        lg.update_metadata(scenario_path="basic.txt", plugins=["sysmon"])
+        assert read_metadata(lg.path) == {"status": "running", "scenario_path": "basic.txt", "plugins": ["sysmon"]}
+
+        lg.record_state("sysmon_light1", "on", True)
+        lg.record_state("sysmon_light1", "on", False)
+        lg.log_manual_entry("end")
+        lg.set_scenario_time(12.5)
+        lg.close()
+        metadata = read_metadata(lg.path)
+        assert metadata["status"] == "complete"
+        assert metadata["scenario_duration"] == 12.5
+        assert metadata["rows"] == {"state": 2, "manual": 1}
+        assert metadata["segments"] == 1
+
+    @patch.object(_logger_module, "REPLAY_MODE", False)
+    def test_interrupted_at_exit(self, tmp_path):
+        """Closed at exit without a normal close, the queued rows are written and the session marked interrupted."""
+        lg = _make_logger(path=tmp_path / "1_session.csv", mode="w", metadata={"status": "running"})
+        lg.open()
+        lg.log_manual_entry("last")
+        lg.close(status="interrupted")
+        assert read_metadata(lg.path)["status"] == "interrupted"
+        assert [row["value"] for row in read_session_rows(lg.path)] == ["last"]
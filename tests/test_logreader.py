@@ -1,6 +1,7 @@
 """Tests for core.logreader - CSV session parsing logic."""
 
-from core.logreader import IGNORE_PLUGINS, LogReader
+from core.logreader import IGNORE_PLUGINS, LogReader, write_expanded_session
+from core.sessionfile import compress_segment
 
 
 def _make_logreader(**overrides):
@@ -113,6 +114,36 @@ class TestReloadSession:
         assert "sysmon" in lr.contents[0]
         assert "pump-1-state" in lr.contents[1]
 
+    def test_random_mode(self, tmp_path):
+        """The pseudorandom mode entry is read, older sessions defaulting to legacy."""
+        csv_file = tmp_path / "session.csv"
+        csv_file.write_text(
+            "logtime,scenario_time,type,module,address,value\n"
+            "0.000,0.0,version,,,1.0\n"
+            "0.001,0.0,random_mode,,,counter\n"
+        )
+        lr = _make_logreader(session_file_path=csv_file)
+        lr.reload_session()
+        assert lr.random_mode == "counter"
+
+        csv_file.write_text("logtime,scenario_time,type,module,address,value\n0.000,0.0,version,,,1.0\n")
+        lr.reload_session()
+        assert lr.random_mode == "legacy"
+
+    def test_segmented_session(self, tmp_path):
+        """The segments of a session (compressed or not) are read as one file."""
+        csv_file = tmp_path / "1_session.csv"
+        header = "logtime,scenario_time,type,module,address,value\n"
+        csv_file.write_text(header + "0.000,0.0,event,sysmon,self,start\n0.001,30.0,event,sysmon,self,pause\n")
+        segment = tmp_path / "1_session.csv.001"
+        segment.write_text(header + "0.002,60.0,event,resman,pump-1-state,on\n")
+        compress_segment(segment)
+        lr = _make_logreader(session_file_path=csv_file)
+        lr.reload_session()
+        assert len(lr.contents) == 2
+        assert "pump-1-state" in lr.contents[1]
+        assert lr.end_sec == 60.0
+
     def test_parses_keyboard_inputs(self, tmp_path):
         """Keyboard input rows go into inputs and keyboard_inputs."""
         csv_file = tmp_path / "session.csv"
@@ -138,6 +169,21 @@ class TestReloadSession:
         lr.reload_session()
         assert len(lr.joystick_inputs) == 1
 
+    def test_parses_joystick_axes_channel(self, tmp_path):
+        """Joystick axes channel rows, legacy or compact, go into joystick_inputs with (x, y) values."""
+        csv_file = tmp_path / "session.csv"
+        csv_file.write_text(
+            "logtime,scenario_time,type,module,address,value\n"
+            "0.001,0.0,event,track,self,start\n"
+            '0.002,5.0,state,device,"joystick, axes","(0.5, -0.25)"\n'
+            '0.003,5.0,channel,device,"joystick, axes",0\n'
+            "0.004,5.1,sample,,0,0.25 0.75\n"
+        )
+        lr = _make_logreader(session_file_path=csv_file)
+        lr.reload_session()
+        assert [row["value"] for row in lr.joystick_inputs] == [(0.5, -0.25), (0.25, 0.75)]
+        assert lr.states == []
+
     def test_ignores_blacklisted_plugins(self, tmp_path):
         """Events from IGNORE_PLUGINS are skipped."""
         csv_file = tmp_path / "session.csv"
@@ -181,6 +227,21 @@ class TestReloadSession:
         assert len(lr.states) == 1
         assert lr.states[0]["value"] == (110.0,)
 
+    def test_expands_channel_samples(self, tmp_path):
+        """Compact channel samples are read as the matching state rows."""
+        csv_file = tmp_path / "session.csv"
+        csv_file.write_text(
+            "logtime,scenario_time,type,module,address,value\n"
+            "0.000,0.0,event,track,self,start\n"
+            '0.001,0.0,channel,track,"reticle, cursor_proportional",0\n'
+            "0.002,5.0,sample,,0,0.1 -0.2\n"
+            "0.003,10.0,event,track,self,stop\n"
+        )
+        lr = _make_logreader(session_file_path=csv_file)
+        lr.reload_session()
+        assert len(lr.states) == 1
+        assert (lr.states[0]["module"], lr.states[0]["value"]) == ("track", (0.1, -0.2))
+
     def test_session_duration_from_logtime(self, tmp_path):
         """session_duration is based on normalized logtime, not scenario_time."""
         csv_file = tmp_path / "session.csv"
@@ -433,3 +494,23 @@ class TestReplayToScenarioTime:
         lr.blocking_segments = [(5.0, 15.0, 5.0)]
         lr._build_replay_mapping()
         assert lr.replay_to_scenario_time(0.0) == 0.0
+
+
+# ── write_expanded_session ───────────────────────
+
+
+class TestWriteExpandedSession:
+    def test_legacy_layout(self, tmp_path):
+        """The expanded file has the state rows in place of the channel and sample rows."""
+        csv_file = tmp_path / "1_session.csv"
+        csv_file.write_text(
+            "logtime,scenario_time,type,module,address,value\n"
+            '0.001,0.0,channel,track,"reticle, cursor_relative",0\n'
+            "0.002,5.0,sample,,0,3.5 -2.0\n"
+        )
+        output = write_expanded_session(csv_file)
+        assert output.name == "1_session_expanded.csv"
+        assert output.read_text().splitlines() == [
+            "logtime,scenario_time,type,module,address,value",
+            '0.002,5.0,state,track,"reticle, cursor_relative","(3.5, -2.0)"',
+        ]
@@ -0,0 +1,161 @@
+"""Tests for core.lslstream - Batched LSL session streaming."""
+
+from time import perf_counter
+from types import SimpleNamespace
+
+from core.lslstream import LslStreamer, get_continuous_states, measure_clock_offset
+
+CLOCK_SHIFT = 1000.0
+
+
+class LoopbackLsl:
+    """In-process pylsl stand-in: each outlet feeds an inlet list of (sample, timestamp)."""
+
+    def __init__(self):
+        self.inlets = {}
+        self.chunk_sizes = []
+
+    def local_clock(self):
+        return perf_counter() + CLOCK_SHIFT
+
+    def StreamInfo(self, name, **kwargs):
+        return dict(name=name, **kwargs)
+
+    def StreamOutlet(self, info):
+        lsl = self
+        inlet = self.inlets.setdefault(info["type"], [])
+
+        class Outlet:
+            """The pylsl 1.16.1 outlet methods: the pushed samples reach the inlet when flushed (pushthrough)."""
+
+            def __init__(self):
+                self.pending = []
+
+            def push_sample(self, x, timestamp=0.0, pushthrough=True):
+                self.pending.append((x, float(timestamp)))
+                if pushthrough:
+                    self.flush()
+
+            def push_chunk(self, x, timestamp=0.0, pushthrough=True):
+                # A single timestamp (converted as a c_double), given to every sample of an irregular stream
+                self.pending.extend((sample, float(timestamp)) for sample in x)
+                if pushthrough:
+                    self.flush()
+
+            def flush(self):
+                lsl.chunk_sizes.append(len(self.pending))
+                inlet.extend(self.pending)
+                self.pending = []
+
+        return Outlet()
+
+
+def _row(logtime, type, module, address, value):
+    return dict(logtime=logtime, scenario_time=0, type=type, module=module, address=address, value=value)
+
+
+def _stream(rows):
+    lsl = LoopbackLsl()
+    streamer = LslStreamer(lsl)
+    for row in rows:
+        streamer.push_row(row)
+    streamer.start()
+    streamer.stop()
+    return lsl, streamer
+
+
+class TestClockOffset:
+    def test_offset_maps_to_lsl_clock(self):
+        """The measured offset maps perf_counter times to the LSL clock."""
+        offset = measure_clock_offset(lambda: perf_counter() + CLOCK_SHIFT)
+        assert abs(offset - CLOCK_SHIFT) < 0.001
+
+
+class TestMarkerStream:
+    def test_rows_are_streamed_as_markers(self):
+        """Every row is received as a marker, stamped at its logtime."""
+        lsl, _ = _stream([_row(1.5, "event", "sysmon", "self", "start")])
+        ((sample, timestamp),) = lsl.inlets["Markers"]
+        assert sample == ["1.5;0;event;sysmon;self;start"]
+        assert abs(timestamp - (1.5 + CLOCK_SHIFT)) < 0.001
+
+    def test_plugin_marker(self):
+        """A plugin marker is streamed with its own time."""
+        lsl = LoopbackLsl()
+        streamer = LslStreamer(lsl)
+        streamer.start()
+        streamer.push_marker("block_1", 2.0)
+        streamer.stop()
+        ((sample, timestamp),) = lsl.inlets["Markers"]
+        assert sample == ["block_1"]
+        assert abs(timestamp - (2.0 + CLOCK_SHIFT)) < 0.001
+
+    def test_rows_are_batched(self):
+        """Queued rows are pushed together, in a single chunk."""
+        lsl, _ = _stream([_row(float(i), "event", "sysmon", "self", "start") for i in range(10)])
+        assert lsl.chunk_sizes == [10]
+        assert [s[0] for s, _ in lsl.inlets["Markers"]] == [f"{i}.0;0;event;sysmon;self;start" for i in range(10)]
+
+    def test_push_error_is_reported(self, capsys):
+        """A failing push is reported, instead of silently ending the worker thread."""
+        lsl = LoopbackLsl()
+        streamer = LslStreamer(lsl)
+
+        def fail(*args, **kwargs):
+            raise TypeError("must be real number, not list")
+
+        streamer.marker_outlet.push_sample = fail
+        streamer.push_row(_row(1.0, "event", "sysmon", "self", "start"))
+        streamer.items.put(None)
+        streamer.run()
+        assert streamer.errors == 1
+        assert "must be real number" in capsys.readouterr().out
+
+
+class TestContinuousStream:
+    def test_typed_channels(self):
+        """The continuous outlet has one float channel per tracked state."""
+        _, streamer = _stream([])
+        assert streamer.channels[:2] == ["track_cursor_x", "track_cursor_y"]
+        assert "resman_tank_a" in streamer.channels
+
+    def test_states_sample_and_hold(self):
+        """Each tracked state change emits a sample holding the other channels."""
+        lsl, streamer = _stream(
+            [
+                _row(1.0, "state", "track", "reticle, cursor_proportional", (0.25, -0.5)),
+                _row(1.1, "state", "sysmon", "light_1, background", "red"),
+                _row(1.2, "state", "resman", "tank_a, fluid_level", 2500),
+            ]
+        )
+        samples = lsl.inlets["States"]
+        assert len(samples) == 2
+        tank_a = streamer.channels.index("resman_tank_a")
+        last, timestamp = samples[-1]
+        assert last[:2] == [0.25, -0.5]
+        assert last[tank_a] == 2500.0
+        assert abs(timestamp - (1.2 + CLOCK_SHIFT)) < 0.001
+
+    def test_scenario_tanks(self):
+        """The tank channels follow the network given, including the tanks declared by the scenario."""
+        streamer = LslStreamer(LoopbackLsl(), states=get_continuous_states("abg"))
+        assert streamer.channels == [
+            "track_cursor_x",
+            "track_cursor_y",
+            "resman_tank_a",
+            "resman_tank_b",
+            "resman_tank_g",
+        ]
+        streamer.update_channels(_row(1.0, "state", "resman", "tank_g, fluid_level", 300))
+        assert streamer.values[-1] == 300.0
+
+    def test_labstreaminglayer_tanks(self):
+        """The plugin streams the tanks of the loaded resman network."""
+        from plugins.labstreaminglayer import Labstreaminglayer
+
+        plugin = object.__new__(Labstreaminglayer)
+        plugin.plugins = {}
+        assert plugin.get_tank_letters() == list("abcdef")
+        resman = SimpleNamespace(parameters={"tank": {"a": {}, "g": {}}})
+        plugin.on_scenario_loaded(SimpleNamespace(plugins={"resman": resman}))
+        assert plugin.get_tank_letters() == ["a", "g"]
@@ -1,8 +1,22 @@
 """Tests for plugins.parallelport - Trigger state machine logic."""
 
+import threading
+from time import perf_counter
 from unittest.mock import MagicMock, patch
 
-from plugins.parallelport import Parallelport
+from plugins.parallelport import Parallelport, TriggerThread
+
+
+class FakePort:
+    """A parallel port recording the (time, value) of each setData call."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def setData(self, value):
+        with self.lock:
+            self.calls.append((perf_counter(), value))
 
 
 def _make_pp(**overrides):
@@ -184,3 +198,81 @@ class TestFullLifecycle:
         pp.compute_next_plugin_state()
         pp._port.setData.assert_called_with(0)  # reset
         assert pp._last_trigger == 0
+
+
+# ── TriggerThread ─────────────────────────────────
+
+
+class TestTriggerThread:
+    def test_pulse_width(self):
+        """A pulse raises the port then lowers it after delayms."""
+        port = FakePort()
+        thread = TriggerThread(port)
+        thread.start()
+        thread.send(42, 5)
+        thread.stop()
+        (up_time, up), (down_time, down) = port.calls
+        assert (up, down) == (42, 0)
+        assert 0.005 <= down_time - up_time < 0.008
+
+    def test_pulses_are_sent_in_order(self):
+        """Pulses are sent one at a time, without overlapping."""
+        port = FakePort()
+        thread = TriggerThread(port)
+        thread.start()
+        thread.send(10, 2)
+        thread.send(20, 2)
+        thread.stop()
+        assert [value for _, value in port.calls] == [10, 0, 20, 0]
+
+    def test_edges_are_timestamped(self):
+        """Each edge is queued with the time it was sent."""
+        port = FakePort()
+        thread = TriggerThread(port, downvalue=0)
+        thread.start()
+        thread.send(7, 1)
+        thread.stop()
+        edges = thread.pop_edges()
+        assert [value for _, value in edges] == [7, 0]
+        assert all(abs(edge[0] - call[0]) < 0.001 for edge, call in zip(edges, port.calls))
+        assert thread.pop_edges() == []
+
+
+class TestThreadedParallelport:
+    def _make_threaded_pp(self):
+        port = FakePort()
+        thread = TriggerThread(port)
+        thread.start()
+        return _make_pp(_port=port, _trigger_thread=thread, alive=True), port
+
+    def test_trigger_is_sent_by_thread(self):
+        """The trigger parameter is sent as a pulse by the thread and reset."""
+        pp, port = self._make_threaded_pp()
+        pp.parameters["trigger"] = 99
+        pp.compute_next_plugin_state()
+        assert pp.parameters["trigger"] == 0
+        pp._trigger_thread.stop()
+        assert [value for _, value in port.calls] == [99, 0]
+
+    def test_trigger_event_queued_at_once(self):
+        """A trigger event queues the pulse when executed, without waiting for the plugin update."""
+        pp, port = self._make_threaded_pp()
+        pp.keys = set()
+        pp.next_refresh_time = 10.0  # No plugin update before the pulse is sent
+        pp.set_parameter("trigger", 7)
+        assert pp.parameters["trigger"] == 0
+        pp._trigger_thread.stop()
+        assert [value for _, value in port.calls] == [7, 0]
+
+    @patch("plugins.parallelport.get_logger")
+    def test_edges_logged_at_edge_time(self, mock_get_logger):
+        """Edges are logged from the main thread with their actual time."""
+        pp, port = self._make_threaded_pp()
+        pp.set_trigger_value(12)
+        pp._trigger_thread.stop()
+        pp.log_trigger_edges()
+        calls = mock_get_logger.return_value.record_state.call_args_list
+        assert [c.args[2] for c in calls] == [12, 0]
+        logtimes = [c.kwargs["logtime"] for c in calls]
+        assert all(abs(logtime - call[0]) < 0.001 for logtime, call in zip(logtimes, port.calls))
+        assert pp._last_trigger == 0
@@ -3,6 +3,8 @@
 import random
 from unittest.mock import patch
 
+import pytest
+
 
 class TestPluginAliasToInt:
     def test_communications(self):
@@ -100,3 +102,113 @@ class TestRandomFunctions:
 
         result = randint(1, 10, "communications", 100)
         assert 1 <= result <= 10
+
+
+@pytest.fixture
+def counter_mode():
+    """Run a test in counter mode, then restore the configured mode."""
+    from core import pseudorandom
+
+    pseudorandom.set_mode("counter")
+    yield pseudorandom
+    pseudorandom.set_mode(None)
+
+
+class TestSplitmix64:
+    def test_reference_output(self):
+        """First output of the reference splitmix64 generator seeded with 0."""
+        from core.pseudorandom import splitmix64
+
+        assert splitmix64(0) == 0xE220A8397B1DCDAF
+
+
+class TestCounterRandom:
+    def test_same_key_same_outputs(self):
+        """A stream is fully defined by its key."""
+        from core.pseudorandom import CounterRandom
+
+        a, b = CounterRandom(42), CounterRandom(42)
+        assert [a.random() for _ in range(5)] == [b.random() for _ in range(5)]
+
+    def test_reseed_restarts_stream(self):
+        """Seeding resets the counter."""
+        from core.pseudorandom import CounterRandom
+
+        rng = CounterRandom(7)
+        first = [rng.randint(0, 1000) for _ in range(3)]
+        rng.seed(7)
+        assert [rng.randint(0, 1000) for _ in range(3)] == first
+
+    def test_unit_interval(self):
+        """random() stays in [0, 1)."""
+        from core.pseudorandom import CounterRandom
+
+        rng = CounterRandom(3)
+        assert all(0 <= rng.random() < 1 for _ in range(1000))
+
+    def test_getrandbits(self):
+        """getrandbits returns exactly k bits, also beyond 64."""
+        from core.pseudorandom import CounterRandom
+
+        rng = CounterRandom(3)
+        assert all(rng.getrandbits(100) < 2**100 for _ in range(100))
+
+    def test_counter_index_matches_choice(self):
+        """The index computed from a key is the one a seeded generator draws, for any population size."""
+        from core.pseudorandom import CounterRandom, counter_index, splitmix64
+
+        for key in map(splitmix64, range(200)):
+            for size in (1, 2, 3, 5, 8, 255):
+                assert counter_index(key, size) == CounterRandom(key).choice(range(size))
+
+
+class TestCounterMode:
+    @patch("core.pseudorandom.get_logger")
+    def test_global_random_untouched(self, mock_logger, counter_mode):
+        """Counter draws do not reseed the global random module."""
+        random.seed(123)
+        state = random.getstate()
+        counter_mode.sample([1, 2, 3], "sysmon", 10, 1)
+        assert random.getstate() == state
+
+    @patch("core.pseudorandom.get_logger")
+    def test_deterministic(self, mock_logger, counter_mode):
+        """Same (session, plugin, time, add) gives the same output."""
+        items = list(range(100))
+        assert counter_mode.choice(items, "sysmon", 10, 2) == counter_mode.choice(items, "sysmon", 10, 2)
+
+    @patch("core.pseudorandom.get_logger")
+    def test_streams_differ(self, mock_logger, counter_mode):
+        """Plugin, time and add each change the stream key."""
+        keys = {
+            counter_mode.stream_key("sysmon", 10, 1),
+            counter_mode.stream_key("communications", 10, 1),
+            counter_mode.stream_key("sysmon", 11, 1),
+            counter_mode.stream_key("sysmon", 10, 2),
+        }
+        assert len(keys) == 4
+
+    @patch("core.pseudorandom.get_logger")
+    def test_logs_stream_key(self, mock_logger, counter_mode):
+        """The logged seed is the stream key."""
+        output = counter_mode.uniform(0, 1, "communications", 5, 3)
+        mock_logger.return_value.record_a_pseudorandom_value.assert_called_once_with(
+            "communications", counter_mode.stream_key("communications", 5, 3), output
+        )
+
+
+class TestLegacyMode:
+    @patch("core.pseudorandom.get_logger")
+    def test_reproduces_global_reseeding(self, mock_logger):
+        """The legacy mode gives the draws of a reseeded global random module."""
+        from core import pseudorandom
+
+        pseudorandom.set_mode("legacy")
+        try:
+            items = list(range(100))
+            output = pseudorandom.choice(items, "sysmon", 10, 2)
+            seed = pseudorandom.set_seed("sysmon", 10, 2)
+            assert output == random.choice(items)
+            assert mock_logger.return_value.record_a_pseudorandom_value.call_args[0][1] == seed
+        finally:
+            pseudorandom.set_mode(None)
@@ -0,0 +1,153 @@
+"""Tests for core.relayout - Geometry rescaling of containers, widgets and plugins on window resize."""
+
+from unittest.mock import MagicMock, patch
+
+from core.container import Container
+from core.relayout import Relayout, rescale, rescale_container, scale_geometry, scale_pairs, scale_value
+from core.window import Window
+
+
+class TestScaleHelpers:
+    def test_scale_pairs(self):
+        """x coordinates follow sx, y coordinates follow sy."""
+        assert scale_pairs((10, 20, 30, 40), 2, 0.5) == [20, 10, 60, 20]
+
+    def test_scale_value_axes(self):
+        """Scalars and sequences are scaled along their declared axis."""
+        assert scale_value(10, "x", 2, 3) == 20
+        assert scale_value(10, "y", 2, 3) == 30
+        assert scale_value([1, 2], "y", 2, 3) == [3, 6]
+        assert scale_value((1, 2), "xy", 2, 3) == (2, 6)
+
+    def test_rescale_container_keeps_name(self):
+        """A scaled container keeps its name, so layout lookups still work."""
+        o = type("Obj", (), {})()
+        c = rescale_container(o, "container", Container("topmid", 10, 20, 100, 50), Relayout((1, 1), (2, 2)))
+        assert c.name == "topmid"
+        assert c.get_lbwh() == (20, 40, 200, 100)
+
+    def test_shared_containers_stay_shared(self):
+        """A container referenced by two objects is scaled into a single new container."""
+        relayout = Relayout((1, 1), (2, 2))
+        a, b = type("Obj", (), {})(), type("Obj", (), {})()
+        c = Container("c", 0, 0, 10, 10)
+        assert rescale_container(a, "container", c, relayout) is rescale_container(b, "container", c, relayout)
+
+    def test_scale_geometry(self):
+        """Containers, dicts of containers and declared attributes are rescaled."""
+
+        class Obj:
+            pass
+
+        o = Obj()
+        o.container = Container("c", 0, 0, 10, 10)
+        o.containers = {"a": Container("a", 0, 0, 10, 10)}
+        o.radius = 5
+        o.color = (255, 0, 0, 255)
+        scale_geometry(o, {"radius": "x"}, Relayout((1, 1), (2, 3)))
+        assert o.container.get_lbwh() == (0, 0, 20, 30)
+        assert o.containers["a"].get_lbwh() == (0, 0, 20, 30)
+        assert o.radius == 10
+        assert o.color == (255, 0, 0, 255)
+
+
+class TestReferences:
+    def _resize_many(self, o, scales):
+        """Rescale the object through successive absolute scales."""
+        previous = (1.0, 1.0)
+        for scale in scales:
+            scale_geometry(o, {"radius": "x"}, Relayout(previous, scale))
+            previous = scale
+
+    def test_no_drift_over_repeated_resizes(self):
+        """Values are computed from their reference: back to the reference size, they are exact."""
+        o = type("Obj", (), {})()
+        o.container = Container("c", 13.7, 21.1, 333.3, 77.7)
+        o.radius = 12.345
+        self._resize_many(o, [(0.7, 1.3), (1.1, 0.9), (0.37, 2.9)] * 50 + [(1.0, 1.0)])
+        assert o.container.get_lbwh() == (13.7, 21.1, 333.3, 77.7)
+        assert o.radius == 12.345
+
+    def test_changed_value_becomes_reference(self):
+        """A value changed by a state update between resizes is rescaled from its new value."""
+        o = type("Obj", (), {})()
+        assert rescale(o, "cursor", (10.0, 10.0), "xy", Relayout((1, 1), (2, 2))) == (20.0, 20.0)
+        assert rescale(o, "cursor", (30.0, 30.0), "xy", Relayout((2, 2), (1, 1))) == (15.0, 15.0)
+        assert rescale(o, "cursor", (15.0, 15.0), "xy", Relayout((1, 1), (3, 3))) == (45.0, 45.0)
+
+
+class TestWidgetRelayout:
+    def test_vertices_and_labels_rescaled(self, mock_logger, mock_window):
+        """Vertex definitions, batch vertex lists and labels positions are rescaled, colours are not."""
+        from core.widgets.abstractwidget import AbstractWidget
+
+        w = AbstractWidget("test_widget", Container("c", 0, 0, 100, 100))
+        w.add_quad("quad", MagicMock(), (0, 100, 100, 100, 100, 0, 0, 0), (1, 2, 3, 4) * 4)
+        label = MagicMock(x=50, y=50, z=0, multiline=False)
+        w.vertex["label"] = label
+        vlist = MagicMock()
+        vlist.position = [0.0, 100.0, 100.0, 100.0]
+        w.on_batch["line"] = vlist
+
+        w.relayout(Relayout((1, 1), (2, 0.5)))
+
+        assert w.vertex["quad"][2] == (0, 50, 200, 50, 200, 0, 0, 0)
+        assert w.vertex["quad"][3] == (1, 2, 3, 4) * 4
+        assert label.position == (100, 25, 0)
+        assert vlist.position == [0.0, 50.0, 200.0, 50.0]
+        assert w.container.get_lbwh() == (0, 0, 200, 50)
+
+
+class TestPluginRelayout:
+    def test_widgets_relayouted_and_aoi_logged(self):
+        """Each widget is rescaled and its new area of interest logged."""
+        from plugins.abstractplugin import AbstractPlugin
+
+        p = object.__new__(AbstractPlugin)
+        p.container = Container("topmid", 0, 0, 100, 100)
+        widget = MagicMock()
+        widget.container = Container("w", 0, 0, 10, 10)
+        p.widgets = {"plugin_w": widget}
+        p.logger = MagicMock()
+        p.relayout(Relayout((1, 1), (2, 2)))
+        assert p.container.get_lbwh() == (0, 0, 200, 200)
+        widget.relayout.assert_called_once()
+        p.logger.record_aoi.assert_called_once_with(widget.container, "plugin_w")
+
+
+class TestWindowResize:
+    def _make_window(self):
+        w = object.__new__(Window)
+        w.width, w.height = 1000, 500
+        w.relayout_listeners = []
+        w.background_vertices = []
+        w._layout_size = (1000, 500)
+        return w
+
+    def _resize(self, w, width, height):
+        """Resize the window, its layout being recomputed for the new size."""
+        w.width, w.height = width, height
+        with patch.object(Window, "get_layout"):
+            w.on_resize(width, height)
+        w._layout_size = (width, height)
+
+    def test_resize_scales_from_reference_size(self):
+        """Each resize passes the scale relative to the first layout size, and the previous one."""
+        w = self._make_window()
+        listener = MagicMock()
+        w.add_relayout_listener(listener)
+        self._resize(w, 2000, 250)
+        self._resize(w, 500, 1000)
+        first, second = (c.args[0] for c in listener.call_args_list)
+        assert (first.previous, (first.sx, first.sy)) == ((1.0, 1.0), (2.0, 0.5))
+        assert (second.previous, (second.sx, second.sy)) == ((2.0, 0.5), (0.5, 2.0))
+
+    def test_same_size_or_minimized_is_ignored(self):
+        """No relayout when the size does not change or the window is minimized."""
+        w = self._make_window()
+        listener = MagicMock()
+        w.add_relayout_listener(listener)
+        w.on_resize(1000, 500)
+        w.on_resize(0, 0)
+        listener.assert_not_called()
+        assert w._layout_size == (1000, 500)
@@ -314,3 +314,60 @@ class TestCleanupAfterSeek:
         blocker.stop.assert_called_once()
         assert rs.pause_scenario_time is False
         mock_dialog.on_delete.assert_called_once()
+
+
+class TestSubSteppedUpdate:
+    def _make(self):
+        rs = _make_replay(is_paused=False, target_time=300)
+        rs.time = MagicMock()
+        rs.clock.get_speed.return_value = 1
+        rs.replay_inputs = MagicMock()
+        rs.slider.hover = False
+        rs.sliding = False
+        return rs
+
+    def test_long_frame_is_sub_stepped(self):
+        """A speeded up frame is processed in CLOCK_STEP sub-steps, refreshing widgets only at the last."""
+        rs = self._make()
+        with patch("core.replayscheduler.Scheduler.update") as sched_update:
+            rs.update(1.6)
+        assert sched_update.call_count == 16
+        assert [c.kwargs["refresh"] for c in sched_update.call_args_list] == [False] * 15 + [True]
+        assert rs.replay_inputs.call_count == 16
+        assert rs.replay_time == pytest.approx(1.6)
+
+    def test_short_frame_single_step(self):
+        """A normal frame is a single refreshed step."""
+        rs = self._make()
+        with patch("core.replayscheduler.Scheduler.update") as sched_update:
+            rs.update(0.016)
+        sched_update.assert_called_once()
+        assert sched_update.call_args.kwargs["refresh"] is True
+
+    def test_speed_displayed(self):
+        """The speed factor is displayed before the time when not 1."""
+        rs = self._make()
+        rs.clock.get_speed.return_value = 100
+        rs.update_time_string()
+        rs.time.set_text.assert_called_once_with("x100 00:00:00.000")
+
+
+class TestOrderedKeyboardReplay:
+    def test_every_key_replayed_once_in_order(self):
+        """Keys are replayed in the logged order, once, even when a sub-step spans several of them."""
+        plugin = MagicMock()
+        rs = _make_replay(plugins={"sysmon": plugin}, _key_cursor=0, keys_history=[], _keys_history_changed=False)
+        rs.key_widget = MagicMock()
+        rs.logreader.keyboard_inputs = [
+            {"address": "F1", "value": "press"},
+            {"address": "F1", "value": "release"},
+            {"address": "F2", "value": "press"},
+        ]
+        rs._key_logtimes = [0.01, 0.05, 0.5]
+        rs.replay_time = 0.3
+        rs.emulate_keyboard_inputs()
+        rs.replay_time = 0.6
+        rs.emulate_keyboard_inputs()
+        rs.emulate_keyboard_inputs()
+        calls = [c.args for c in plugin.do_on_key.call_args_list]
+        assert calls == [("F1", "press", True), ("F1", "release", True), ("F2", "press", True)]
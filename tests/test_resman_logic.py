@@ -5,9 +5,12 @@ get_pump_by_key, do_on_key, pump color determination) using object.__new__()
 to bypass __init__.
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from core.constants import COLORS as C
+from core.event import Event
 from plugins.resman import Resman
 
 
@@ -27,6 +30,7 @@ def _make_resman(**overrides):
     r.performance = {}
     r.logger = MagicMock()
     r.wait_before_leak = 0  # Skip initial wait
+    r.fluid_time = -2.0  # Levels integrated up to one update period before the first update
 
     r.parameters = dict(
         taskupdatetime=2000,
@@ -77,14 +81,14 @@ def _make_resman(**overrides):
         ),
         pump=dict(
             [
-                ("1", dict(flow=800, state="off", key="NUM_1", _fromtank="c", _totank="a")),
-                ("2", dict(flow=600, state="off", key="NUM_2", _fromtank="e", _totank="a")),
-                ("3", dict(flow=800, state="off", key="NUM_3", _fromtank="d", _totank="b")),
-                ("4", dict(flow=600, state="off", key="NUM_4", _fromtank="f", _totank="b")),
-                ("5", dict(flow=600, state="off", key="NUM_5", _fromtank="e", _totank="c")),
-                ("6", dict(flow=600, state="off", key="NUM_6", _fromtank="f", _totank="d")),
-                ("7", dict(flow=400, state="off", key="NUM_7", _fromtank="a", _totank="b")),
-                ("8", dict(flow=400, state="off", key="NUM_8", _fromtank="b", _totank="a")),
+                ("1", dict(flow=800, state="off", key="NUM_1", fromtank="c", totank="a")),
+                ("2", dict(flow=600, state="off", key="NUM_2", fromtank="e", totank="a")),
+                ("3", dict(flow=800, state="off", key="NUM_3", fromtank="d", totank="b")),
+                ("4", dict(flow=600, state="off", key="NUM_4", fromtank="f", totank="b")),
+                ("5", dict(flow=600, state="off", key="NUM_5", fromtank="e", totank="c")),
+                ("6", dict(flow=600, state="off", key="NUM_6", fromtank="f", totank="d")),
+                ("7", dict(flow=400, state="off", key="NUM_7", fromtank="a", totank="b")),
+                ("8", dict(flow=400, state="off", key="NUM_8", fromtank="b", totank="a")),
             ]
         ),
     )
@@ -112,8 +116,8 @@ class TestTankDepletion:
         r = _make_resman()
         initial_a = r.parameters["tank"]["a"]["level"]
         _run_one_update(r)
-        # 800 * (2/60) = 26.66 → int = 26
-        assert r.parameters["tank"]["a"]["level"] == initial_a - 26
+        # 800 * (2/60) = 26.66 (no truncation)
+        assert r.parameters["tank"]["a"]["level"] == pytest.approx(initial_a - 800 * 2 / 60)
 
     def test_both_target_tanks_deplete(self):
         """Both target tanks A and B deplete."""
@@ -279,15 +283,15 @@ class TestGetPumpByKey:
         r = _make_resman()
         pump = r.get_pump_by_key("NUM_1")
         assert pump is not None
-        assert pump["_fromtank"] == "c"
-        assert pump["_totank"] == "a"
+        assert pump["fromtank"] == "c"
+        assert pump["totank"] == "a"
 
     def test_find_pump_8(self):
         """NUM_8 finds pump 8 (b->a)."""
         r = _make_resman()
         pump = r.get_pump_by_key("NUM_8")
-        assert pump["_fromtank"] == "b"
-        assert pump["_totank"] == "a"
+        assert pump["fromtank"] == "b"
+        assert pump["totank"] == "a"
 
     def test_not_found_returns_none(self):
         """Invalid key returns None."""
@@ -489,3 +493,119 @@ class TestMultiUpdateSimulation:
         assert "a_deviation" in r.performance
         assert "b_deviation" in r.performance
         assert "a_in_tolerance" in r.performance
+
+
+# ──────────────────────────────────────────────
+# Continuous fluid integration
+# ──────────────────────────────────────────────
+class TestFluidIntegration:
+    """Test the levels integration between updates."""
+
+    def test_refresh_integrates_to_frame_time(self):
+        """Levels follow the frame time between two updates."""
+        r = _make_resman(fluid_time=0.0, visible=False)
+        r.scenario_time = 0.5
+        r.refresh_widgets()
+        assert r.parameters["tank"]["a"]["level"] == pytest.approx(2500 - 800 * 0.5 / 60)
+        assert r.fluid_time == 0.5
+
+    def test_same_levels_whatever_the_frame_rate(self):
+        """Integrating at each frame or once per update gives the same levels."""
+        a, b = _make_resman(fluid_time=0.0, visible=False), _make_resman(fluid_time=0.0, visible=False)
+        for r in (a, b):
+            r.parameters["pump"]["2"]["state"] = "on"
+        for frame in range(1, 121):
+            a.scenario_time = frame / 60
+            a.refresh_widgets()
+        b.scenario_time = 2.0
+        b.refresh_widgets()
+        assert a.parameters["tank"]["a"]["level"] == pytest.approx(b.parameters["tank"]["a"]["level"])
+
+    def test_key_press_integrates_before_toggle(self):
+        """The period before a pump toggle flows with the former pump state."""
+        r = _make_resman(fluid_time=0.0, visible=False)
+        r.scenario_time = 1.0
+        with patch("plugins.abstractplugin.AbstractPlugin.do_on_key", return_value="NUM_2"):
+            r.do_on_key("NUM_2", "press", emulate=False)  # e → a switched on at 1 s
+        r.scenario_time = 2.0
+        r.refresh_widgets()
+        assert r.parameters["tank"]["a"]["level"] == pytest.approx(2500 - 800 * 2 / 60 + 600 / 60)
+
+    def test_no_flow_while_paused(self):
+        """Nothing flows while the plugin is paused."""
+        r = _make_resman(fluid_time=0.0, visible=False)
+        r.paused = True
+        r.scenario_time = 10.0
+        r.refresh_widgets()
+        assert r.parameters["tank"]["a"]["level"] == 2500
+
+
+# ──────────────────────────────────────────────
+# Network topology
+# ──────────────────────────────────────────────
+def _events(*commands):
+    """Build resman events from (address, value) commands."""
+    return [Event(i + 1, 0, "resman", list(command)) for i, command in enumerate(commands)]
+
+
+class TestNetworkTopology:
+    """Test the tanks and pumps declared by the scenario."""
+
+    def test_declare_tank_and_pump(self):
+        """A new tank and a new connected pump are created, with their validation."""
+        r = _make_resman(validation_dict=dict())
+        errors = r.declare_parameters(_events(("tank-g-max", "3000"), ("pump-9-fromtank", "g"), ("pump-9-totank", "a")))
+        assert errors == []
+        assert r.parameters["tank"]["g"]["level"] == 0
+        assert r.parameters["pump"]["9"]["state"] == "off"
+        assert "tank-g-depletable" in r.validation_dict
+        assert r.validation_dict["pump-9-fromtank"][0]("g", r.validation_dict["pump-9-fromtank"][1])[1] is None
+
+    def test_existing_parameters_are_kept(self):
+        """Mentioning a tank or pump of the network does not reset it."""
+        r = _make_resman(validation_dict=dict())
+        assert r.declare_parameters(_events(("tank-a-level", "1000"), ("pump-1-flow", "300"))) == []
+        assert r.parameters["tank"]["a"]["level"] == 2500
+        assert len(r.parameters["pump"]) == 8
+
+    def test_pump_must_be_connected(self):
+        """A new pump without a totank parameter is an error."""
+        r = _make_resman(validation_dict=dict())
+        errors = r.declare_parameters(_events(("pump-9-fromtank", "c")))
+        assert len(errors) == 1
+        assert "totank" in errors[0]
+
+    def test_invalid_names(self):
+        """Tanks are named by a lowercase letter, pumps by an integer."""
+        r = _make_resman(validation_dict=dict())
+        errors = r.declare_parameters(_events(("tank-G-max", "3000"), ("tank-gh-max", "3000"), ("pump-x-flow", "1")))
+        assert len(errors) == 3
+        assert set(r.parameters["tank"]) == set("abcdef")
+
+    def test_declared_pump_flows(self):
+        """The compiled network includes the declared tanks and pumps."""
+        r = _make_resman(validation_dict=dict())
+        r.declare_parameters(_events(("pump-9-fromtank", "g"), ("pump-9-totank", "c"), ("tank-g-level", "500")))
+        r.parameters["pump"]["9"].update(fromtank="g", totank="c", flow=600, state="on")
+        r.parameters["tank"]["g"]["level"] = 500
+        r.fluid = r.compile_fluid_network()
+        _run_one_update(r)
+        assert r.parameters["tank"]["c"]["level"] == pytest.approx(1000 + 600 * 2 / 60)
+        assert r.parameters["tank"]["g"]["level"] == pytest.approx(500 - 600 * 2 / 60)
+
+    def test_default_layout(self):
+        """The default network keeps its fixed layout."""
+        r = _make_resman()
+        assert r.get_tank_layout()["a"] == (0.14, 0.15, "upper")
+        assert r.get_tank_layout()["f"] == (0.8, 0.12, "lower")
+
+    def test_extended_layout(self):
+        """Other networks place the target tanks above the others, without overlap."""
+        r = _make_resman(validation_dict=dict())
+        r.declare_parameters(_events(("tank-g-max", "3000"), ("tank-h-target", "1000")))
+        r.parameters["tank"]["h"]["target"] = 1000
+        layout = r.get_tank_layout()
+        assert [k for k, v in layout.items() if v[2] == "upper"] == ["a", "b", "h"]
+        lower = sorted(v[:2] for v in layout.values() if v[2] == "lower")
+        assert len(lower) == 5
+        assert all(left + width < next_left for (left, width), (next_left, _) in zip(lower, lower[1:]))
@@ -246,3 +246,43 @@ class TestGetPluginMethods:
         methods = s.get_plugin_methods("sysmon")
         assert "start" in methods
         assert "stop" in methods
+
+
+class TestCheckEvent:
+    def test_valid_parameter_is_evaluated(self):
+        """A valid parameter event has its value replaced by its evaluated version."""
+        mock_plugin = MagicMock()
+        mock_plugin.parameters = {"taskupdatetime": 50}
+        mock_plugin.validation_dict = {}
+        s = _make_scenario(plugins={"track": mock_plugin})
+        e = Event(0, 0, "track", ["taskupdatetime", "20"])
+        assert s.check_event(e) == []
+        assert e.command[1] == 20
+
+    def test_invalid_value(self):
+        """An unacceptable value is reported."""
+        mock_plugin = MagicMock()
+        mock_plugin.parameters = {"taskupdatetime": 50}
+        mock_plugin.validation_dict = {}
+        s = _make_scenario(plugins={"track": mock_plugin})
+        assert len(s.check_event(Event(3, 0, "track", ["taskupdatetime", "-1"]))) == 1
+
+    def test_plugin_not_loaded(self):
+        """An event for a plugin the scenario does not use is reported (e.g. an injected event)."""
+        s = _make_scenario(plugins={})
+        errors = s.check_event(Event(0, 0, "track", ["start"]))
+        assert len(errors) == 1
+        assert "track" in errors[0]
+
+    def test_check_events_collects_each_event(self):
+        """check_events reports the errors of every event."""
+        mock_plugin = MagicMock()
+        mock_plugin.blocking = True
+        mock_plugin.start = lambda: None
+        s = _make_scenario(
+            plugins={"track": mock_plugin},
+            events=[Event(1, 0, "track", ["start"]), Event(2, 1, "track", ["nomethod", "1", "2"])],
+        )
+        errors = s.check_events()
+        assert len(errors) == 1
+        assert "line 2" in errors[0]
@@ -0,0 +1,118 @@
+"""Tests for core.seedlog - Pseudorandom draws table reconstruction."""
+
+import csv
+from unittest.mock import patch
+
+import pytest
+
+from core import pseudorandom
+from core.seedlog import draw_output, reconstruct_seed_table, write_seed_table
+
+FIELDS = ["logtime", "scenario_time", "type", "module", "address", "value"]
+
+
+class CsvLogger:
+    """A logger writing the pseudorandom rows of a session in a CSV file."""
+
+    def __init__(self, path, session_id=12):
+        self.session_id = session_id
+        self.scenario_time = 0
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(FIELDS)
+        self.row_count = 0
+
+    def write(self, *row):
+        self.writer.writerow([0, self.scenario_time, *row])
+        self.row_count += 1
+
+    def record_a_pseudorandom_value(self, module, seed, output):
+        self.write("seed_value", module, "", seed)
+        self.write("seed_output", module, "", output)
+
+    def record_seed_entry(self, entry_type, module, address, value):
+        self.write(entry_type, module, address, value)
+
+    def close(self):
+        self.file.close()
+
+
+def _run_session(path, mode, compact):
+    """Draw like a short session, and return the outputs and the number of logged rows."""
+    logger = CsvLogger(path)
+    pseudorandom.set_mode(mode)
+    pseudorandom.set_compact(compact)
+    outputs = []
+    try:
+        with patch("core.pseudorandom.get_logger", return_value=logger):
+            for second in range(3):
+                logger.scenario_time = second + 0.5
+                for add in range(1, 5):
+                    outputs.append(pseudorandom.sample([1, 2, 3, 4, 5], "sysmon", logger.scenario_time, add))
+                    outputs.append(pseudorandom.choice([-1, 1], "sysmon", logger.scenario_time, add))
+                outputs.append(pseudorandom.randint(0, 3, "communications", logger.scenario_time))
+                outputs.append(pseudorandom.uniform(118.0, 136.0, "communications", logger.scenario_time, 2))
+                outputs.append(pseudorandom.choice([{"name": "NAV1"}] * 3, "communications", logger.scenario_time, 1))
+            pseudorandom.flush_draws()
+    finally:
+        pseudorandom.set_compact(None)
+        pseudorandom.set_mode(None)
+        logger.close()
+    return outputs, logger.row_count
+
+
+@pytest.mark.parametrize("mode", ["counter", "legacy"])
+class TestReconstruction:
+    def test_same_table_as_full_logging(self, tmp_path, mode):
+        """The compact rows give the seeds and outputs logged by the full logging."""
+        _run_session(tmp_path / "full.csv", mode, compact=False)
+        _run_session(tmp_path / "compact.csv", mode, compact=True)
+        full = reconstruct_seed_table(tmp_path / "full.csv")
+        compact = reconstruct_seed_table(tmp_path / "compact.csv")
+
+        assert len(full) == len(compact) == 33
+        for full_row, compact_row in zip(full, compact):
+            assert full_row["module"] == compact_row["module"]
+            assert full_row["seed"] == compact_row["seed"]
+            assert int(full_row["scenario_time"]) == compact_row["scenario_time"]
+            if not str(compact_row["output"]).startswith("#"):  # Items not logged as literals (radios dicts)
+                assert full_row["output"] == str(compact_row["output"])
+
+    def test_outputs_match_draws(self, tmp_path, mode):
+        """The regenerated outputs are the values drawn during the session."""
+        outputs, _row_count = _run_session(tmp_path / "compact.csv", mode, compact=True)
+        table = reconstruct_seed_table(tmp_path / "compact.csv")
+        assert [row["output"] for row in table if not str(row["output"]).startswith("#")] == [
+            o for o in outputs if not isinstance(o, dict)
+        ]
+
+    def test_fewer_rows(self, tmp_path, mode):
+        """The compact logging writes a few rows per plugin and second, instead of two per draw."""
+        _outputs, full_rows = _run_session(tmp_path / "full.csv", mode, compact=False)
+        _outputs, compact_rows = _run_session(tmp_path / "compact.csv", mode, compact=True)
+        assert full_rows == 66
+        assert compact_rows == 2 + 5 + 3 * 2  # Streams, specifications, and one draws row per plugin and second
+
+
+class TestDrawOutput:
+    def test_index_when_items_unknown(self):
+        """A choice over items logged by their length returns the drawn index."""
+        output = draw_output(("choice", 3), pseudorandom.CounterRandom(5))
+        assert output == f"#{pseudorandom.CounterRandom(5).choice([0, 1, 2])}"
+
+    def test_unknown_function(self):
+        """An unknown function raises a ValueError."""
+        with pytest.raises(ValueError):
+            draw_output(("shuffle", [1, 2]), pseudorandom.CounterRandom(5))
+
+
+class TestWriteSeedTable:
+    def test_writes_next_to_session(self, tmp_path):
+        """The table is written in <session>_seeds.csv."""
+        _run_session(tmp_path / "12_session.csv", "counter", compact=True)
+        path = write_seed_table(tmp_path / "12_session.csv")
+        assert path == tmp_path / "12_session_seeds.csv"
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 33
+        assert rows[0]["module"] == "sysmon"
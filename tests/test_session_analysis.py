@@ -0,0 +1,151 @@
+"""Tests for session_analysis - Performance metrics of sessions, per task and block."""
+
+import csv
+import math
+
+import pytest
+
+from core.sessionfile import compress_segment, get_segment_path
+from session_analysis import (
+    SUMMARY_FIELDS,
+    analyze_session,
+    analyze_sessions,
+    compute_metrics,
+    find_sessions,
+    get_blocks,
+    read_performance,
+    write_summary,
+    write_synthetic_session,
+)
+
+HEADER = "logtime,scenario_time,type,module,address,value\n"
+
+
+def _write_session(path, *rows):
+    """Write a session file (header and rows)."""
+    path.write_text(HEADER + "".join(f"{row}\n" for row in rows))
+
+
+def _metrics(rows, block="all"):
+    """Return the {(task, metric): value} of a block's summary rows."""
+    return {(r["task"], r["metric"]): r["value"] for r in rows if r["block"] == block}
+
+
+class TestReadPerformance:
+    def test_columns(self, tmp_path):
+        """Performance rows are gathered by task and metric, the other rows being ignored."""
+        session = tmp_path / "1_260101_100000.csv"
+        _write_session(
+            session,
+            "1.0,0.0,event,instructions,self,start",
+            "1.1,0.1,state,track_cursor,position,0.5",
+            "1.2,0.2,performance,track,center_deviation,3.0",
+            "1.3,0.3,performance,track,center_deviation,4.0",
+            "1.4,0.4,event,sysmon,self,start",
+            "1.5,0.5,performance,sysmon,signal_detection,HIT",
+        )
+        starts, columns = read_performance(session)
+        assert starts == [0.0]
+        assert columns == {
+            ("track", "center_deviation"): ([0.2, 0.3], ["3.0", "4.0"]),
+            ("sysmon", "signal_detection"): ([0.5], ["HIT"]),
+        }
+
+    def test_segmented_session(self, tmp_path):
+        """Segments are read in order, compressed or not, a truncated last row being dropped."""
+        session = tmp_path / "1_260101_100000.csv"
+        _write_session(session, "1.0,1.0,performance,track,center_deviation,1.0")
+        _write_session(get_segment_path(session, 1), "2.0,2.0,performance,track,center_deviation,2.0")
+        compress_segment(get_segment_path(session, 1))
+        _write_session(get_segment_path(session, 2), "3.0,3.0,performance,track,center_deviation,3.0", "4.0,4.0,perf")
+        _starts, columns = read_performance(session)
+        assert columns[("track", "center_deviation")] == ([1.0, 2.0, 3.0], ["1.0", "2.0", "3.0"])
+
+
+class TestBlocks:
+    def test_periods_with_performance(self, tmp_path):
+        """Blocks are the periods between blocking plugins that hold performance rows."""
+        columns = {("track", "center_deviation"): ([5.0, 6.0, 25.0], ["1", "2", "3"])}
+        assert get_blocks([0.0, 10.0, 20.0], columns) == [(0.0, 10.0), (20.0, math.inf)]
+
+    def test_without_blocking_plugin(self):
+        """A session without blocking plugin is a single block."""
+        columns = {("track", "center_deviation"): ([5.0], ["1"])}
+        assert get_blocks([], columns) == [(-math.inf, math.inf)]
+
+
+class TestComputeMetrics:
+    def test_signal_detection(self):
+        """Outcomes are counted, the accuracy being computed without the false alarms."""
+        metrics = compute_metrics("signal_detection", ["HIT", "MISS", "FA", "HIT"])
+        assert metrics == [
+            ("signal_detection_fa", 1, 4),
+            ("signal_detection_hit", 2, 4),
+            ("signal_detection_miss", 1, 4),
+            ("signal_detection_accuracy", 2 / 3, 3),
+        ]
+
+    def test_response_time_ignores_nan(self):
+        """Response times of misses (nan) are left out of the mean and median."""
+        metrics = compute_metrics("response_time", ["1000", "nan", "2000", "6000"])
+        assert metrics == [("response_time_mean", 3000.0, 3), ("response_time_median", 2000.0, 3)]
+
+    def test_deviation(self):
+        """Deviations are summarized by their mean absolute value and their root mean square."""
+        metrics = compute_metrics("a_deviation", ["-3", "4"])
+        assert metrics == [("a_deviation_mean_abs", 3.5, 2), ("a_deviation_rmse", pytest.approx(math.sqrt(12.5)), 2)]
+
+    def test_ratio(self):
+        """Booleans (logged as 1/0, or True/False in older sessions) give a proportion."""
+        assert compute_metrics("cursor_in_target", ["1", "0", "True", "False"]) == [("cursor_in_target_ratio", 0.5, 4)]
+
+    def test_descriptive_metric(self):
+        """Metrics that are not measures (names, onset times...) are not summarized."""
+        assert compute_metrics("name", ["F1", "F2"]) == []
+        assert compute_metrics("a_in_tolerance", ["nan", "nan"]) == []
+
+
+class TestAnalyzeSessions:
+    def test_blocks(self, tmp_path):
+        """Each metric is summarized over the whole session and over each block."""
+        session = tmp_path / "1_260101_100000.csv"
+        _write_session(
+            session,
+            "1.0,0.0,event,instructions,self,start",
+            "2.0,1.0,performance,track,center_deviation,2.0",
+            "3.0,2.0,event,genericscales,self,start",
+            "4.0,3.0,performance,track,center_deviation,4.0",
+        )
+        rows = analyze_session(session)
+        assert _metrics(rows)[("track", "center_deviation_mean_abs")] == 3.0
+        assert _metrics(rows, "1")[("track", "center_deviation_mean_abs")] == 2.0
+        assert _metrics(rows, "2")[("track", "center_deviation_mean_abs")] == 4.0
+        assert {r["session"] for r in rows} == {"1_260101_100000"}
+
+    def test_pool_matches_serial(self, tmp_path):
+        """Sessions analysed by the process pool give the same rows, in the same order."""
+        paths = [tmp_path / f"{n}_260101_100000.csv" for n in range(1, 4)]
+        for n, path in enumerate(paths):
+            write_synthetic_session(path, duration=20, seed=n)
+        serial = analyze_sessions(paths, workers=1)
+        assert analyze_sessions(paths, workers=2) == serial
+        assert {r["block"] for r in serial} == {"all", "1", "2"}
+
+    def test_find_sessions(self, tmp_path):
+        """Directories are searched for session files, sorted by id."""
+        for name in ("10_260101_100000.csv", "9_260101_090000.csv", "9_260101_090000.meta.json"):
+            (tmp_path / name).touch()
+        other = tmp_path / "other.csv"
+        assert [p.name for p in find_sessions([tmp_path, other])] == [
+            "9_260101_090000.csv",
+            "10_260101_100000.csv",
+            "other.csv",
+        ]
+
+    def test_write_summary(self, tmp_path):
+        """The summary is a tidy table, with rounded values."""
+        summary = tmp_path / "summary.csv"
+        write_summary([dict(session="1", block="all", task="track", metric="m", value=1 / 3, n=3)], summary)
+        with open(summary, newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows == [SUMMARY_FIELDS, ["1", "all", "track", "m", "0.333333", "3"]]
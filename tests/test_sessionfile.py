@@ -0,0 +1,96 @@
+"""Tests for core.sessionfile - Session segments, compression and reading."""
+
+import gzip
+
+from core.sessionfile import (
+    SegmentCompressor,
+    compress_segment,
+    get_metadata_path,
+    get_segment_path,
+    get_session_segments,
+    read_metadata,
+    read_session_rows,
+    write_metadata,
+)
+
+HEADER = "logtime,scenario_time,type,module,address,value\n"
+
+
+def _write_segment(path, *rows):
+    """Write a segment file (header and rows)."""
+    path.write_text(HEADER + "".join(f"{row}\n" for row in rows))
+
+
+class TestSegments:
+    def test_paths(self, tmp_path):
+        """The first segment is the session file, the next ones are numbered after it."""
+        session = tmp_path / "1_260101_100000.csv"
+        assert get_segment_path(session, 0) == session
+        assert get_segment_path(session, 2).name == "1_260101_100000.csv.002"
+
+    def test_listed_in_order(self, tmp_path):
+        """Segments are listed up to the first missing number, compressed ones being preferred."""
+        session = tmp_path / "1_session.csv"
+        for number in range(4):
+            _write_segment(get_segment_path(session, number))
+        compress_segment(get_segment_path(session, 1))
+        _write_segment(get_segment_path(session, 6))
+        assert [p.name for p in get_session_segments(session)] == [
+            "1_session.csv",
+            "1_session.csv.001.gz",
+            "1_session.csv.002",
+            "1_session.csv.003",
+        ]
+
+
+class TestCompression:
+    def test_compress_segment(self, tmp_path):
+        """The compressed segment replaces the original one."""
+        segment = tmp_path / "1_session.csv.001"
+        _write_segment(segment, "1.0,0.0,event,sysmon,self,start")
+        compressed = compress_segment(segment)
+        assert not segment.exists()
+        assert not (tmp_path / "1_session.csv.001.gz.tmp").exists()
+        with gzip.open(compressed, "rt") as f:
+            assert f.read() == HEADER + "1.0,0.0,event,sysmon,self,start\n"
+
+    def test_background_compressor(self, tmp_path):
+        """Closing the compressor waits for the pending segments."""
+        segments = [tmp_path / f"1_session.csv.00{n}" for n in (1, 2)]
+        compressor = SegmentCompressor()
+        for segment in segments:
+            _write_segment(segment, "1.0,0.0,event,sysmon,self,start")
+            compressor.compress(segment)
+        compressor.close()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["1_session.csv.001.gz", "1_session.csv.002.gz"]
+
+
+class TestReadSessionRows:
+    def test_chains_segments(self, tmp_path):
+        """Rows of plain and compressed segments are read in order."""
+        session = tmp_path / "1_session.csv"
+        _write_segment(session, "1.0,0.0,event,sysmon,self,start")
+        _write_segment(get_segment_path(session, 1), "2.0,1.0,event,sysmon,self,pause")
+        compress_segment(get_segment_path(session, 1))
+        _write_segment(get_segment_path(session, 2), "3.0,2.0,event,sysmon,self,resume")
+        assert [row["value"] for row in read_session_rows(session)] == ["start", "pause", "resume"]
+
+    def test_truncated_last_row(self, tmp_path):
+        """A last row cut by a crash is dropped."""
+        session = tmp_path / "1_session.csv"
+        session.write_text(HEADER + "1.0,0.0,event,sysmon,self,start\n2.0,1.0,inp")
+        assert [row["value"] for row in read_session_rows(session)] == ["start"]
+
+
+class TestMetadata:
+    def test_round_trip(self, tmp_path):
+        """The sidecar is written next to the session file, and read back."""
+        session = tmp_path / "1_260102_100000.csv"
+        write_metadata(session, {"session_id": 1, "status": "running"})
+        assert get_metadata_path(session).name == "1_260102_100000.meta.json"
+        assert read_metadata(session) == {"session_id": 1, "status": "running"}
+        assert not (tmp_path / "1_260102_100000.meta.json.tmp").exists()
+
+    def test_missing_sidecar(self, tmp_path):
+        """Sessions logged without sidecar have no metadata."""
+        assert read_metadata(tmp_path / "1_260102_100000.csv") is None
@@ -0,0 +1,255 @@
+"""Tests for core.signalexport and plugins.signalexport - Fixed rate signals export."""
+
+import csv
+import math
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from core.signalexport import FileSink, LslSink, SignalRingBuffer
+from plugins.signalexport import Signalexport
+
+
+class RecordingSink:
+    """A sink copying the published chunks."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, logtimes, scenario_times, data):
+        self.chunks.append((list(logtimes), list(scenario_times), list(data)))
+
+    def close(self):
+        pass
+
+
+def _make_exporter(plugins=None, joystick=None, chunksize=2):
+    """Create a started Signalexport instance bypassing __init__, with a recording sink."""
+    se = object.__new__(Signalexport)
+    se.alias = "signalexport"
+    se.scenario_time = 1.0
+    se.next_refresh_time = 0
+    se.paused = False
+    se.verbose = False
+    se.automode_string = ""
+    se.plugins = plugins or {}
+    se.joystick = joystick
+    se.parameters = dict(taskupdatetime=10, chunksize=chunksize, sink="file", displayautomationstate=False)
+    sources = se.get_sources()
+    se.channels = list(sources.keys())
+    se.sources = tuple(sources.values())
+    se.buffer = SignalRingBuffer(len(se.channels), chunksize)
+    se.sink = RecordingSink()
+    se.frame_logtime = 100.0
+    se.frame_scenario_time = 1.0
+    return se
+
+
+# ── SignalRingBuffer ─────────────────────────────
+
+
+class TestSignalRingBuffer:
+    def test_preallocated(self):
+        """The buffer capacity is allocated once, as a multiple of the chunk size."""
+        buf = SignalRingBuffer(3, 5, chunks=4)
+        assert buf.capacity == 20
+        assert len(buf.data) == 60
+        assert len(buf.logtimes) == 20
+
+    def test_sample_slots(self):
+        """Each sample reserves the next slot and returns its values offset."""
+        buf = SignalRingBuffer(3, 5)
+        assert buf.start_sample(1.0, 0.1) == 0
+        assert buf.start_sample(2.0, 0.2) == 3
+        assert buf.pending == 2
+
+    def test_pop_chunk(self):
+        """A chunk holds the written samples, as views over the buffer."""
+        buf = SignalRingBuffer(2, 2)
+        for i in range(2):
+            offset = buf.start_sample(float(i), i / 10)
+            buf.data[offset] = i
+            buf.data[offset + 1] = -i
+        assert buf.is_chunk_full()
+        logtimes, scenario_times, data = buf.pop_chunk()
+        assert list(logtimes) == [0.0, 1.0]
+        assert list(scenario_times) == [0.0, 0.1]
+        assert list(data) == [0.0, -0.0, 1.0, -1.0]
+        assert buf.pending == 0
+
+    def test_wraps_around(self):
+        """After the last chunk, the first slots are reused."""
+        buf = SignalRingBuffer(1, 2, chunks=2)
+        for _ in range(2):
+            buf.start_sample(0, 0)
+            buf.start_sample(0, 0)
+            buf.pop_chunk()
+        assert buf.start_sample(0, 0) == 0
+
+    def test_partial_chunk_keeps_alignment(self):
+        """An incomplete chunk can be popped, the next one starting on a chunk boundary."""
+        buf = SignalRingBuffer(1, 4)
+        buf.start_sample(0, 0)
+        logtimes, _, _ = buf.pop_chunk()
+        assert len(logtimes) == 1
+        assert buf.start_sample(0, 0) == 4
+
+
+# ── FileSink ─────────────────────────────────────
+
+
+class TestFileSink:
+    def test_writes_csv(self, tmp_path):
+        """The file has a header, then one row per sample."""
+        buf = SignalRingBuffer(2, 2)
+        for i in range(2):
+            offset = buf.start_sample(float(i), i / 10)
+            buf.data[offset] = i
+            buf.data[offset + 1] = 2 * i
+        sink = FileSink(tmp_path / "1_signals.csv")
+        sink.open(["a", "b"], 100)
+        sink.write(*buf.pop_chunk())
+        sink.close()
+        with open(tmp_path / "1_signals.csv") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["logtime", "scenario_time", "a", "b"]
+        assert rows[2] == ["1.0", "0.1", "1.0", "2.0"]
+
+
+class _Outlet:
+    """Stand-in for a pylsl StreamOutlet, with its signatures (a single timestamp per call)."""
+
+    def __init__(self):
+        self.samples = []
+
+    def push_sample(self, x, timestamp=0.0, pushthrough=True):
+        self.samples.append((list(x), float(timestamp)))
+
+    def push_chunk(self, x, timestamp=0.0, pushthrough=True):
+        for sample in x:
+            self.push_sample(sample, timestamp)
+
+
+class TestLslSink:
+    def test_samples_keep_their_timestamp(self):
+        """Each sample is pushed with its own logtime, shifted to the LSL clock."""
+        buf = SignalRingBuffer(2, 2)
+        for i in range(2):
+            offset = buf.start_sample(10.0 + i, i / 10)
+            buf.data[offset] = i
+            buf.data[offset + 1] = -i
+        sink = LslSink(MagicMock())
+        sink.open(["a", "b"], 100)
+        sink.outlet, sink.clock_offset = _Outlet(), 5.0
+        sink.write(*buf.pop_chunk())
+        assert sink.outlet.samples == [([0.0, -0.0], 15.0), ([1.0, -1.0], 16.0)]
+
+
+# ── Signalexport ─────────────────────────────────
+
+
+class TestSignalexport:
+    def test_channels(self):
+        """The channels layout does not depend on the plugins in use."""
+        se = _make_exporter()
+        assert se.channels == [
+            "track_cursor_x",
+            "track_cursor_y",
+            "track_deviation",
+            *[f"resman_tank_{letter}" for letter in "abcdef"],
+            "joystick_x",
+            "joystick_y",
+        ]
+
+    def test_missing_sources_are_nan(self):
+        """Signals of plugins not in use are exported as NaN."""
+        se = _make_exporter(chunksize=1)
+        se.compute_next_plugin_state()
+        _, _, data = se.sink.chunks[0]
+        assert all(math.isnan(v) for v in data)
+
+    def test_samples_sources(self):
+        """Track, resman and joystick values are sampled into the buffer."""
+        track = SimpleNamespace(alive=True, cursor_position=(3.0, -4.0), reticle=MagicMock())
+        track.reticle.return_deviation.return_value = 5.0
+        resman = SimpleNamespace(parameters={"tank": {letter: {"level": 100 * i} for i, letter in enumerate("abcdef")}})
+        joystick = SimpleNamespace(x=0.5, y=-0.5)
+        se = _make_exporter(plugins={"track": track, "resman": resman}, joystick=joystick, chunksize=1)
+        se.compute_next_plugin_state()
+        _, _, data = se.sink.chunks[0]
+        assert data == [3.0, -4.0, 5.0, 0.0, 100.0, 200.0, 300.0, 400.0, 500.0, 0.5, -0.5]
+
+    def test_levels_follow_the_tank(self):
+        """A tank level change is seen by the next sample."""
+        resman = SimpleNamespace(parameters={"tank": {letter: {"level": 0} for letter in "abcdef"}})
+        se = _make_exporter(plugins={"resman": resman}, chunksize=1)
+        resman.parameters["tank"]["a"]["level"] = 1234
+        se.compute_next_plugin_state()
+        assert se.sink.chunks[0][2][se.channels.index("resman_tank_a")] == 1234.0
+
+    def test_published_by_chunks(self):
+        """Samples are published once a chunk is full."""
+        se = _make_exporter(chunksize=2)
+        se.compute_next_plugin_state()
+        assert se.sink.chunks == []
+        se.scenario_time = se.next_refresh_time
+        se.compute_next_plugin_state()
+        assert len(se.sink.chunks) == 1
+        assert len(se.sink.chunks[0][0]) == 2
+
+    def test_step_timestamps(self):
+        """A caught up step is stamped at its own time on the frame clock."""
+        se = _make_exporter(chunksize=1)
+        se.frame_logtime, se.frame_scenario_time = 100.0, 1.03
+        se.scenario_time = 1.0
+        se.compute_next_plugin_state()
+        logtimes, scenario_times, _ = se.sink.chunks[0]
+        assert scenario_times == [1.0]
+        assert abs(logtimes[0] - 99.97) < 1e-9
+
+    def _run_frame(self, se, scenario_time):
+        """Run a frame of the exporter, without refreshing widgets."""
+        se.logger = MagicMock()
+        se.visible = False
+        se._resync_steps = False
+        se.update(scenario_time, refresh=False)
+
+    def test_slow_frame_keeps_its_samples(self):
+        """At a high rate, all the steps of a slow frame are sampled."""
+        se = _make_exporter(chunksize=1000)
+        se.parameters["taskupdatetime"] = 1
+        se.max_steps_per_frame = 500
+        se.next_refresh_time = 1.0
+        self._run_frame(se, 1.1)
+        assert se.buffer.pending == 101
+        se.logger.log_manual_entry.assert_not_called()
+
+    def test_dropped_steps_are_logged(self):
+        """Steps beyond the frame capacity are dropped, and their number logged."""
+        se = _make_exporter(chunksize=1000)
+        se.max_steps_per_frame = 10
+        se.next_refresh_time = 1.0
+        self._run_frame(se, 1.5)
+        assert se.buffer.pending == 10
+        se.logger.log_manual_entry.assert_called_once_with("41", key="signalexport_dropped_samples")
+
+    def test_lsl_sink_without_pylsl(self, mock_errors):
+        """Without pylsl, the lsl sink is reported as an error, and nothing is exported."""
+        se = _make_exporter()
+        se.parameters["sink"] = "lsl"
+        with patch("plugins.signalexport.pylsl", None):
+            assert se.create_sink() is None
+        mock_errors.add_error.assert_called_once()
+
+    def test_stop_flushes(self):
+        """Stopping publishes the incomplete chunk and closes the sink."""
+        se = _make_exporter(chunksize=10)
+        sink = se.sink
+        se.compute_next_plugin_state()
+        se.alive = True
+        se.widgets = {}
+        se.can_receive_keys = False
+        se.can_execute_keys = False
+        se.visible = False
+        se.stop()
+        assert len(sink.chunks) == 1
+        assert se.sink is None
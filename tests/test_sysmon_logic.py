@@ -4,9 +4,12 @@ Tests the actual Sysmon plugin methods (determine_light_color, start_failure,
 stop_failure, etc.) using object.__new__() to bypass __init__.
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from core.constants import COLORS as C
+from core.pseudorandom import sample_indices
 from plugins.sysmon import Sysmon
 
 
@@ -47,6 +50,8 @@ def _make_sysmon(**overrides):
                 _onfailure=False,
                 _milliresponsetime=0,
                 _freezetimer=None,
+                _onsetrequested=False,
+                _onsettime=None,
             ),
             "2": dict(
                 name="F6",
@@ -59,6 +64,8 @@ def _make_sysmon(**overrides):
                 _onfailure=False,
                 _milliresponsetime=0,
                 _freezetimer=None,
+                _onsetrequested=False,
+                _onsettime=None,
             ),
         },
         scales={
@@ -71,6 +78,8 @@ def _make_sysmon(**overrides):
                 _onfailure=False,
                 _milliresponsetime=0,
                 _freezetimer=None,
+                _onsetrequested=False,
+                _onsettime=None,
                 _pos=5,
                 _zone=0,
                 _feedbacktimer=None,
@@ -85,6 +94,8 @@ def _make_sysmon(**overrides):
                 _onfailure=False,
                 _milliresponsetime=0,
                 _freezetimer=None,
+                _onsetrequested=False,
+                _onsettime=None,
                 _pos=5,
                 _zone=0,
                 _feedbacktimer=None,
@@ -99,6 +110,8 @@ def _make_sysmon(**overrides):
                 _onfailure=False,
                 _milliresponsetime=0,
                 _freezetimer=None,
+                _onsetrequested=False,
+                _onsettime=None,
                 _pos=5,
                 _zone=0,
                 _feedbacktimer=None,
@@ -113,6 +126,8 @@ def _make_sysmon(**overrides):
                 _onfailure=False,
                 _milliresponsetime=0,
                 _freezetimer=None,
+                _onsetrequested=False,
+                _onsettime=None,
                 _pos=5,
                 _zone=0,
                 _feedbacktimer=None,
@@ -521,3 +536,103 @@ class TestFailureTimer:
         timers = s.get_response_timers()
         assert len(timers) == 6
         assert all(t == 0 for t in timers)
+
+
+# ──────────────────────────────────────────────
+# Precomputed arrows motion
+# ──────────────────────────────────────────────
+class TestMotionDirection:
+    """Test the arrows directions drawn from the precomputed table."""
+
+    @pytest.mark.parametrize("mode", ["counter", "legacy"])
+    @patch("core.pseudorandom.get_logger")
+    def test_same_draws_as_sample(self, mock_logger, mode):
+        """The table gives the directions (and logged seeds) of a sample call per moving seed."""
+        from core import pseudorandom
+
+        s = _make_sysmon()
+        pseudorandom.set_mode(mode)
+        try:
+            for step in range(30):
+                s.scenario_time = step * 0.2
+                s.moving_seed += 1
+                direction = s.get_motion_direction()
+                logged_seed = mock_logger.return_value.record_a_pseudorandom_value.call_args[0][1]
+                assert direction == pseudorandom.sample([-1, 1], "sysmon", s.scenario_time, s.moving_seed)
+                assert logged_seed == mock_logger.return_value.record_a_pseudorandom_value.call_args[0][1]
+        finally:
+            pseudorandom.set_mode(None)
+
+    @patch("core.pseudorandom.get_logger")
+    def test_table_computed_once_per_second(self, _mock_logger):
+        """The directions of a whole second are drawn at once."""
+        s = _make_sysmon()
+        with patch("plugins.sysmon.sample_indices", wraps=sample_indices) as mock_indices:
+            for step in range(10):  # Two seconds of 4 scales updates
+                s.scenario_time = step * 0.2
+                for _scale in range(4):
+                    s.moving_seed += 1
+                    s.get_motion_direction()
+        assert mock_indices.call_count == 2
+
+    @patch("core.pseudorandom.get_logger")
+    def test_table_extended_past_its_end(self, _mock_logger):
+        """More draws than expected in a second (faster updates) compute the table again."""
+        s = _make_sysmon()
+        s.get_motion_direction()
+        s.moving_seed += len(s.motion_indices)
+        s.get_motion_direction()
+        assert s.motion_first_seed == s.moving_seed
+
+
+# ──────────────────────────────────────────────
+# Input events response time
+# ──────────────────────────────────────────────
+class TestInputResponseTime:
+    """Test the response times computed from the onset flip and the key press times."""
+
+    def _refresh(self, s):
+        """Refresh the sysmon widgets (mocked) once."""
+        for gauge in s.get_all_gauges():
+            gauge["widget"] = MagicMock()
+        with patch("plugins.abstractplugin.AbstractPlugin.refresh_widgets", return_value=True):
+            s.refresh_widgets()
+
+    def test_light_hit(self):
+        """A hit response time is the key press time minus the failure flip time."""
+        s = _make_sysmon()
+        window = MagicMock(key_times={"F5": 10.75}, modal_dialog=None)
+        light = s.parameters["lights"]["1"]
+        with patch("plugins.abstractplugin.Window.MainWindow", window):
+            s.start_failure(light)
+            self._refresh(s)
+            self._refresh(s)  # The onset is requested once
+            assert window.call_on_next_flip.call_count == 1
+            window.call_on_next_flip.call_args[0][0](10.5)
+            s.do_on_key("F5", "press", emulate=False)
+        assert s.performance["onset_time"] == [10.5]
+        assert s.performance["input_time"] == [10.75]
+        assert s.performance["input_response_time"] == [pytest.approx(250)]
+        assert light["_onsettime"] is None
+
+    def test_scale_onset_when_arrow_in_zone(self):
+        """A scale failure onset is requested once its arrow is displayed in the failure zone."""
+        s = _make_sysmon()
+        window = MagicMock(key_times={})
+        scale = s.parameters["scales"]["1"]
+        scale["side"] = 1
+        with patch("plugins.abstractplugin.Window.MainWindow", window):
+            s.start_failure(scale)
+            self._refresh(s)
+            assert window.call_on_next_flip.call_count == 0
+            scale["_pos"] = 1
+            self._refresh(s)
+            assert window.call_on_next_flip.call_count == 1
+
+    def test_miss_has_no_response_time(self):
+        """A missed failure logs a NaN response time."""
+        s = _make_sysmon()
+        light = s.parameters["lights"]["1"]
+        s.start_failure(light)
+        s.stop_failure(light, success=False)
+        assert s.performance["input_response_time"][0] != s.performance["input_response_time"][0]
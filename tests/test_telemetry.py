@@ -0,0 +1,195 @@
+"""Tests for core.telemetry - Shared memory live telemetry bus."""
+
+import subprocess
+import sys
+import uuid
+from multiprocessing import shared_memory
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from core.signalexport import SharedMemorySink, SignalRingBuffer
+from core.telemetry import (
+    HEADER,
+    MAGIC,
+    SchedulerTelemetry,
+    TelemetryBus,
+    TelemetryReader,
+    _created_names,
+)
+
+TELEMETRY_MODULE = Path(__file__).resolve().parent.parent / "core" / "telemetry.py"
+
+
+@pytest.fixture
+def bus_name():
+    return f"omtb_test_{uuid.uuid4().hex[:8]}"
+
+
+class TestLayout:
+    def test_header(self, bus_name):
+        """The header describes the channels and slots."""
+        bus = TelemetryBus(["a", "b"], name=bus_name, slot_count=8)
+        try:
+            magic, _version, channel_count, slot_count, slot_size, _ = HEADER.unpack_from(bus.shm.buf, 0)
+            assert magic == MAGIC
+            assert (channel_count, slot_count) == (2, 8)
+            assert slot_size == 24 + 8 * 2
+        finally:
+            bus.close()
+
+    def _leave_stale_block(self, bus_name):
+        """Leave a block as a crashed writer would: open, its process being gone."""
+        stale = TelemetryBus(["a"], name=bus_name)
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        HEADER.pack_into(stale.shm.buf, 0, MAGIC, 1, 1, 8, 40, dead.pid)
+        stale.shm.close()
+        _created_names.discard(bus_name)
+
+    def test_existing_block_is_replaced(self, bus_name):
+        """A block left by a crashed session is replaced."""
+        self._leave_stale_block(bus_name)
+        bus = TelemetryBus(["a", "b"], name=bus_name)
+        reader = TelemetryReader(bus_name)
+        assert reader.channels == ["a", "b"]
+        reader.close()
+        bus.close()
+
+    def test_live_block_is_kept(self, bus_name):
+        """A block whose writer is running is not destroyed."""
+        bus = TelemetryBus(["a"], name=bus_name)
+        try:
+            with pytest.raises(FileExistsError):
+                TelemetryBus(["a", "b"], name=bus_name)
+            reader = TelemetryReader(bus_name)
+            assert reader.channels == ["a"]
+            reader.close()
+        finally:
+            bus.close()
+
+    def test_foreign_block_is_kept(self, bus_name):
+        """A block that is not a bus is not destroyed."""
+        other = shared_memory.SharedMemory(name=bus_name, create=True, size=128)
+        try:
+            with pytest.raises(FileExistsError):
+                TelemetryBus(["a"], name=bus_name)
+        finally:
+            other.close()
+            other.unlink()
+
+
+class TestReadWrite:
+    def test_read_latest(self, bus_name):
+        """The reader gets the last written slot, by channel name."""
+        bus = TelemetryBus(["a", "b"], name=bus_name)
+        reader = TelemetryReader(bus_name)
+        try:
+            assert reader.read_latest() is None
+            bus.write(1.5, [1.0, 2.0], logtime=10.0)
+            assert reader.read_latest() == (1.5, 10.0, {"a": 1.0, "b": 2.0})
+        finally:
+            reader.close()
+            bus.close()
+
+    def test_ring_keeps_last_slots(self, bus_name):
+        """Only the slot_count last slots can be read, in order."""
+        bus = TelemetryBus(["a"], name=bus_name, slot_count=4)
+        reader = TelemetryReader(bus_name)
+        try:
+            for i in range(6):
+                bus.write(float(i), [float(i)])
+            next_number, slots = reader.read_since(0)
+            assert next_number == 6
+            assert [s[0] for s in slots] == [2.0, 3.0, 4.0, 5.0]
+            assert reader.read_since(6) == (6, [])
+        finally:
+            reader.close()
+            bus.close()
+
+    def test_overwritten_slot_is_rejected(self, bus_name):
+        """A slot number that was overwritten is not returned."""
+        bus = TelemetryBus(["a"], name=bus_name, slot_count=2)
+        reader = TelemetryReader(bus_name)
+        try:
+            for i in range(3):
+                bus.write(float(i), [0.0])
+            assert reader.read_slot(0) is None
+            assert reader.read_slot(2)[0] == 2.0
+        finally:
+            reader.close()
+            bus.close()
+
+    def test_read_from_another_process(self, bus_name):
+        """A separate process reads the bus, with the telemetry module alone."""
+        bus = TelemetryBus(["level"], name=bus_name)
+        bus.write(3.0, [42.0])
+        script = (
+            "import importlib.util\n"
+            f"spec = importlib.util.spec_from_file_location('telemetry', r'{TELEMETRY_MODULE}')\n"
+            "t = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(t)\n"
+            f"r = t.TelemetryReader('{bus_name}')\n"
+            "print(r.read_latest()[2]['level'])\n"
+            "r.close()\n"
+        )
+        try:
+            result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=30)
+            assert result.stdout.strip() == "42.0"
+            # The reader exit must not have removed the block
+            reader = TelemetryReader(bus_name)
+            assert reader.read_latest()[2] == {"level": 42.0}
+            reader.close()
+        finally:
+            bus.close()
+
+
+class TestSchedulerTelemetry:
+    def test_publishes_plugins_and_performance(self, bus_name):
+        """Plugins states and performance levels are published at each call."""
+        track = SimpleNamespace(alive=True, paused=False)
+        performance = SimpleNamespace(alive=True, paused=False, current_level=80, performance_levels={"track": 0.8})
+        telemetry = SchedulerTelemetry({"track": track, "performance": performance}, name=bus_name)
+        reader = TelemetryReader(bus_name)
+        try:
+            telemetry.publish(2.0)
+            track.paused = True
+            telemetry.publish(2.5)
+            scenario_time, _, values = reader.read_latest()
+            assert scenario_time == 2.5
+            assert values["track_alive"] == 1.0
+            assert values["track_paused"] == 1.0
+            assert values["performance_level"] == 80.0
+            assert values["track_performance"] == 0.8
+        finally:
+            reader.close()
+            telemetry.close()
+
+    def test_scheduler_disabled_by_default(self):
+        """Without the telemetry option, the scheduler publishes nothing."""
+        from core.scheduler import Scheduler
+
+        sched = object.__new__(Scheduler)
+        assert sched.telemetry is None
+
+
+class TestSharedMemorySink:
+    def test_chunk_written_as_slots(self, bus_name):
+        """Each sample of a chunk becomes a slot of the signals bus."""
+        buf = SignalRingBuffer(2, 2)
+        for i in range(2):
+            offset = buf.start_sample(10.0 + i, float(i))
+            buf.data[offset] = i
+            buf.data[offset + 1] = -i
+        sink = SharedMemorySink(name=bus_name)
+        sink.open(["x", "y"], 100)
+        reader = TelemetryReader(bus_name)
+        try:
+            sink.write(*buf.pop_chunk())
+            next_number, slots = reader.read_since(0)
+            assert next_number == 2
+            assert slots[1] == (1.0, 11.0, (1.0, -1.0))
+        finally:
+            reader.close()
+            sink.close()
@@ -0,0 +1,73 @@
+"""Tests for core.textcache - LRU cache, HTML preparse memoisation and document reuse."""
+
+from unittest.mock import MagicMock, patch
+
+from core.textcache import LayoutCache, get_html_cache, get_html_document, preparse_html
+
+
+class TestLayoutCache:
+    def test_get_missing_returns_none(self):
+        """Unknown keys return None and count as misses."""
+        c = LayoutCache(2)
+        assert c.get("a") is None
+        assert c.misses == 1
+
+    def test_put_then_get(self):
+        """Stored values are returned and count as hits."""
+        c = LayoutCache(2)
+        c.put("a", 1)
+        assert c.get("a") == 1
+        assert c.hits == 1
+
+    def test_evicts_least_recently_used(self):
+        """The oldest untouched entry is evicted first."""
+        c = LayoutCache(2)
+        c.put("a", 1)
+        c.put("b", 2)
+        c.get("a")
+        c.put("c", 3)
+        assert "a" in c
+        assert "b" not in c
+        assert len(c) == 2
+
+
+class TestPreparseHtml:
+    def test_replaces_tags(self):
+        """OpenMATB tags are converted into pyglet HTML."""
+        out = preparse_html("<h1>Title</h1><p>Body</p>", "Arial")
+        assert "<h1>" not in out
+        assert "<center><strong>" in out
+        assert "face=Arial" in out
+
+    def test_memoised(self):
+        """Identical calls are served from the memoisation cache."""
+        preparse_html.cache_clear()
+        preparse_html("<p>x</p>", None)
+        preparse_html("<p>x</p>", None)
+        assert preparse_html.cache_info().hits == 1
+
+
+class TestGetHtmlDocument:
+    def test_decodes_once(self):
+        """A given html string is decoded only once."""
+        get_html_cache().clear()
+        with patch("core.textcache.decode_html", side_effect=lambda t, loc: MagicMock()) as dec:
+            d1 = get_html_document("<b>a</b>")
+            d2 = get_html_document("<b>a</b>")
+        assert d1 is d2
+        assert dec.call_count == 1
+
+
+class TestSimpleHTMLText:
+    def test_get_text_returns_raw_text(self, mock_logger, mock_window):
+        """Comparison is done against the raw text, so an unchanged text is not relayouted."""
+        from core.container import Container
+        from core.widgets.simplehtml import SimpleHTML
+
+        w = SimpleHTML("test_html", Container("c", 0, 0, 100, 100), "<p>Hello</p>")
+        assert w.get_text() == "<p>Hello</p>"
+        w.set_text("<p>Hello</p>")
+        mock_logger.get_state_recorder.return_value.record.assert_not_called()
+        w.set_text("<p>World</p>")
+        mock_logger.get_state_recorder.assert_called_once_with("test_html", "text")
+        mock_logger.get_state_recorder.return_value.record.assert_called_once_with("<p>World</p>")
@@ -5,7 +5,9 @@ get_joystick_inputs, cursor color switching) using object.__new__() to bypass
 __init__.
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from core.constants import COLORS as C
 from core.container import Container
@@ -349,3 +351,38 @@ class TestResponseTimeTracking:
         if not t.reticle.is_cursor_in_target():
             t.response_time += t.parameters["taskupdatetime"]
         assert t.response_time == initial_rt
+
+
+# ──────────────────────────────────────────────
+# Input events response time
+# ──────────────────────────────────────────────
+class TestInputResponseTime:
+    """Test the drift recovery time computed from the onset flip and the joystick poll times."""
+
+    def _update(self, t, in_target):
+        """Run one update, with the cursor in or out of the target."""
+        t.reticle.is_cursor_in_target.return_value = in_target
+        t.cursor_path_gen = iter([(0, 0)])
+        t.next_refresh_time = t.scenario_time
+        t.compute_next_plugin_state()
+        t.scenario_time += 0.02
+
+    def test_recovery_time(self):
+        """The recovery time is the joystick poll time minus the drift onset flip time."""
+        t = _make_track(verbose=False, reticle=MagicMock(), joystick=MagicMock(poll_time=2.0))
+        with patch("plugins.abstractplugin.Window.MainWindow") as window:
+            self._update(t, in_target=False)
+            window.call_on_next_flip.call_args[0][0](1.5)
+            self._update(t, in_target=False)
+            assert window.call_on_next_flip.call_count == 1
+            self._update(t, in_target=True)
+        assert t.performance["response_time"] == [40]
+        assert t.performance["input_response_time"] == [pytest.approx(500)]
+
+    def test_no_joystick(self):
+        """Without a joystick, the recovery has no input time."""
+        t = _make_track(verbose=False, reticle=MagicMock())
+        with patch("plugins.abstractplugin.Window.MainWindow"):
+            self._update(t, in_target=False)
+            self._update(t, in_target=True)
+        assert t.performance["input_time"][0] != t.performance["input_time"][0]
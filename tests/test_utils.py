@@ -1,7 +1,7 @@
 """Tests for core.utils - Pure utility functions."""
 
 import configparser
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -36,57 +36,15 @@ class TestClamp:
         assert clamp(1.5, 0.0, 1.0) == 1.0
 
 
-class TestGetSessionNumbers:
-    @patch("core.utils.P")
-    def test_returns_session_ids(self, mock_paths):
-        """Parses session IDs from CSV filenames."""
-        mock_file1 = MagicMock()
-        mock_file1.name = "1_240101_120000.csv"
-        mock_file2 = MagicMock()
-        mock_file2.name = "3_240102_130000.csv"
-        mock_paths.__getitem__ = lambda self, k: MagicMock(glob=MagicMock(return_value=[mock_file1, mock_file2]))
-        result = get_session_numbers()
-        assert result == [1, 3]
-
-    @patch("core.utils.P")
-    def test_empty_dir_returns_zero(self, mock_paths):
-        """Empty sessions directory returns [0]."""
-        mock_paths.__getitem__ = lambda self, k: MagicMock(glob=MagicMock(side_effect=ValueError))
-        result = get_session_numbers()
-        assert result == [0]
-
-
-class TestFindFirstAvailableSessionNumber:
-    @patch("core.utils.get_session_numbers")
-    def test_first_session(self, mock_get):
-        """Empty session list returns 1."""
-        mock_get.return_value = []
-        assert find_the_first_available_session_number() == 1
-
-    @patch("core.utils.get_session_numbers")
-    def test_consecutive_returns_next(self, mock_get):
-        """Sessions [1, 2, 3] returns 4."""
-        mock_get.return_value = [1, 2, 3]
-        assert find_the_first_available_session_number() == 4
-
-    @patch("core.utils.get_session_numbers")
-    def test_gap_fills_first_hole(self, mock_get):
-        """Sessions [1, 3, 4] returns 2 (fills the gap)."""
-        mock_get.return_value = [1, 3, 4]
+class TestSessionNumbers:
+    @patch("core.utils.get_catalog")
+    def test_read_from_catalog(self, mock_catalog):
+        """Session numbers come from the sessions catalog, not from a scan of the sessions."""
+        mock_catalog.return_value.get_ids.return_value = [1, 3]
+        mock_catalog.return_value.get_next_id.return_value = 2
+        assert get_session_numbers() == [1, 3]
         assert find_the_first_available_session_number() == 2
 
-    @patch("core.utils.get_session_numbers")
-    def test_single_session(self, mock_get):
-        """Single session [1] returns 2."""
-        mock_get.return_value = [1]
-        assert find_the_first_available_session_number() == 2
-
-    @patch("core.utils.get_session_numbers")
-    def test_gap_at_start(self, mock_get):
-        """Sessions [2, 3] returns 1 (gap at start)."""
-        mock_get.return_value = [2, 3]
-        assert find_the_first_available_session_number() == 1
-
 
 class TestGetConfValue:
     def test_boolean_true(self):
@@ -4,7 +4,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from core.window import Window
+from core.window import FlipStatistics, Window
 
 
 def _make_window(**overrides):
@@ -15,11 +15,16 @@ def _make_window(**overrides):
     w._width = 1920
     w._height = 1080
     w.keyboard = {}
+    w.key_times = {}
+    w.flip_callbacks = []
     w.modal_dialog = None
     w.batch = MagicMock()
     w.alive = True
     w.slider_visible = False
     w.on_key_press_replay = None
+    w.flip_stats = FlipStatistics()
+    w.relayout_listeners = []
+    w.background_vertices = []
     w.__dict__.update(overrides)
     return w
 
@@ -216,7 +221,9 @@ class TestOnKeyPress:
         """Key press is logged."""
         w = _make_window()
         w.on_key_press(0x41, 0)
-        mock_get_logger.return_value.record_input.assert_called_once_with("keyboard", "A", "press")
+        mock_get_logger.return_value.record_input.assert_called_once_with(
+            "keyboard", "A", "press", logtime=w.key_times["A"]
+        )
 
     @patch("core.window.REPLAY_MODE", False)
     @patch("core.window.get_logger")
@@ -272,8 +279,9 @@ class TestOnKeyRelease:
         """Key release is logged."""
         w = _make_window()
         w.keyboard["A"] = True
-        w.on_key_release(0x41, 0)
-        mock_get_logger.return_value.record_input.assert_called_once_with("keyboard", "A", "release")
+        with patch("core.window.perf_counter", return_value=12.5):
+            w.on_key_release(0x41, 0)
+        mock_get_logger.return_value.record_input.assert_called_once_with("keyboard", "A", "release", logtime=12.5)
 
     @patch("core.window.REPLAY_MODE", False)
     @patch("core.window.get_logger")
@@ -325,3 +333,171 @@ class TestSetSizeAndLocation:
         w.set_size_and_location(mock_screen)
         # target_x = (1920 + 960) - 960 = 1920
         w.set_location.assert_called_once_with(1920, 0)
+
+
+class TestRenderOnChange:
+    @patch("core.window.glClearColor")
+    def test_always_draws_when_disabled(self, _gl):
+        """Without render-on-change, every frame is drawn."""
+        w = _make_window(render_on_change=False, _dirty=False)
+        w.on_draw()
+        w.batch.draw.assert_called_once()
+
+    @patch("core.window.get_logger")
+    @patch("core.window.glClearColor")
+    def test_skips_clean_frames(self, _gl, _mock_get_logger):
+        """A frame without any change is neither drawn nor flipped, but counted."""
+        w = _make_window(render_on_change=True, _dirty=True)
+        w.on_draw()
+        w.flip()
+        w.on_draw()
+        with patch("core.window.sleep"):
+            w.flip()
+        assert w.batch.draw.call_count == 1
+        assert w.skipped_frames == 1
+
+    @patch("core.window.glClearColor")
+    def test_dirty_mark_triggers_redraw(self, _gl):
+        """A widget marking the window dirty forces the next frame to be drawn."""
+        w = _make_window(render_on_change=True, _dirty=False)
+        w.mark_dirty()
+        w.on_draw()
+        w.batch.draw.assert_called_once()
+        assert w.needs_redraw() is False
+
+    def test_input_events_mark_dirty(self):
+        """Dispatched input events mark the window dirty, draw events do not."""
+        w = _make_window(render_on_change=True, _dirty=False)
+        w.dispatch_event("on_draw")
+        assert w.needs_redraw() is False
+        w.dispatch_event("on_mouse_motion", 0, 0, 1, 1)
+        assert w.needs_redraw() is True
+
+    def test_modal_dialog_always_redrawn(self):
+        """Dialogs are drawn on every frame."""
+        w = _make_window(render_on_change=True, _dirty=False, modal_dialog=MagicMock())
+        assert w.needs_redraw() is True
+
+    def test_periodic_redraw_guard(self):
+        """A frame is redrawn after too many consecutive skipped frames."""
+        from core.window import MAX_CONSECUTIVE_SKIPPED_FRAMES
+
+        w = _make_window(render_on_change=True, _dirty=False, _consecutive_skips=MAX_CONSECUTIVE_SKIPPED_FRAMES)
+        assert w.needs_redraw() is True
+
+    @patch("core.window.REPLAY_MODE", False)
+    def test_mouse_visibility_set_on_change_only(self):
+        """set_mouse_visible is only called when the visibility changes."""
+        w = _make_window(_mouse_visible=False)
+        w.set_mouse_visible = MagicMock()
+        w.update_mouse_visibility()
+        w.set_mouse_visible.assert_not_called()
+        w.slider_visible = True
+        w.update_mouse_visibility()
+        w.update_mouse_visibility()
+        w.set_mouse_visible.assert_called_once_with(True)
+
+    @patch("core.window.get_logger")
+    def test_skipped_frames_logged(self, mock_get_logger):
+        """The skipped frames counter is logged when the mode is enabled."""
+        w = _make_window(render_on_change=True, skipped_frames=12)
+        w.log_render_stats()
+        mock_get_logger.return_value.log_manual_entry.assert_any_call(12, key="skipped_frames")
+
+
+class TestFlipTimestamps:
+    def test_statistics(self):
+        """Mean, sd, extrema and missed frames of the flip intervals."""
+        s = FlipStatistics(nominal_period=0.010)
+        for interval in (0.010, 0.010, 0.040):
+            s.add(interval)
+        assert s.count == 3
+        assert s.mean == pytest.approx(0.020)
+        assert s.get_sd() == pytest.approx(0.017320508)
+        assert (s.min, s.max, s.missed) == (0.010, 0.040, 1)
+
+    def test_empty_summary(self):
+        """No flip, no statistics."""
+        assert FlipStatistics().get_summary() == "n=0"
+
+    @patch("core.window.get_logger")
+    def test_flip_stamps_onsets(self, mock_get_logger):
+        """Each real flip is timestamped and passed to the logger onsets."""
+        w = _make_window()
+        with patch("core.window.perf_counter", side_effect=[1.0, 1.0, 1.02, 1.02]):
+            w.flip()
+            w.flip()
+        mock_get_logger.return_value.record_onsets.assert_called_with(1.02)
+        assert w.flip_stats.count == 1
+        assert w.flip_stats.mean == pytest.approx(0.02)
+
+    @patch("core.window.get_logger")
+    def test_flip_calls_back_once(self, mock_get_logger):
+        """Callbacks get the time of the next flip only, not of the skipped frames."""
+        w = _make_window(_skip_flip=True)
+        flip_times = []
+        w.call_on_next_flip(flip_times.append)
+        with patch("core.window.sleep"), patch("core.window.perf_counter", side_effect=[0.0, 1.0, 1.5, 1.5, 2.0, 2.0]):
+            w.flip()  # Skipped
+            w.flip()
+            w.flip()
+        assert flip_times == [1.5]
+
+    @patch("core.window.REPLAY_MODE", False)
+    @patch("core.window.get_logger")
+    def test_key_press_time(self, mock_get_logger):
+        """A key press is stamped when it is dispatched."""
+        w = _make_window()
+        with patch("core.window.perf_counter", return_value=3.25):
+            w.on_key_press(0x41, 0)
+        assert w.key_times["A"] == 3.25
+
+    @patch("core.window.get_logger")
+    def test_skipped_frame_breaks_interval(self, mock_get_logger):
+        """An interval spanning a skipped frame is not measured."""
+        w = _make_window(_last_flip_time=1.0, _skip_flip=True)
+        with patch("core.window.sleep"):
+            w.flip()
+        w.flip()
+        assert w.flip_stats.count == 0
+        mock_get_logger.return_value.record_onsets.assert_called_once()
+
+    @patch("core.window.get_logger")
+    def test_stats_logged(self, mock_get_logger):
+        """The flip intervals summary is logged at exit."""
+        w = _make_window()
+        w.log_render_stats()
+        mock_get_logger.return_value.log_manual_entry.assert_called_once_with("n=0", key="flip_interval")
+
+
+class TestLayoutCache:
+    @patch("core.window.REPLAY_MODE", False)
+    @patch("core.window.get_conf_value")
+    def test_layout_computed_once(self, mock_conf):
+        """Lookups share the same containers and read the bounds only once."""
+        mock_conf.side_effect = lambda section, key: {
+            "top_bounds": [0.35, 0.85],
+            "bottom_bounds": [0.30, 0.85],
+        }[key]
+        w = _make_window()
+        c1 = w.get_container("topleft")
+        c2 = w.get_container("topleft")
+        w.get_container("bottommid")
+        assert c1 is c2
+        assert mock_conf.call_count == 2
+
+    @patch("core.window.REPLAY_MODE", False)
+    @patch("core.window.get_conf_value")
+    def test_resize_recomputes_layout(self, mock_conf):
+        """The layout is recomputed after a resize."""
+        mock_conf.side_effect = lambda section, key: {
+            "top_bounds": [0.35, 0.85],
+            "bottom_bounds": [0.30, 0.85],
+        }[key]
+        w = _make_window()
+        before = w.get_container("fullscreen")
+        w.width, w.height = 1280, 720
+        w.on_resize(1280, 720)
+        after = w.get_container("fullscreen")
+        assert after is not before
+        assert after.get_lbwh() == (0, 0, 1280, 720)